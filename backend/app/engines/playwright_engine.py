@@ -8,8 +8,6 @@ from typing import Any, Optional
 from playwright.async_api import async_playwright, Browser, Page, BrowserContext, Locator
 # 导入 asyncio 异步编程模块
 import asyncio
-# 导入 json 模块用于解析 JSON 字符串
-import json
 # 从 datetime 模块导入 datetime 类，用于生成时间戳文件名
 from datetime import datetime
 # 从 pathlib 导入 Path 类，用于路径操作
@@ -22,6 +20,8 @@ from app.config import (
     DEFAULT_NAVIGATION_TIMEOUT,  # 默认导航超时时间
     SCREENSHOTS_DIR,  # 截图保存目录
 )
+# 导入 JSON 解析函数（优先使用 orjson 解析步骤参数）
+from app.utils.json_codec import json_loads
 
 
 # 定义 Playwright 执行引擎类
@@ -32,6 +32,20 @@ class PlaywrightEngine:
     负责浏览器管理和测试步骤执行，提供统一的自动化测试接口
     """
 
+    # 定位类型 -> 选择器构建函数（输入定位符，返回 Playwright 选择器）
+    _LOCATOR_BUILDERS = {
+        # ID 定位：已包含 # 前缀则直接使用，否则添加 # 前缀
+        "id": lambda locator: locator if locator.startswith("#") else f"#{locator}",
+        # XPath 定位：添加 xpath= 前缀
+        "xpath": lambda locator: f"xpath={locator}",
+        # CSS Selector 定位：直接使用
+        "css": lambda locator: locator,
+        # Name 属性定位：构建属性选择器
+        "name": lambda locator: f"[name=\"{locator}\"]",
+        # Class 名称定位：已包含 . 前缀则直接使用，否则添加 . 前缀
+        "class": lambda locator: locator if locator.startswith(".") else f".{locator}",
+    }
+
     def __init__(
         self,
         browser_type: BrowserType = "chromium",  # 浏览器类型：chromium/firefox/webkit
@@ -209,35 +223,13 @@ class PlaywrightEngine:
         if not self.page:
             raise RuntimeError("页面未初始化")
 
-        # 根据定位类型构建 Playwright 选择器
-        if locator_type == "id":
-            # ID 定位: #id 或 [id="value"]
-            if locator.startswith("#"):
-                # 如果已经包含 # 前缀，直接使用
-                selector = locator
-            else:
-                # 否则添加 # 前缀
-                selector = f"#{locator}"
-        elif locator_type == "xpath":
-            # XPath 定位：添加 xpath= 前缀
-            selector = f"xpath={locator}"
-        elif locator_type == "css":
-            # CSS Selector 定位：直接使用
-            selector = locator
-        elif locator_type == "name":
-            # Name 属性定位：构建属性选择器
-            selector = f"[name=\"{locator}\"]"
-        elif locator_type == "class":
-            # Class 名称定位：.classname
-            if locator.startswith("."):
-                # 如果已经包含 . 前缀，直接使用
-                selector = locator
-            else:
-                # 否则添加 . 前缀
-                selector = f".{locator}"
-        else:
+        # 按定位类型查表获取选择器构建函数
+        builder = self._LOCATOR_BUILDERS.get(locator_type)
+        if builder is None:
             # 不支持的定位类型，抛出异常
             raise ValueError(f"不支持的定位类型: {locator_type}")
+        # 构建 Playwright 选择器
+        selector = builder(locator)
 
         # 返回页面定位器对象
         return self.page.locator(selector)
@@ -534,7 +526,7 @@ class PlaywrightEngine:
 
         # 如果参数是 JSON 字符串，解析为字典
         if isinstance(action_params, str):
-            action_params = json.loads(action_params) if action_params else {}
+            action_params = json_loads(action_params) if action_params else {}
 
         # 初始化结果字典
         result = {"success": False, "message": ""}
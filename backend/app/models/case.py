@@ -4,12 +4,16 @@
 """
 # 从 datetime 模块导入 datetime 类，用于时间戳字段
 from datetime import datetime
-# 从 sqlalchemy 导入列类型
-from sqlalchemy import String, Integer, Text, ForeignKey, JSON
+# 导入 cached_property，用于缓存解析后的参数字典
+from functools import cached_property
+# 从 sqlalchemy 导入列类型和 ORM 事件注册接口
+from sqlalchemy import String, Integer, Text, ForeignKey, JSON, event
 # 从 sqlalchemy.orm 导入映射装饰器和关系定义
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 # 从本地数据库模块导入 Base 基类
 from app.models.database import Base
+# 导入 JSON 编解码函数和解析异常（优先使用 orjson）
+from app.utils.json_codec import json_dumps, json_loads, JSONDecodeError
 
 
 # 定义测试用表模型类
@@ -100,29 +104,64 @@ class TestStep(Base):
     # 定义与 TestCase 的多对一关系：一个步骤属于一个用例
     test_case = relationship("TestCase", back_populates="steps")
 
-    @property
-    def params_dict(self) -> dict:
+    @validates("action_params")
+    def _invalidate_params_dict(self, key: str, value: str | None) -> str | None:
         """
-        获取解析后的参数字典
+        action_params 被赋值时清除参数解析缓存
 
-        将存储的 JSON 字符串解析为字典
+        Args:
+            key: 字段名
+            value: 新的参数 JSON 字符串
 
         Returns:
-            dict: 解析后的参数字典，解析失败返回空字典
+            str | None: 原样返回新值
+        """
+        # 移除实例上缓存的解析结果，下次访问时重新解析
+        self._clear_params_cache()
+        # 原样返回，不修改写入的值
+        return value
+
+    def _clear_params_cache(self) -> None:
+        """清除实例上缓存的参数解析结果"""
+        # cached_property 把结果存放在实例 __dict__ 中，删除即失效
+        self.__dict__.pop("_parsed_params", None)
+
+    @cached_property
+    def _parsed_params(self) -> dict:
+        """
+        解析 action_params 并缓存在实例上
+
+        action_params 被重新赋值（包括 set_params），或实例被 refresh/expire 时缓存失效
+
+        Returns:
+            dict: 解析后的参数字典，解析失败或结果不是 JSON 对象时返回空字典
         """
-        # 导入 json 模块用于解析 JSON 字符串
-        import json
         # 如果 action_params 不为空
         if self.action_params:
             try:
-                # 尝试解析 JSON 字符串为字典
-                return json.loads(self.action_params)
-            except json.JSONDecodeError:
+                # 尝试解析 JSON 字符串
+                parsed = json_loads(self.action_params)
+            except JSONDecodeError:
                 # 解析失败时返回空字典
                 return {}
+            # 只接受 JSON 对象，数组、null 和标量按无参数处理
+            return parsed if isinstance(parsed, dict) else {}
         # action_params 为空时返回空字典
         return {}
 
+    @property
+    def params_dict(self) -> dict:
+        """
+        获取解析后的参数字典
+
+        JSON 只解析一次，每次返回缓存结果的浅拷贝，调用方修改返回值不会影响后续读取
+
+        Returns:
+            dict: 解析后的参数字典，解析失败返回空字典
+        """
+        # 返回副本，避免共享的缓存字典被调用方修改
+        return dict(self._parsed_params)
+
     def set_params(self, params: dict):
         """
         设置参数
@@ -132,10 +171,8 @@ class TestStep(Base):
         Args:
             params: 参数字典
         """
-        # 导入 json 模块用于序列化
-        import json
         # 将字典转换为 JSON 字符串存储，如果 params 为空则存储 None
-        self.action_params = json.dumps(params) if params else None
+        self.action_params = json_dumps(params) if params else None
 
     def to_dict(self) -> dict:
         """
@@ -162,3 +199,17 @@ class TestStep(Base):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
+
+
+@event.listens_for(TestStep, "refresh")
+def _clear_params_on_refresh(target: TestStep, context, attrs) -> None:
+    """实例从数据库重新加载（session.refresh、populate_existing）时清除参数解析缓存"""
+    # 数据库中的 action_params 可能已变化，丢弃旧的解析结果
+    target._clear_params_cache()
+
+
+@event.listens_for(TestStep, "expire")
+def _clear_params_on_expire(target: TestStep, attrs) -> None:
+    """实例属性被 expire（包括提交后过期）时清除参数解析缓存"""
+    # 过期后 action_params 会在下次访问时重新加载，缓存随之失效
+    target._clear_params_cache()
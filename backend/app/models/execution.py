@@ -10,6 +10,8 @@ from sqlalchemy import String, Integer, Text, ForeignKey, Boolean, BigInteger
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 # 从本地数据库模块导入 Base 基类
 from app.models.database import Base
+# 导入 JSON 编解码函数和解析异常（优先使用 orjson）
+from app.utils.json_codec import json_dumps, json_loads, JSONDecodeError
 
 
 # 定义测试执行记录表模型类
@@ -65,14 +67,12 @@ class Execution(Base):
         Returns:
             list: 用例 ID 列表，解析失败返回空列表
         """
-        # 导入 json 模块用于解析 JSON 字符串
-        import json
         # 如果 case_ids_json 不为空
         if self.case_ids_json:
             try:
                 # 尝试解析 JSON 字符串为列表
-                return json.loads(self.case_ids_json)
-            except json.JSONDecodeError:
+                return json_loads(self.case_ids_json)
+            except JSONDecodeError:
                 # 解析失败时返回空列表
                 return []
         # case_ids_json 为空时返回空列表
@@ -87,10 +87,8 @@ class Execution(Base):
         Args:
             case_ids: 用例 ID 列表
         """
-        # 导入 json 模块用于序列化
-        import json
         # 将列表转换为 JSON 字符串存储，如果 case_ids 为空则存储 None
-        self.case_ids_json = json.dumps(case_ids) if case_ids else None
+        self.case_ids_json = json_dumps(case_ids) if case_ids else None
 
     @property
     def pass_rate(self) -> float:
@@ -209,14 +207,12 @@ class ExecutionDetail(Base):
         Returns:
             list: 解析后的日志列表，解析失败返回空列表
         """
-        # 导入 json 模块用于解析 JSON 字符串
-        import json
         # 如果 step_logs 不为空
         if self.step_logs:
             try:
                 # 尝试解析 JSON 字符串为列表
-                return json.loads(self.step_logs)
-            except json.JSONDecodeError:
+                return json_loads(self.step_logs)
+            except JSONDecodeError:
                 # 解析失败时返回空列表
                 return []
         # step_logs 为空时返回空列表
@@ -231,10 +227,8 @@ class ExecutionDetail(Base):
         Args:
             logs: 日志列表
         """
-        # 导入 json 模块用于序列化
-        import json
         # 将列表转换为 JSON 字符串存储，如果 logs 为空则存储 None
-        self.step_logs = json.dumps(logs) if logs else None
+        self.step_logs = json_dumps(logs) if logs else None
 
     def to_dict(self) -> dict:
         """
@@ -2,18 +2,117 @@
 HTML 报告生成服务
 使用 Jinja2 模板生成美观的 HTML 测试报告
 """
+import asyncio
+import os
+import uuid
 from typing import Optional
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload
 
 from app.models.execution import Execution, ExecutionDetail
 from app.config import REPORTS_DIR
 from app.schemas.report import ReportData, ExecutionSummary, CaseResultSummary
 
 
+# 用例状态对应的步骤统计
+_STEP_COUNTS = {
+    "success": {"step_count": 1, "passed_steps": 1, "failed_steps": 0},
+    "failed": {"step_count": 1, "passed_steps": 0, "failed_steps": 1},
+}
+# 未完成状态（如 pending）的步骤统计
+_NO_STEPS = {"step_count": 0, "passed_steps": 0, "failed_steps": 0}
+
+# 报告模板目录
+TEMPLATE_DIR = Path(__file__).parent.parent.parent / "templates"
+
+
+@lru_cache(maxsize=None)
+def get_report_template():
+    """
+    获取报告模板
+
+    首次调用时创建 Jinja2 环境并编译 report.html，之后直接复用已编译的模板，
+    避免每次生成报告都重新创建环境、读取并解析模板文件
+
+    Returns:
+        编译后的 Jinja2 模板对象
+    """
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+    # 创建 Jinja2 环境
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=select_autoescape(['html', 'xml']),
+        # 模板对象已由 lru_cache 复用，无需每次检查文件修改时间
+        auto_reload=False
+    )
+
+    # 加载并编译模板
+    return env.get_template('report.html')
+
+
+def _stream_report_file(file_path: Path, report_data: ReportData) -> None:
+    """
+    边渲染边写入报告文件（报告目录不存在时自动创建）
+
+    模板按片段流式输出到文件，不在内存中拼出完整的 HTML 字符串；
+    先写入同目录下的临时文件，渲染完成后再原子替换到目标路径，
+    渲染中途出错时删除临时文件，不会留下截断的报告；
+    同步文件操作，由 _render_and_save 放到工作线程中执行
+
+    Args:
+        file_path: 报告文件路径
+        report_data: 报告数据
+    """
+    # 确保报告目录存在
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    # 同目录下唯一的临时文件名（.tmp 后缀不会出现在报告列表中），同一文件系统内 os.replace 才是原子操作
+    tmp_name = str(file_path.with_name(f".{file_path.stem}.{uuid.uuid4().hex}.tmp"))
+    try:
+        # 流式渲染并写入临时文件
+        get_report_template().stream(**_template_context(report_data)).dump(tmp_name, encoding='utf-8')
+        # 渲染完成后原子替换为正式报告
+        os.replace(tmp_name, file_path)
+    except BaseException:
+        # 渲染或写入失败时清理临时文件（可能尚未创建）
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _template_context(report_data: ReportData) -> dict:
+    """
+    构建报告模板的渲染上下文
+
+    Args:
+        report_data: 报告数据
+
+    Returns:
+        模板变量字典
+    """
+    return {
+        "report": report_data,
+        "generated_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+def _report_path(execution_id: int) -> Path:
+    """
+    生成报告文件路径：报告目录下的 report_<执行ID>_<时间戳>.html
+
+    Args:
+        execution_id: 执行 ID
+
+    Returns:
+        报告文件路径
+    """
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return REPORTS_DIR / f"report_{execution_id}_{timestamp}.html"
+
+
 # 定义报告服务类
 class ReportService:
     """
@@ -50,13 +149,10 @@ class ReportService:
         # 2. 准备模板数据
         report_data = self._prepare_report_data(execution_data)
 
-        # 3. 渲染 HTML
-        html_content = await self._render_html(report_data)
-
-        # 4. 保存报告文件
-        report_path = await self._save_report(execution_id, html_content)
+        # 3. 渲染 HTML 并保存报告文件（流式写入，不生成完整的 HTML 字符串）
+        report_path = await self._render_and_save(execution_id, report_data)
 
-        # 5. 返回报告信息
+        # 4. 返回报告信息
         return {
             "report_id": f"report_{execution_id}_{datetime.now().strftime('%Y%m%d%H%M%S')}",
             "html_path": report_path,
@@ -79,14 +175,14 @@ class ReportService:
         Returns:
             (执行记录, 详情列表) 元组或 None
         """
-        # 构建查询：获取执行记录和关联的详情
+        # 构建查询：LEFT OUTER JOIN 一次取回执行记录和关联的详情（单条执行只有一个父行，无需二次查询）
         query = select(Execution).options(
-            selectinload(Execution.details)
+            joinedload(Execution.details)
         ).where(Execution.id == execution_id)
 
-        # 执行查询
+        # 执行查询（连接集合预加载会重复父行，unique() 去重）
         result = await db.execute(query)
-        execution = result.scalar_one_or_none()
+        execution = result.unique().scalar_one_or_none()
 
         if not execution:
             return None
@@ -124,30 +220,18 @@ class ReportService:
             duration=execution.duration
         )
 
-        # 构建用例结果列表
-        case_summaries = []
-        for detail in details:
-            # 计算步骤统计（从日志中解析）
-            step_count = 0
-            passed_steps = 0
-            failed_steps = 0
-            if detail.status == "success":
-                passed_steps = 1
-                step_count = 1
-            elif detail.status == "failed":
-                failed_steps = 1
-                step_count = 1
-
-            case_summaries.append(CaseResultSummary(
+        # 构建用例结果列表：步骤统计按用例状态查表
+        case_summaries = [
+            CaseResultSummary(
                 case_id=detail.case_id,
                 case_name=detail.case_name,
                 status=detail.status,
-                step_count=step_count,
-                passed_steps=passed_steps,
-                failed_steps=failed_steps,
                 error_message=detail.error_message,
-                screenshot_path=detail.screenshot_path
-            ))
+                screenshot_path=detail.screenshot_path,
+                **_STEP_COUNTS.get(detail.status, _NO_STEPS)
+            )
+            for detail in details
+        ]
 
         return ReportData(
             execution=execution_summary,
@@ -155,58 +239,23 @@ class ReportService:
         )
 
     # 渲染 HTML 的私有方法
-    async def _render_html(self, report_data: ReportData) -> str:
+    # 渲染并保存报告的私有方法
+    async def _render_and_save(self, execution_id: int, report_data: ReportData) -> str:
         """
-        使用 Jinja2 渲染 HTML
-
-        Args:
-            report_data: 报告数据
-
-        Returns:
-            渲染后的 HTML 内容
-        """
-        from jinja2 import Environment, FileSystemLoader, select_autoescape
-
-        # 创建 Jinja2 环境
-        template_dir = Path(__file__).parent.parent.parent / "templates"
-        env = Environment(
-            loader=FileSystemLoader(template_dir),
-            autoescape=select_autoescape(['html', 'xml'])
-        )
-
-        # 加载模板
-        template = env.get_template('report.html')
-
-        # 渲染模板
-        return template.render(
-            report=report_data,
-            generated_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        )
-
-    # 保存报告的私有方法
-    async def _save_report(self, execution_id: int, html_content: str) -> str:
-        """
-        保存 HTML 报告到文件
+        渲染 HTML 报告并直接流式写入文件
 
         Args:
             execution_id: 执行 ID
-            html_content: HTML 内容
+            report_data: 报告数据
 
         Returns:
             报告文件路径
         """
-        # 确保报告目录存在
-        reports_dir = REPORTS_DIR
-        reports_dir.mkdir(parents=True, exist_ok=True)
-
-        # 生成文件名
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"report_{execution_id}_{timestamp}.html"
-        file_path = reports_dir / filename
-
-        # 写入文件
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # 生成文件路径
+        file_path = _report_path(execution_id)
+
+        # 在工作线程中流式渲染并写入文件，避免阻塞事件循环
+        await asyncio.to_thread(_stream_report_file, file_path, report_data)
 
         return str(file_path)
 
@@ -0,0 +1,29 @@
+"""
+JSON 编解码工具
+优先使用 orjson（可选依赖，C 实现，序列化/解析更快），未安装时回退到标准库 json
+
+两种实现都导出 json_dumps、json_loads 和 JSONDecodeError，调用方捕获 JSONDecodeError 即可覆盖两种后端的解析错误
+"""
+# 导入标准库 json 模块，作为回退实现
+import json
+
+try:
+    # 导入 orjson 的序列化、解析函数和解析异常（orjson.JSONDecodeError 继承自 json.JSONDecodeError）
+    from orjson import dumps as _orjson_dumps, loads as json_loads, JSONDecodeError
+
+    def json_dumps(obj) -> str:
+        """
+        序列化为 JSON 字符串
+
+        Args:
+            obj: 待序列化的对象
+
+        Returns:
+            str: JSON 字符串（orjson 返回 bytes，这里解码为 str）
+        """
+        return _orjson_dumps(obj).decode()
+except ImportError:
+    # 未安装 orjson 时使用标准库实现
+    json_dumps = json.dumps
+    json_loads = json.loads
+    JSONDecodeError = json.JSONDecodeError
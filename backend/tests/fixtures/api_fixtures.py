@@ -24,6 +24,23 @@ from app.models.database import get_db
 from app.engines.playwright_engine import PlaywrightEngine
 
 
+# Mock 引擎 execute_case 的成功结果：一个跳转步骤执行成功
+_EXECUTE_CASE_OK = {
+    "success": True,
+    "total_steps": 1,
+    "success_steps": 1,
+    "failed_steps": 0,
+    "step_results": [
+        {
+            "step_order": 1,
+            "action_type": "navigate",
+            "success": True,
+            "message": "成功跳转到 https://example.com"
+        }
+    ]
+}
+
+
 # 定义创建测试客户端的 fixture
 @pytest.fixture(scope="function")
 def client(db_session: AsyncSession) -> Generator[TestClient, None, None]:
@@ -75,21 +92,8 @@ def mock_playwright_engine() -> MagicMock:
     mock.start_browser = AsyncMock(return_value=None)
     mock.close_browser = AsyncMock(return_value=None)
 
-    # 配置 execute_case 方法返回成功结果
-    mock.execute_case = AsyncMock(return_value={
-        "success": True,
-        "total_steps": 1,
-        "success_steps": 1,
-        "failed_steps": 0,
-        "step_results": [
-            {
-                "step_order": 1,
-                "action_type": "navigate",
-                "success": True,
-                "message": "成功跳转到 https://example.com"
-            }
-        ]
-    })
+    # 配置 execute_case 方法返回成功结果（模块级常量，服务只读取不修改）
+    mock.execute_case = AsyncMock(return_value=_EXECUTE_CASE_OK)
 
     # 配置 take_screenshot_on_error 方法返回截图路径
     mock.take_screenshot_on_error = AsyncMock(return_value="/screenshots/error_001.png")
@@ -98,6 +102,27 @@ def mock_playwright_engine() -> MagicMock:
     return mock
 
 
+# 定义替换服务层 PlaywrightEngine 的 fixture
+@pytest.fixture
+def patched_playwright_engine(monkeypatch, mock_playwright_engine) -> MagicMock:
+    """
+    将执行服务中的 PlaywrightEngine 替换为 Mock 引擎
+
+    服务内部每次创建引擎都返回同一个 mock_playwright_engine，测试结束后 monkeypatch 自动恢复
+
+    Returns:
+        MagicMock: 被注入到执行服务中的 Mock 引擎
+    """
+    # 替换执行服务模块中的引擎类，构造时忽略参数直接返回 Mock 引擎
+    monkeypatch.setattr(
+        "app.services.execution_service.PlaywrightEngine",
+        lambda *args, **kwargs: mock_playwright_engine
+    )
+
+    # 返回 Mock 引擎，便于测试断言调用情况
+    return mock_playwright_engine
+
+
 # 定义执行记录样本数据的 fixture
 @pytest.fixture
 def sample_execution_data():
@@ -249,6 +274,29 @@ def temp_reports_dir(tmp_path):
     return reports_dir
 
 
+# 定义替换报告保存目录的 fixture
+@pytest.fixture
+def reports_dir(temp_reports_dir, monkeypatch):
+    """
+    将报告保存目录替换为临时报告目录
+
+    report_service 在导入时绑定了 REPORTS_DIR，只改 app.config 不会影响服务，
+    因此同时替换服务模块中的引用；测试结束后 monkeypatch 自动恢复
+
+    Args:
+        temp_reports_dir: 临时报告目录 fixture
+        monkeypatch: pytest 提供的属性替换 fixture
+
+    Returns:
+        Path: 报告实际写入的临时目录
+    """
+    # 替换配置中的报告目录
+    monkeypatch.setattr("app.config.REPORTS_DIR", temp_reports_dir)
+    # 替换报告服务模块中已绑定的报告目录
+    monkeypatch.setattr("app.services.report_service.REPORTS_DIR", temp_reports_dir)
+    return temp_reports_dir
+
+
 # 定义示例报告文件的 fixture
 @pytest.fixture
 def sample_report_file(temp_reports_dir):
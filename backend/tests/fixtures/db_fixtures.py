@@ -4,10 +4,13 @@
 """
 # 导入 pytest 异步支持
 import pytest
+# 导入异步上下文管理器装饰器，用于 anext_once 辅助函数
+from contextlib import asynccontextmanager
 # 导入异步会话和引擎工厂
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-# 从 sqlalchemy.orm 导入会话
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+# 导入事件监听和静态连接池，用于测试引擎的连接复用与 PRAGMA 设置
+from sqlalchemy import event, insert, select
+from sqlalchemy.pool import StaticPool
 # 从本地模型模块导入所有 ORM 模型
 from app.models.case import TestCase, TestStep
 from app.models.execution import Execution, ExecutionDetail
@@ -17,6 +20,51 @@ from app.models.database import Base
 from datetime import datetime
 
 
+# 测试数据库 URL：命名的共享缓存内存数据库，同一进程内的连接访问同一个库
+TEST_DATABASE_URL = "sqlite+aiosqlite:///file:testdb?mode=memory&cache=shared&uri=true"
+
+
+def make_test_engine(url: str = TEST_DATABASE_URL):
+    """
+    创建测试用的异步内存数据库引擎
+
+    使用 StaticPool 始终复用同一个连接（不再为每次连接新建 aiosqlite 线程），
+    并在建立连接时关闭内存库用不到的持久化开销
+
+    Args:
+        url: 数据库连接 URL，默认使用共享缓存的内存数据库
+
+    Returns:
+        AsyncEngine 对象
+    """
+    # 创建异步引擎，StaticPool 保证只有一个底层连接
+    engine = create_async_engine(
+        url,
+        echo=False,  # 不打印 SQL 语句
+        poolclass=StaticPool,  # 所有会话复用同一个连接
+        connect_args={"check_same_thread": False},  # aiosqlite 在后台线程中访问连接
+    )
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """连接建立时设置 SQLite PRAGMA：日志和临时表放在内存中，不等待磁盘同步"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+        # 关闭驱动自带的隐式事务管理，改由下面的 begin 钩子显式发出 BEGIN，
+        # 这样 SAVEPOINT 才能正确嵌套在外层事务中
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        """事务开始时显式发出 BEGIN"""
+        conn.exec_driver_sql("BEGIN")
+
+    return engine
+
+
 # 定义创建测试数据库引擎的 fixture
 @pytest.fixture(scope="session")
 async def db_engine():
@@ -26,12 +74,8 @@ async def db_engine():
     使用 SQLite 内存数据库进行测试，每个会话（session scope）创建一次
     所有测试函数共享同一个引擎实例，但使用不同的会话（通过 db_session fixture）
     """
-    # 创建异步引擎，使用内存 SQLite 数据库
-    engine = create_async_engine(
-        "sqlite+aiosqlite:///:memory:",  # 内存数据库 URL
-        echo=False,  # 不打印 SQL 语句
-        future=True,  # 使用 SQLAlchemy 2.0 风格 API
-    )
+    # 创建异步引擎，使用共享缓存的内存 SQLite 数据库
+    engine = make_test_engine()
 
     # 创建所有表结构
     async with engine.begin() as conn:
@@ -54,25 +98,279 @@ async def db_session(db_engine):
     每个测试函数使用独立的会话，测试结束后自动回滚所有更改
     这样可以保证每个测试之间的数据隔离，不会相互影响
     """
-    # 创建异步会话工厂
-    async_session_maker = async_sessionmaker(
-        db_engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-        autocommit=False,
-        autoflush=False,
-    )
+    # 在独立连接上开启外层事务，测试结束后整体回滚
+    async with db_engine.connect() as conn:
+        await conn.begin()
 
-    # 使用上下文管理器创建会话
-    async with async_session_maker() as session:
-        # 开始嵌套事务（SAVEPOINT）
-        await session.begin_nested()
+        # 创建绑定到该连接的会话：会话内的 commit 只释放 SAVEPOINT，不会提交外层事务
+        session = AsyncSession(
+            bind=conn,
+            expire_on_commit=False,
+            autoflush=False,
+            join_transaction_mode="create_savepoint",
+        )
 
         # 生成会话给测试使用
         yield session
 
-        # 测试结束后回滚事务（撤销所有更改）
-        await session.rollback()
+        # 测试结束后关闭会话并回滚外层事务（撤销所有更改，包括测试中 commit 的数据）
+        await session.close()
+        await conn.rollback()
+
+
+# 定义统计 SQL 语句的 fixture
+@pytest.fixture(scope="function")
+def query_counter(db_engine):
+    """
+    记录测试期间通过 db_engine 发出的 SQL 语句
+
+    用于断言一次操作的查询次数，及时发现 N+1 查询；
+    （异步会话中的隐式懒加载本身会直接报错，这里补上显式查询次数的检查）
+
+    Returns:
+        list[str]: 按执行顺序记录的 SQL 语句，测试中可 clear() 后重新计数
+    """
+    # 已执行的 SQL 语句
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        # 每条语句发送到驱动前记录一次
+        statements.append(statement)
+
+    # 注册到同步引擎上的游标执行事件
+    event.listen(db_engine.sync_engine, "before_cursor_execute", _record)
+    yield statements
+    # 测试结束后移除监听
+    event.remove(db_engine.sync_engine, "before_cursor_execute", _record)
+
+
+# 定义批量预置用例数据的 fixture
+@pytest.fixture(scope="function")
+async def seed_cases(db_session):
+    """
+    批量预置测试用例数据
+
+    使用一条 executemany 的 INSERT 写入所有行（而不是逐行 add + commit），
+    数据随 db_session 在测试结束后回滚
+
+    Returns:
+        list[TestCase]: 按 ID 排序的预置用例
+    """
+    # 预置数据行
+    rows = [
+        {"name": "种子用例1", "priority": "P1"},
+        {"name": "种子用例2", "priority": "P2"},
+    ]
+    # 一次往返批量插入
+    await db_session.execute(insert(TestCase), rows)
+    # 查询出 ORM 对象供测试使用
+    result = await db_session.execute(
+        select(TestCase).where(TestCase.name.in_([row["name"] for row in rows])).order_by(TestCase.id)
+    )
+    return list(result.scalars().all())
+
+
+# 定义筛选测试用例数据集的 fixture
+@pytest.fixture(scope="function")
+async def filter_cases(db_session):
+    """
+    覆盖名称 / 优先级 / 标签各筛选维度的用例数据集
+
+    一条批量 INSERT 写入，供参数化的筛选测试共用
+    """
+    # 名称都包含"测试"；P0 两条；包含 smoke 标签两条、api 标签两条
+    await bulk_insert(db_session, TestCase, [
+        {"name": "登录测试", "priority": "P0", "tags": "smoke,regression"},
+        {"name": "注册测试", "priority": "P1", "tags": "api"},
+        {"name": "退出测试", "priority": "P0", "tags": "smoke,api"},
+    ])
+
+
+# 定义筛选测试执行记录数据集的 fixture
+@pytest.fixture(scope="function")
+async def filter_executions(db_session):
+    """
+    覆盖状态 / 浏览器类型各筛选维度的执行记录数据集
+
+    一条批量 INSERT 写入，供参数化的筛选测试共用
+    """
+    # pending 两条；chrome 两条
+    await bulk_insert(db_session, Execution, [
+        {"execution_type": "batch", "browser_type": "chrome", "status": "pending"},
+        {"execution_type": "batch", "browser_type": "firefox", "status": "pending"},
+        {"execution_type": "batch", "browser_type": "chrome", "status": "running"},
+    ])
+
+
+# 定义写入单条用例并返回 ID 的工厂 fixture
+@pytest.fixture(scope="function")
+def case_factory(db_session):
+    """
+    写入单条测试用例并返回其 ID
+
+    使用 Core 层 INSERT ... RETURNING 直接写库，不构建 ORM 对象，
+    数据随 db_session 在测试结束后回滚
+
+    Returns:
+        异步可调用对象：await case_factory(**kwargs) -> int，未指定的名称默认为"测试用例"
+    """
+    async def _make(**kwargs) -> int:
+        # 名称为必填字段，允许调用方覆盖
+        kwargs.setdefault("name", "测试用例")
+        # 插入一行并取回主键
+        result = await db_session.execute(insert(TestCase).values(**kwargs).returning(TestCase.id))
+        case_id = result.scalar_one()
+        # 提交（落在 db_session 的外层事务中，测试结束后回滚）
+        await db_session.commit()
+        return case_id
+
+    return _make
+
+
+# 定义写入单条执行记录并返回 ID 的工厂 fixture
+@pytest.fixture(scope="function")
+def execution_factory(db_session):
+    """
+    写入单条执行记录并返回其 ID
+
+    使用 Core 层 INSERT ... RETURNING 直接写库，不构建 ORM 对象，
+    数据随 db_session 在测试结束后回滚
+
+    Returns:
+        异步可调用对象：await execution_factory(**kwargs) -> int，
+        默认 execution_type="batch"、browser_type="chrome"、status="pending"
+    """
+    async def _make(**kwargs) -> int:
+        # 必填字段使用默认值，允许调用方覆盖
+        kwargs.setdefault("execution_type", "batch")
+        kwargs.setdefault("browser_type", "chrome")
+        kwargs.setdefault("status", "pending")
+        # 插入一行并取回主键
+        result = await db_session.execute(insert(Execution).values(**kwargs).returning(Execution.id))
+        execution_id = result.scalar_one()
+        # 提交（落在 db_session 的外层事务中，测试结束后回滚）
+        await db_session.commit()
+        return execution_id
+
+    return _make
+
+
+# 定义最小测试步骤工厂 fixture
+@pytest.fixture
+def make_step():
+    """
+    最小测试步骤工厂
+
+    只填充必填字段（case_id=1、step_order=1、action_type="click"），
+    其余字段保持模型默认值，由调用方按需覆盖
+
+    Returns:
+        可调用对象：make_step(**kwargs) -> TestStep（未持久化到数据库）
+    """
+    def _make_step(**kwargs) -> TestStep:
+        # 必填字段使用默认值，允许调用方覆盖
+        kwargs.setdefault("case_id", 1)
+        kwargs.setdefault("step_order", 1)
+        kwargs.setdefault("action_type", "click")
+        return TestStep(**kwargs)
+
+    return _make_step
+
+
+@pytest.fixture
+def make_execution():
+    """
+    最小执行记录工厂
+
+    只填充必填字段（execution_type="single"、browser_type="chrome"），
+    其余字段保持模型默认值，由调用方按需覆盖
+
+    Returns:
+        可调用对象：make_execution(**kwargs) -> Execution（未持久化到数据库）
+    """
+    def _make_execution(**kwargs) -> Execution:
+        # 必填字段使用默认值，允许调用方覆盖
+        kwargs.setdefault("execution_type", "single")
+        kwargs.setdefault("browser_type", "chrome")
+        return Execution(**kwargs)
+
+    return _make_execution
+
+
+@pytest.fixture
+def make_execution_detail():
+    """
+    最小执行详情工厂
+
+    只填充必填字段（execution_id=1、case_id=5、case_name="测试用例1"），
+    其余字段保持模型默认值，由调用方按需覆盖
+
+    Returns:
+        可调用对象：make_execution_detail(**kwargs) -> ExecutionDetail（未持久化到数据库）
+    """
+    def _make_execution_detail(**kwargs) -> ExecutionDetail:
+        # 必填字段使用默认值，允许调用方覆盖
+        kwargs.setdefault("execution_id", 1)
+        kwargs.setdefault("case_id", 5)
+        kwargs.setdefault("case_name", "测试用例1")
+        return ExecutionDetail(**kwargs)
+
+    return _make_execution_detail
+
+
+# ========== 辅助函数 ==========
+
+@asynccontextmanager
+async def anext_once(agen):
+    """
+    只取异步生成器的第一个值，退出时关闭生成器
+
+    替代 `async for x in agen: ...; break` 的写法：直接调用 __anext__ 取值，
+    退出 async with 时 aclose() 触发生成器中的 finally（如 get_db 关闭会话）
+
+    Args:
+        agen: 异步生成器，如 get_db()
+
+    Yields:
+        生成器产出的第一个值
+    """
+    try:
+        # 取第一个值交给调用方
+        yield await agen.__anext__()
+    finally:
+        # 关闭生成器，执行其清理逻辑
+        await agen.aclose()
+
+
+async def bulk_insert(db_session, model, rows):
+    """
+    批量写入数据行并提交
+
+    使用一条 executemany 的 INSERT（Core 语句）写入所有行，
+    跳过逐行构建 ORM 对象、属性追踪和逐行 flush
+
+    Args:
+        db_session: 测试数据库会话
+        model: ORM 模型类，如 TestCase
+        rows: 数据行字典列表
+    """
+    # 一次往返批量插入
+    await db_session.execute(insert(model), rows)
+    # 提交（落在 db_session 的外层事务中，测试结束后回滚）
+    await db_session.commit()
+
+
+def count_selects(statements):
+    """
+    统计 SQL 语句中的 SELECT 条数
+
+    Args:
+        statements: query_counter 记录的 SQL 语句列表
+
+    Returns:
+        int: SELECT 语句的数量
+    """
+    return sum(1 for sql in statements if sql.lstrip().upper().startswith("SELECT"))
 
 
 # ========== 模型工厂函数 ==========
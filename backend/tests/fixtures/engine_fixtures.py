@@ -4,7 +4,7 @@ PlaywrightEngine 测试 fixtures
 # 导入 pytest 测试框架，用于创建 fixture
 import pytest
 # 从 unittest.mock 导入模拟对象类，用于模拟外部依赖
-from unittest.mock import AsyncMock, MagicMock, Mock
+from unittest.mock import AsyncMock, MagicMock, Mock, create_autospec
 # 从 playwright.async_api 导入类型注解，用于类型提示
 from playwright.async_api import Browser, Page, BrowserContext, Locator
 
@@ -58,6 +58,53 @@ def mock_page():
     return page
 
 
+class PageStub:
+    """
+    轻量页面桩
+
+    替代 AsyncMock 模拟 Playwright Page：异步方法只记录调用参数，
+    不生成子 Mock 树，可通过 errors 为指定方法注入异常
+    """
+
+    def __init__(self):
+        # 调用记录列表，元素为 (方法名, 位置参数元组, 关键字参数字典)
+        self.calls = []
+        # 方法名 -> 调用时抛出的异常
+        self.errors = {}
+
+    def _record(self, name, args, kwargs):
+        """记录一次调用，若该方法配置了异常则抛出"""
+        # 追加调用记录
+        self.calls.append((name, args, kwargs))
+        # 如果为该方法注入了异常，模拟调用失败
+        if name in self.errors:
+            raise self.errors[name]
+
+    async def goto(self, *args, **kwargs):
+        """模拟页面跳转"""
+        # 记录 goto 调用
+        self._record("goto", args, kwargs)
+
+    async def wait_for_selector(self, *args, **kwargs):
+        """模拟等待选择器"""
+        # 记录 wait_for_selector 调用
+        self._record("wait_for_selector", args, kwargs)
+
+
+@pytest.fixture  # 标记为 pytest fixture
+def page_stub():
+    """轻量页面桩（每个测试独立的调用记录）"""
+    # 返回新的页面桩实例
+    return PageStub()
+
+
+@pytest.fixture(scope="session")  # 会话级：autospec 需要遍历 Page 的全部接口，只构建一次
+def _page_autospec():
+    """按 Playwright Page 接口生成的 autospec 模拟对象（spec_set 拒绝不存在的属性）"""
+    # 创建实例级 autospec，异步方法自动生成 AsyncMock
+    return create_autospec(Page, instance=True, spec_set=True)
+
+
 @pytest.fixture  # 标记为 pytest fixture
 def mock_locator():
     """模拟 Locator 对象"""
@@ -77,6 +124,34 @@ def mock_locator():
     return locator
 
 
+def stub_get_locator(engine, locator):
+    """
+    将引擎的 _get_locator 直接替换为返回指定定位器的协程函数
+
+    每个测试使用新建的引擎实例，无需像 patch.object 那样保存和恢复原属性
+
+    Args:
+        engine: PlaywrightEngine 实例
+        locator: _get_locator 要返回的定位器对象
+
+    Returns:
+        list: _get_locator 的调用参数记录（每次调用追加一个参数元组）
+    """
+    # 调用参数记录列表
+    calls = []
+
+    async def _get_locator(*args):
+        # 记录调用参数
+        calls.append(args)
+        # 返回预设的定位器
+        return locator
+
+    # 直接覆盖实例属性
+    engine._get_locator = _get_locator
+    # 返回调用记录供断言使用
+    return calls
+
+
 @pytest.fixture  # 标记为 pytest fixture
 def mock_playwright():
     """模拟 Playwright 对象"""
@@ -0,0 +1,65 @@
+"""
+Schema 测试 fixtures
+"""
+# 导入 pytest 测试框架，用于创建 fixture
+import pytest
+# 从 datetime 导入 datetime 类，用于构建固定时间
+from datetime import datetime
+# 从 pydantic 导入类型适配器（复用已编译的校验器）和验证错误异常
+from pydantic import TypeAdapter, ValidationError
+# 导入步骤创建模式
+from app.schemas.case import StepCreate
+# 导入执行任务创建模式
+from app.schemas.execution import ExecutionCreate
+
+
+@pytest.fixture(scope="module")  # 模块级：同一测试文件内只构建一次
+def three_steps():
+    """三个合法步骤（navigate / click / input），供用例创建与批量创建测试共享"""
+    # 数据可信，使用 model_construct 跳过校验直接构建
+    return [
+        StepCreate.model_construct(step_order=i, action_type=action)
+        for i, action in enumerate(["navigate", "click", "input"], 1)
+    ]
+
+
+@pytest.fixture(scope="session")  # 会话级：整个测试会话共用同一个时间对象
+def frozen_now():
+    """固定的"当前时间"，替代测试中零散的 datetime.now() 调用"""
+    # 时间字段只需合法值，测试不关心具体时刻
+    return datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture(scope="session")  # 会话级：类型适配器只构建一次
+def make_execution_create():
+    """ExecutionCreate 工厂：默认批量执行，按需覆盖字段"""
+    # 整个会话共用同一个已编译的校验器
+    adapter = TypeAdapter(ExecutionCreate)
+
+    # 定义工厂函数，合并默认值与覆盖字段后校验
+    def _make(**overrides):
+        return adapter.validate_python({"execution_type": "batch", **overrides})
+
+    # 返回工厂函数供测试调用
+    return _make
+
+
+# ========== 辅助函数 ==========
+
+def has_error_at(exc: ValidationError, loc: tuple) -> bool:
+    """
+    判断校验错误中是否有定位到指定字段的错误
+
+    只取结构化错误，不渲染错误文本和文档链接
+
+    Args:
+        exc: pydantic 校验错误
+        loc: 字段位置元组，如 ("name",)
+
+    Returns:
+        bool: 存在定位到该字段的错误时返回 True
+    """
+    return any(
+        e["loc"] == loc
+        for e in exc.errors(include_url=False, include_context=False, include_input=False)
+    )
@@ -2,6 +2,9 @@
 API 测试模块的 pytest 配置
 导入 API 测试所需的 fixtures
 """
+# 导入 pytest 测试框架，用于定义 fixture
+import pytest
+
 # 导入 API 测试相关的 fixtures
 from tests.fixtures.api_fixtures import (
     client,  # FastAPI 测试客户端
@@ -13,6 +16,7 @@ from tests.fixtures.api_fixtures import (
     sample_batch_delete_data,  # 批量删除样本数据
     # 报告测试 fixtures
     temp_reports_dir,  # 临时报告目录
+    reports_dir,  # 替换报告保存目录
     sample_report_file,  # 示例报告文件
     sample_report_files,  # 多个示例报告文件
     sample_report_with_screenshots,  # 包含截图的报告文件
@@ -24,3 +28,9 @@ from tests.fixtures.api_fixtures import (
 
 # 导入数据库 fixtures（所有 API 测试都需要）
 from tests.fixtures.db_fixtures import db_session
+
+
+@pytest.fixture(autouse=True)  # 自动应用到本目录下的所有测试
+def _isolated_reports_dir(reports_dir):
+    """生成报告的接口测试写入临时目录，不会写进真实的 backend/reports"""
+    return reports_dir
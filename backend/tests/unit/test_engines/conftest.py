@@ -0,0 +1,28 @@
+"""
+引擎测试模块的 pytest 配置
+在收集阶段预先导入 PlaywrightEngine，使 playwright 依赖树在每个进程（xdist worker）中只加载一次
+"""
+# 导入 pytest 测试框架，用于添加 xdist 分组标记
+import pytest
+
+# 预先导入引擎模块（连带 playwright.async_api），之后各测试文件的导入直接命中 sys.modules 缓存
+import app.engines.playwright_engine
+
+# 导入引擎测试共用的 fixtures
+from tests.fixtures.engine_fixtures import page_stub, _page_autospec
+
+
+def pytest_collection_modifyitems(config, items):
+    """按测试类分组：使用 --dist loadgroup 时同一类的测试落在同一个 xdist worker 上，共享类级 fixture"""
+    # 遍历收集到的测试项
+    for item in items:
+        # 只处理本目录下定义在测试类中的测试
+        if item.cls is None or "test_engines" not in item.nodeid:
+            continue
+        # 已显式声明分组的测试保持原分组
+        if item.get_closest_marker("xdist_group") is not None:
+            continue
+        # 以 "模块名::类名" 作为分组名
+        group = f"{item.module.__name__}::{item.cls.__name__}"
+        # 添加 xdist 分组标记
+        item.add_marker(pytest.mark.xdist_group(name=group))
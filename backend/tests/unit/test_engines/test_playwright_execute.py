@@ -3,214 +3,39 @@ PlaywrightEngine 执行控制器测试
 """
 # 导入 pytest 测试框架，用于编写测试用例和异步测试装饰器
 import pytest
-# 从 unittest.mock 导入模拟对象类和 patch 装饰器，用于模拟外部依赖
-from unittest.mock import AsyncMock, MagicMock, patch
+# 从 unittest.mock 导入模拟对象类，用于模拟外部依赖
+from unittest.mock import AsyncMock, MagicMock
 # 导入 PlaywrightEngine 类进行测试
 from app.engines.playwright_engine import PlaywrightEngine
+# 导入 _get_locator 替换辅助函数
+from tests.fixtures.engine_fixtures import stub_get_locator
+
+# navigate 步骤的 JSON 字符串参数（模块级常量，由引擎的 JSON 解析路径处理）
+NAV_PARAMS_JSON = '{"url": "https://example.com"}'
 
 
 class TestExecuteStep:
     """测试单步执行"""
 
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_execute_step_navigate(self):
-        """测试执行 navigate 步骤"""
-        # 创建引擎实例
-        engine = PlaywrightEngine()
-        # 设置模拟的页面对象
-        engine.page = AsyncMock()
-        # 模拟 goto 异步方法
-        engine.page.goto = AsyncMock()
-
-        # 定义测试步骤（跳转操作）
-        step = {
-            "action_type": "navigate",  # 操作类型：页面跳转
-            "action_params": '{"url": "https://example.com"}'  # 参数：JSON 字符串
-        }
-
-        # 执行步骤
-        result = await engine.execute_step(step)
-
-        # 验证：返回成功状态
-        assert result["success"] is True
-        # 验证：消息包含"成功跳转到"
-        assert "成功跳转到" in result["message"]
-
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_execute_step_navigate_dict_params(self):
-        """测试 navigate 步骤（字典参数）"""
-        # 创建引擎实例
-        engine = PlaywrightEngine()
-        # 设置模拟的页面对象
-        engine.page = AsyncMock()
-        # 模拟 goto 异步方法
-        engine.page.goto = AsyncMock()
-
-        # 定义测试步骤（使用字典格式参数）
-        step = {
-            "action_type": "navigate",  # 操作类型
-            "action_params": {"url": "https://example.com"}  # 参数：字典格式
-        }
-
-        # 执行步骤
-        result = await engine.execute_step(step)
-
-        # 验证：返回成功状态
-        assert result["success"] is True
-
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_execute_step_click(self):
-        """测试执行 click 步骤"""
-        # 创建引擎实例
-        engine = PlaywrightEngine()
-
-        # 创建模拟的定位器对象
-        mock_locator = MagicMock()
-        # 模拟 click 异步方法
-        mock_locator.click = AsyncMock()
-
-        # 模拟 _get_locator 方法返回模拟定位器
-        with patch.object(engine, '_get_locator', return_value=mock_locator):
-            # 定义测试步骤（点击操作）
-            step = {
-                "action_type": "click",  # 操作类型：点击
-                "element_locator": "#button",  # 元素定位符
-                "locator_type": "css"  # 定位类型
-            }
-            # 执行步骤
-            result = await engine.execute_step(step)
-
-        # 验证：返回成功状态
-        assert result["success"] is True
-
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_execute_step_input(self):
-        """测试执行 input 步骤"""
-        # 创建引擎实例
-        engine = PlaywrightEngine()
-
-        # 创建模拟的定位器对象
-        mock_locator = MagicMock()
-        # 模拟 fill 异步方法（输入文本）
-        mock_locator.fill = AsyncMock()
-
-        # 模拟 _get_locator 方法返回模拟定位器
-        with patch.object(engine, '_get_locator', return_value=mock_locator):
-            # 定义测试步骤（输入操作）
-            step = {
-                "action_type": "input",  # 操作类型：输入文本
-                "element_locator": "#input",  # 元素定位符
-                "locator_type": "css",  # 定位类型
-                "action_params": {"text": "test"}  # 参数：输入的文本
-            }
-            # 执行步骤
-            result = await engine.execute_step(step)
-
-        # 验证：返回成功状态
-        assert result["success"] is True
-
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_execute_step_clear(self):
-        """测试执行 clear 步骤"""
-        # 创建引擎实例
-        engine = PlaywrightEngine()
-
-        # 创建模拟的定位器对象
-        mock_locator = MagicMock()
-        # 模拟 clear 异步方法
-        mock_locator.clear = AsyncMock()
-
-        # 模拟 _get_locator 方法返回模拟定位器
-        with patch.object(engine, '_get_locator', return_value=mock_locator):
-            # 定义测试步骤（清除操作）
-            step = {
-                "action_type": "clear",  # 操作类型：清除输入框内容
-                "element_locator": "#input",  # 元素定位符
-                "locator_type": "css"  # 定位类型
-            }
-            # 执行步骤
-            result = await engine.execute_step(step)
-
-        # 验证：返回成功状态
-        assert result["success"] is True
-
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_execute_step_wait(self):
-        """测试执行 wait 步骤"""
-        # 创建引擎实例
-        engine = PlaywrightEngine()
-
-        # 创建模拟的定位器对象
-        mock_locator = MagicMock()
-        # 模拟 wait_for 异步方法
-        mock_locator.wait_for = AsyncMock()
-
-        # 模拟 _get_locator 方法返回模拟定位器
-        with patch.object(engine, '_get_locator', return_value=mock_locator):
-            # 定义测试步骤（等待操作）
-            step = {
-                "action_type": "wait",  # 操作类型：等待元素
-                "element_locator": "#element",  # 元素定位符
-                "locator_type": "css",  # 定位类型
-                "action_params": {"timeout": 5000}  # 参数：超时时间 5 秒
-            }
-            # 执行步骤
-            result = await engine.execute_step(step)
-
-        # 验证：返回成功状态
-        assert result["success"] is True
-
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_execute_step_verify_text(self):
-        """测试执行 verify_text 步骤"""
+    @pytest.mark.parametrize("action_params", [
+        pytest.param(NAV_PARAMS_JSON, id="json_string"),  # 参数：JSON 字符串
+        pytest.param({"url": "https://example.com"}, id="dict"),  # 参数：字典格式
+    ])  # 参数化测试
+    async def test_execute_step_navigate(self, page_stub, action_params):
+        """测试执行 navigate 步骤（分发冒烟测试，覆盖两种参数格式的解析）"""
         # 创建引擎实例
         engine = PlaywrightEngine()
-        # 设置模拟的页面对象
-        engine.page = AsyncMock()
-        # 模拟 wait_for_selector 异步方法
-        engine.page.wait_for_selector = AsyncMock()
+        # 设置页面桩对象
+        engine.page = page_stub
 
-        # 定义测试步骤（验证文本操作）
-        step = {
-            "action_type": "verify_text",  # 操作类型：验证文本存在
-            "action_params": {"text": "Welcome"}  # 参数：要验证的文本
-        }
-
-        # 执行步骤
-        result = await engine.execute_step(step)
+        # 执行跳转步骤
+        result = await engine.execute_step({"action_type": "navigate", "action_params": action_params})
 
         # 验证：返回成功状态
         assert result["success"] is True
+        # 验证：解析出的 URL 传给了 page.goto
+        assert page_stub.calls[0][1] == ("https://example.com",)
 
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_execute_step_verify_element(self):
-        """测试执行 verify_element 步骤"""
-        # 创建引擎实例
-        engine = PlaywrightEngine()
-
-        # 定义模拟的 _get_locator 异步函数
-        async def mock_get_locator(*args, **kwargs):
-            # 创建模拟的定位器对象
-            mock_locator = MagicMock()
-            # 模拟 count 属性返回 1（元素存在）
-            mock_locator.count = AsyncMock(return_value=1)
-            return mock_locator
-
-        # 模拟 _get_locator 方法
-        with patch.object(engine, '_get_locator', side_effect=mock_get_locator):
-            # 定义测试步骤（验证元素操作）
-            step = {
-                "action_type": "verify_element",  # 操作类型：验证元素存在
-                "element_locator": "#element",  # 元素定位符
-                "locator_type": "css"  # 定位类型
-            }
-            # 执行步骤
-            result = await engine.execute_step(step)
-
-        # 验证：返回成功状态
-        assert result["success"] is True
-
-    @pytest.mark.asyncio  # 标记为异步测试
     async def test_execute_step_invalid_action_type(self):
         """测试无效的操作类型"""
         # 创建引擎实例
@@ -229,7 +54,6 @@ class TestExecuteStep:
         # 验证：消息包含"不支持的操作类型"
         assert "不支持的操作类型" in result["message"]
 
-    @pytest.mark.asyncio  # 标记为异步测试
     async def test_execute_step_missing_required_param(self):
         """测试缺少必需参数"""
         # 创建引擎实例
@@ -247,15 +71,14 @@ class TestExecuteStep:
         # 验证：返回失败状态
         assert result["success"] is False
 
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_execute_step_exception(self):
+    async def test_execute_step_exception(self, page_stub):
         """测试步骤执行异常"""
         # 创建引擎实例
         engine = PlaywrightEngine()
-        # 设置模拟的页面对象
-        engine.page = AsyncMock()
         # 模拟 goto 方法抛出异常（浏览器崩溃）
-        engine.page.goto = AsyncMock(side_effect=RuntimeError("Browser crash"))
+        page_stub.errors["goto"] = RuntimeError("Browser crash")
+        # 设置页面桩对象
+        engine.page = page_stub
 
         # 定义测试步骤
         step = {
@@ -271,7 +94,6 @@ class TestExecuteStep:
         # 验证：结果包含错误信息
         assert "error" in result
 
-    @pytest.mark.asyncio  # 标记为异步测试
     async def test_execute_step_default_locator_type(self):
         """测试默认定位类型"""
         # 创建引擎实例
@@ -282,37 +104,44 @@ class TestExecuteStep:
         # 模拟 click 异步方法
         mock_locator.click = AsyncMock()
 
-        # 模拟 _get_locator 方法，并获取 mock 对象
-        with patch.object(engine, '_get_locator', return_value=mock_locator) as mock_get:
-            # 定义测试步骤（未指定 locator_type）
-            step = {
-                "action_type": "click",
-                "element_locator": "#button",
-                # 未指定 locator_type，应使用默认值 "css"
-            }
-            # 执行步骤
-            result = await engine.execute_step(step)
+        # 替换 _get_locator 方法，直接返回模拟定位器并记录调用参数
+        get_locator_calls = stub_get_locator(engine, mock_locator)
+
+        # 定义测试步骤（未指定 locator_type）
+        step = {
+            "action_type": "click",
+            "element_locator": "#button",
+            # 未指定 locator_type，应使用默认值 "css"
+        }
+        # 执行步骤
+        result = await engine.execute_step(step)
 
         # 验证：返回成功状态
         assert result["success"] is True
-        # 验证：_get_locator 被调用时使用了默认定位类型 "css"
-        mock_get.assert_called_once_with("css", "#button")
+        # 验证：_get_locator 只被调用一次，且使用了默认定位类型 "css"
+        assert get_locator_calls == [("css", "#button")]
 
 
 class TestExecuteCase:
     """测试用例执行"""
 
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_execute_case_all_success(self):
+    @pytest.fixture(autouse=True)  # 自动应用到本类的所有测试
+    def _noop_screenshot(self, monkeypatch):
+        """默认将失败截图替换为空操作，需要特定返回值的测试在用例内覆盖"""
+        # 定义不截图的替身方法
+        async def _take_screenshot_on_error(self, error_info):
+            return None
+
+        # 替换类方法，测试结束后 monkeypatch 自动恢复
+        monkeypatch.setattr(PlaywrightEngine, "take_screenshot_on_error", _take_screenshot_on_error)
+
+    @pytest.mark.slow  # 完整用例流程，默认快速通道中跳过
+    async def test_execute_case_all_success(self, page_stub):
         """测试所有步骤都成功"""
         # 创建引擎实例
         engine = PlaywrightEngine()
-        # 设置模拟的页面对象
-        engine.page = AsyncMock()
-        # 模拟 goto 异步方法
-        engine.page.goto = AsyncMock()
-        # 模拟 wait_for_selector 异步方法
-        engine.page.wait_for_selector = AsyncMock()
+        # 设置页面桩对象
+        engine.page = page_stub
 
         # 定义测试用例数据
         case_data = {
@@ -346,21 +175,15 @@ class TestExecuteCase:
         # 验证：步骤结果列表长度为 2
         assert len(result["step_results"]) == 2
 
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_execute_case_with_failure(self):
+    @pytest.mark.slow  # 完整用例流程，默认快速通道中跳过
+    async def test_execute_case_with_failure(self, page_stub):
         """测试有失败的用例"""
         # 创建引擎实例
         engine = PlaywrightEngine()
-        # 设置模拟的页面对象
-        engine.page = AsyncMock()
-        # 模拟 goto 异步方法
-        engine.page.goto = AsyncMock()
         # 模拟 wait_for_selector 方法抛出超时异常
-        engine.page.wait_for_selector = AsyncMock(
-            side_effect=Exception("Timeout")
-        )
-        # 模拟错误截图方法
-        engine.take_screenshot_on_error = AsyncMock(return_value="/path/to/screenshot.png")
+        page_stub.errors["wait_for_selector"] = Exception("Timeout")
+        # 设置页面桩对象
+        engine.page = page_stub
 
         # 定义测试用例数据（第二步会失败）
         case_data = {
@@ -392,7 +215,6 @@ class TestExecuteCase:
         # 验证：失败步骤数为 1
         assert result["failed_steps"] == 1
 
-    @pytest.mark.asyncio  # 标记为异步测试
     async def test_execute_case_empty_steps(self):
         """测试空步骤用例"""
         # 创建引擎实例
@@ -417,15 +239,12 @@ class TestExecuteCase:
         # 验证：失败步骤数为 0
         assert result["failed_steps"] == 0
 
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_execute_case_step_results_include_order(self):
+    async def test_execute_case_step_results_include_order(self, page_stub):
         """测试步骤结果包含顺序"""
         # 创建引擎实例
         engine = PlaywrightEngine()
-        # 设置模拟的页面对象
-        engine.page = AsyncMock()
-        # 模拟 goto 异步方法
-        engine.page.goto = AsyncMock()
+        # 设置页面桩对象
+        engine.page = page_stub
 
         # 定义测试用例（步骤顺序为 5）
         case_data = {
@@ -448,15 +267,15 @@ class TestExecuteCase:
         # 验证：步骤结果中包含 action_type
         assert result["step_results"][0]["action_type"] == "navigate"
 
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_execute_case_screenshot_on_failure(self):
+    @pytest.mark.slow  # 完整用例流程，默认快速通道中跳过
+    async def test_execute_case_screenshot_on_failure(self, page_stub):
         """测试失败时截图"""
         # 创建引擎实例
         engine = PlaywrightEngine()
-        # 设置模拟的页面对象
-        engine.page = AsyncMock()
         # 模拟 goto 方法抛出异常
-        engine.page.goto = AsyncMock(side_effect=Exception("Error"))
+        page_stub.errors["goto"] = Exception("Error")
+        # 设置页面桩对象
+        engine.page = page_stub
         # 模拟错误截图方法，返回截图路径
         engine.take_screenshot_on_error = AsyncMock(return_value="/screenshots/error.png")
 
@@ -3,12 +3,8 @@ PlaywrightEngine 初始化测试
 """
 # 导入 pytest 测试框架，用于编写测试用例和参数化测试装饰器
 import pytest
-# 从 unittest.mock 导入 patch 和 MagicMock，用于模拟外部依赖（如 async_playwright）
-from unittest.mock import patch, MagicMock
 # 导入 PlaywrightEngine 类进行测试
 from app.engines.playwright_engine import PlaywrightEngine
-# 导入浏览器类型枚举（虽然此测试中未直接使用，但保留以备将来扩展）
-from app.config import BrowserType
 
 
 class TestPlaywrightEngineInit:
@@ -82,42 +78,25 @@ class TestPlaywrightEngineInit:
         # 验证：无效窗口大小回退到默认值 1920x1080
         assert engine.window_size == {"width": 1920, "height": 1080}
 
-    @pytest.mark.parametrize("browser_type", ["chromium", "firefox", "webkit"])  # 参数化测试
-    def test_valid_browser_types(self, browser_type):
+    def test_valid_browser_types(self):
         """测试有效的浏览器类型"""
-        # 使用参数化的浏览器类型创建引擎
-        engine = PlaywrightEngine(browser_type=browser_type)
-        # 验证：浏览器类型正确设置
-        assert engine.browser_type == browser_type
+        # 依次使用每种浏览器类型创建引擎
+        for browser_type in ("chromium", "firefox", "webkit"):
+            # 验证：浏览器类型正确设置
+            assert PlaywrightEngine(browser_type=browser_type).browser_type == browser_type
 
 
 class TestPlaywrightEngineAttributes:
     """测试 PlaywrightEngine 属性"""
 
-    def test_playwright_attribute_initially_none(self):
-        """测试 playwright 属性初始为 None"""
-        # 创建引擎实例
-        engine = PlaywrightEngine()
-        # 验证：playwright 属性初始为 None（未启动）
-        assert engine.playwright is None
-
-    def test_browser_attribute_initially_none(self):
-        """测试 browser 属性初始为 None"""
-        # 创建引擎实例
-        engine = PlaywrightEngine()
-        # 验证：browser 属性初始为 None（未启动浏览器）
-        assert engine.browser is None
-
-    def test_context_attribute_initially_none(self):
-        """测试 context 属性初始为 None"""
-        # 创建引擎实例
-        engine = PlaywrightEngine()
-        # 验证：context 属性初始为 None（未创建上下文）
-        assert engine.context is None
-
-    def test_page_attribute_initially_none(self):
-        """测试 page 属性初始为 None"""
-        # 创建引擎实例
-        engine = PlaywrightEngine()
-        # 验证：page 属性初始为 None（未创建页面）
-        assert engine.page is None
+    @pytest.fixture(scope="class")  # fixture 作用域为整个测试类（所有参数共享一个实例）
+    def engine(self):
+        """未启动的引擎实例（只读，类内共享）"""
+        # 创建引擎实例，仅用于读取初始属性
+        return PlaywrightEngine()
+
+    @pytest.mark.parametrize("attr", ["playwright", "browser", "context", "page"])  # 参数化测试
+    def test_attribute_initially_none(self, engine, attr):
+        """测试 playwright/browser/context/page 属性初始为 None"""
+        # 验证：未启动时各运行时属性均为 None
+        assert getattr(engine, attr) is None
@@ -3,68 +3,95 @@ PlaywrightEngine 截图功能测试
 """
 # 导入 pytest 测试框架，用于编写测试用例和异步测试装饰器
 import pytest
+# 导入 os.path，用于以字符串方式拼接期望路径
+import os.path
 # 导入 Path 路径处理类，用于路径验证和操作
 from pathlib import Path
-# 导入 datetime 时间类（此测试中未直接使用，但相关功能依赖时间戳）
-from datetime import datetime
-# 从 unittest.mock 导入模拟对象类和 patch 装饰器，用于模拟外部依赖
-from unittest.mock import AsyncMock, MagicMock, patch
+# 从 unittest.mock 导入 patch 装饰器，用于模拟外部依赖
+from unittest.mock import patch
 # 导入 PlaywrightEngine 类进行测试
 from app.engines.playwright_engine import PlaywrightEngine
 # 导入截图目录配置常量，用于路径验证
 from app.config import SCREENSHOTS_DIR
 
+# 截图目录的字符串形式，模块加载时只转换一次
+_SSDIR_STR = str(SCREENSHOTS_DIR)
+
+
+@pytest.fixture(scope="class")  # 类级 fixture：每个测试类只 patch 一次 datetime
+def _patched_datetime():
+    """替换引擎模块中的 datetime（控制截图文件名中的时间戳）"""
+    # 在整个测试类期间保持 patch，类结束后自动恢复
+    with patch('app.engines.playwright_engine.datetime') as mock_datetime:
+        yield mock_datetime
+
+
+@pytest.fixture(autouse=True)  # 自动应用：类级 patch 生效期间每个测试都从干净的模拟对象开始
+def mock_datetime(_patched_datetime):
+    """重置类级 datetime 模拟对象，并设置默认时间戳"""
+    # 清空上一个测试留下的调用记录、返回值和副作用
+    _patched_datetime.reset_mock(return_value=True, side_effect=True)
+    # 模拟时间戳格式化默认返回固定值
+    _patched_datetime.now.return_value.strftime.return_value = "20231227_120000_123456"
+    # 返回模拟对象，测试可按需覆盖 side_effect
+    return _patched_datetime
+
+
+@pytest.fixture(scope="module")  # 模块级 fixture：所有截图测试共享一个引擎实例
+def engine(_page_autospec):
+    """带模拟页面（缓存的 Page autospec）的引擎"""
+    # 创建引擎实例
+    engine = PlaywrightEngine()
+    # 设置模拟的页面对象
+    engine.page = _page_autospec
+    # 返回配置好的引擎
+    return engine
+
+
+@pytest.fixture(autouse=True)  # 每个测试前自动执行
+def _reset_page(engine):
+    """清空共享模拟页面的调用记录、返回值和副作用"""
+    # 重置整个模拟页面（含 screenshot 的调用次数）
+    engine.page.reset_mock(return_value=True, side_effect=True)
+
 
 class TestTakeScreenshot:
     """测试截图功能"""
 
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_take_screenshot_with_filename(self):
-        """测试使用指定文件名截图"""
-        # 创建引擎实例
-        engine = PlaywrightEngine()
-        # 设置模拟的页面对象
-        engine.page = AsyncMock()
-        # 模拟 screenshot 异步方法
-        engine.page.screenshot = AsyncMock()
+    @pytest.mark.parametrize("filename,expected_name", [  # 参数化测试数据
+        ("test_screenshot.png", "test_screenshot.png"),  # 指定文件名
+        (None, "screenshot_20231227_120000_123456.png"),  # 自动生成文件名（时间戳由 mock_datetime 固定）
+    ])
+    async def test_take_screenshot_path(self, engine, filename, expected_name):
+        """测试截图文件路径（指定文件名 / 自动生成文件名）"""
+        # 构建期望的完整路径（直接拼接字符串，不构造 Path 对象）
+        expected_path = os.path.join(_SSDIR_STR, expected_name)
 
-        # 定义截图文件名
-        filename = "test_screenshot.png"
         # 调用截图方法并获取结果路径
         result = await engine.take_screenshot(filename)
 
-        # 构建期望的完整路径
-        expected_path = str(SCREENSHOTS_DIR / filename)
-        # 验证：返回路径与期望路径一致
+        # 验证：返回路径与期望路径一致（位于截图目录下、文件名正确）
         assert result == expected_path
-        # 验证：screenshot 方法被调用且参数正确
+        # 验证：screenshot 方法被调用一次且参数正确
         engine.page.screenshot.assert_called_once_with(path=expected_path)
 
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_take_screenshot_without_filename(self):
-        """测试自动生成文件名截图"""
-        # 创建引擎实例
-        engine = PlaywrightEngine()
-        # 设置模拟的页面对象
-        engine.page = AsyncMock()
-        # 模拟 screenshot 异步方法
-        engine.page.screenshot = AsyncMock()
-
-        # 使用 patch 模拟 datetime 模块（控制时间戳）
-        with patch('app.engines.playwright_engine.datetime') as mock_datetime:
-            # 模拟时间戳格式化返回固定值
-            mock_datetime.now.return_value.strftime.return_value = "20231227_120000_123456"
-            # 调用截图方法（不传文件名，自动生成）
-            result = await engine.take_screenshot()
-
-        # 验证：返回路径以截图目录开头
-        assert result.startswith(str(SCREENSHOTS_DIR))
-        # 验证：返回路径以 .png 结尾
-        assert result.endswith(".png")
-        # 验证：screenshot 方法被调用了一次
-        engine.page.screenshot.assert_called_once()
+    async def test_multiple_screenshots_same_session(self, engine, mock_datetime):
+        """测试同一会话多次截图生成不同文件名"""
+        # 模拟两个不同的时间戳
+        mock_datetime.now.return_value.strftime.side_effect = [
+            "20231227_120000_100000",  # 第一个截图时间戳
+            "20231227_120000_200000"  # 第二个截图时间戳
+        ]
+
+        # 调用截图方法两次
+        result1 = await engine.take_screenshot()
+        result2 = await engine.take_screenshot()
+
+        # 验证：两次截图路径不同
+        assert result1 != result2
+        # 验证：screenshot 方法被调用了 2 次
+        assert engine.page.screenshot.call_count == 2
 
-    @pytest.mark.asyncio  # 标记为异步测试
     async def test_take_screenshot_raises_error_when_page_not_initialized(self):
         """测试页面未初始化时截图抛出错误"""
         # 创建引擎实例（未初始化 page）
@@ -78,87 +105,37 @@ class TestTakeScreenshot:
         # 验证：异常信息包含 "页面未初始化"
         assert "页面未初始化" in str(exc_info.value)
 
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_take_screenshot_creates_file(self):
-        """测试截图文件创建"""
-        # 创建引擎实例
-        engine = PlaywrightEngine()
-        # 设置模拟的页面对象
-        engine.page = AsyncMock()
-        # 模拟 screenshot 异步方法
-        engine.page.screenshot = AsyncMock()
-
-        # 定义截图文件名
-        filename = "test_create.png"
-        # 调用截图方法
-        result = await engine.take_screenshot(filename)
-
-        # 验证：返回路径的文件名与输入一致
-        assert Path(result).name == filename
-        # 验证：返回路径包含截图目录
-        assert str(SCREENSHOTS_DIR) in result
-
 
 class TestTakeScreenshotOnError:
     """测试失败时截图"""
 
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_take_screenshot_on_error(self):
+    async def test_take_screenshot_on_error(self, engine, mock_datetime):
         """测试错误时自动截图"""
-        # 创建引擎实例
-        engine = PlaywrightEngine()
-        # 设置模拟的页面对象
-        engine.page = AsyncMock()
-        # 模拟 screenshot 异步方法
-        engine.page.screenshot = AsyncMock()
-
-        # 使用 patch 模拟 datetime 模块
-        with patch('app.engines.playwright_engine.datetime') as mock_datetime:
-            # 模拟时间戳格式化返回固定值
-            mock_datetime.now.return_value.strftime.return_value = "20231227_120000_123456"
-            # 调用错误截图方法（传入错误信息）
-            result = await engine.take_screenshot_on_error({"error": "Test error"})
+        # 调用错误截图方法（传入错误信息，时间戳由 mock_datetime 固定）
+        result = await engine.take_screenshot_on_error({"error": "Test error"})
 
         # 验证：文件名包含 error_ 前缀
         assert "error_" in Path(result).name
         # 验证：文件以 .png 结尾
         assert result.endswith(".png")
 
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_take_screenshot_on_error_generates_unique_names(self):
+    async def test_take_screenshot_on_error_generates_unique_names(self, engine, mock_datetime):
         """测试每次生成唯一的文件名"""
-        # 创建引擎实例
-        engine = PlaywrightEngine()
-        # 设置模拟的页面对象
-        engine.page = AsyncMock()
-        # 模拟 screenshot 异步方法
-        engine.page.screenshot = AsyncMock()
-
-        # 使用 patch 模拟 datetime 模块
-        with patch('app.engines.playwright_engine.datetime') as mock_datetime:
-            # 模拟不同的时间戳（side_effect 允许每次调用返回不同值）
-            mock_datetime.now.return_value.strftime.side_effect = [
-                "20231227_120000_100000",  # 第一个时间戳
-                "20231227_120000_200000"  # 第二个时间戳
-            ]
-
-            # 调用错误截图方法两次
-            result1 = await engine.take_screenshot_on_error({"error": "Error 1"})
-            result2 = await engine.take_screenshot_on_error({"error": "Error 2"})
+        # 模拟不同的时间戳（side_effect 允许每次调用返回不同值）
+        mock_datetime.now.return_value.strftime.side_effect = [
+            "20231227_120000_100000",  # 第一个时间戳
+            "20231227_120000_200000"  # 第二个时间戳
+        ]
+
+        # 调用错误截图方法两次
+        result1 = await engine.take_screenshot_on_error({"error": "Error 1"})
+        result2 = await engine.take_screenshot_on_error({"error": "Error 2"})
 
         # 验证：两次生成的文件名不同
         assert result1 != result2
 
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_take_screenshot_on_error_uses_take_screenshot(self):
+    async def test_take_screenshot_on_error_uses_take_screenshot(self, engine):
         """测试错误截图调用基础截图方法"""
-        # 创建引擎实例
-        engine = PlaywrightEngine()
-        # 设置模拟的页面对象
-        engine.page = AsyncMock()
-        # 模拟 screenshot 异步方法
-        engine.page.screenshot = AsyncMock()
-
         # 使用 patch.object 模拟引擎的 take_screenshot 方法
         with patch.object(engine, 'take_screenshot') as mock_take:
             # 设置模拟方法的返回值
@@ -170,59 +147,20 @@ class TestTakeScreenshotOnError:
         assert result == "/screenshots/error_test.png"
 
 
+@pytest.mark.slow  # 涉及文件系统的集成测试，默认不运行
+@pytest.mark.xdist_group("screenshots")  # 涉及 SCREENSHOTS_DIR 的测试固定在同一个 worker 上
 class TestScreenshotIntegration:
     """截图功能集成测试"""
 
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_screenshot_directory_exists(self):
-        """测试截图目录存在"""
-        # 验证：截图目录实际存在
-        assert SCREENSHOTS_DIR.exists()
-        # 验证：截图路径确实是一个目录
+    def test_screenshot_directory_exists(self):
+        """测试截图目录存在（纯同步检查，无需事件循环）"""
+        # 验证：截图目录存在且是一个目录（is_dir 对不存在的路径返回 False，一次 stat 即可）
         assert SCREENSHOTS_DIR.is_dir()
 
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_screenshot_path_is_absolute(self):
+    async def test_screenshot_path_is_absolute(self, engine):
         """测试截图路径是绝对路径"""
-        # 创建引擎实例
-        engine = PlaywrightEngine()
-        # 设置模拟的页面对象
-        engine.page = AsyncMock()
-        # 模拟 screenshot 异步方法
-        engine.page.screenshot = AsyncMock()
-
         # 调用截图方法
         result = await engine.take_screenshot("test.png")
 
         # 验证：返回的是绝对路径
         assert Path(result).is_absolute()
-
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_multiple_screenshots_same_session(self):
-        """测试同一会话多次截图"""
-        # 创建引擎实例
-        engine = PlaywrightEngine()
-        # 设置模拟的页面对象
-        engine.page = AsyncMock()
-        # 模拟 screenshot 异步方法
-        engine.page.screenshot = AsyncMock()
-
-        # 使用 patch 模拟 datetime 模块
-        with patch('app.engines.playwright_engine.datetime') as mock_datetime:
-            # 模拟三个不同的时间戳
-            mock_datetime.now.return_value.strftime.side_effect = [
-                "20231227_120000_100000",  # 第一个截图时间戳
-                "20231227_120000_200000",  # 第二个截图时间戳
-                "20231227_120000_300000"  # 第三个截图时间戳
-            ]
-
-            # 调用截图方法三次
-            result1 = await engine.take_screenshot()
-            result2 = await engine.take_screenshot()
-            result3 = await engine.take_screenshot()
-
-        # 验证：所有截图路径都不同（集合长度为 3）
-        assert len({result1, result2, result3}) == 3
-
-        # 验证：screenshot 方法被调用了 3 次
-        assert engine.page.screenshot.call_count == 3
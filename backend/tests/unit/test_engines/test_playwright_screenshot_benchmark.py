@@ -0,0 +1,46 @@
+"""
+PlaywrightEngine 截图调用开销基准测试
+需要 pytest-benchmark；未安装时整个模块跳过
+
+pytest.ini 默认的 -n auto（xdist）会让 pytest-benchmark 停用，需关闭 xdist 单独运行
+（addopts 中的 -n / --dist 在禁用 xdist 后无法识别，一并清空）：
+    python -m pytest -p no:xdist -o addopts="" tests/unit/test_engines/test_playwright_screenshot_benchmark.py
+"""
+# 导入 asyncio，用于创建基准测试复用的事件循环
+import asyncio
+# 导入 pytest 测试框架
+import pytest
+# 导入 SimpleNamespace，用于构建轻量页面桩
+from types import SimpleNamespace
+# 从 unittest.mock 导入异步模拟对象，模拟 page.screenshot
+from unittest.mock import AsyncMock
+
+# pytest-benchmark 为可选依赖，缺失时跳过本模块
+pytest.importorskip("pytest_benchmark")
+
+# 导入 PlaywrightEngine 类进行测试
+from app.engines.playwright_engine import PlaywrightEngine
+
+
+@pytest.fixture(scope="module")  # 模块级：事件循环只创建一次
+def bench_loop():
+    """基准测试复用的事件循环，避免每轮创建/销毁循环的开销计入测量结果"""
+    # 创建独立的事件循环（同步测试中没有正在运行的循环）
+    loop = asyncio.new_event_loop()
+    yield loop
+    # 模块结束后关闭循环
+    loop.close()
+
+
+@pytest.mark.benchmark(group="screenshot")  # 归入 screenshot 基准分组
+def test_screenshot_dispatch_cost(benchmark, bench_loop):
+    """测量 take_screenshot 的调度开销（page.screenshot 已模拟，不产生真实截图）"""
+    # 创建引擎实例并挂载只提供 screenshot 的页面桩
+    engine = PlaywrightEngine()
+    engine.page = SimpleNamespace(screenshot=AsyncMock())
+
+    # 在同一个事件循环上重复运行截图协程并记录耗时
+    result = benchmark(lambda: bench_loop.run_until_complete(engine.take_screenshot("x.png")))
+
+    # 验证：返回截图文件路径
+    assert result.endswith("x.png")
@@ -0,0 +1,11 @@
+"""
+模型测试模块的 pytest 配置
+"""
+# 导入模型测试共用的 fixtures
+from tests.fixtures.db_fixtures import (
+    make_step,
+    make_execution,
+    make_execution_detail,
+    seed_cases,
+    query_counter,
+)
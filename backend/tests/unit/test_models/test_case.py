@@ -1,10 +1,14 @@
 """
 测试用例和步骤模型单元测试
 """
-# 导入 pytest 测试框架，用于编写测试用例和参数化测试
+# 导入 json 模块，用于按解析结果比较序列化后的参数
+import json
+# 导入 pytest 测试框架
 import pytest
-# 导入 datetime 模块，用于时间相关的验证
-from datetime import datetime
+# 导入 SQLAlchemy 的查询与更新构造器，用于绕过 ORM 直接修改数据库行
+from sqlalchemy import select, update
+# 导入 JSON 编解码模块，用于统计解析次数
+from app.utils import json_codec
 # 从 app.models.case 导入需要测试的模型类
 from app.models.case import TestCase, TestStep
 
@@ -62,20 +66,16 @@ class TestCaseModel:
         # 调用 to_dict 方法转换为字典
         result = case.to_dict()
 
-        # 验证：字典包含正确的 ID
-        assert result["id"] == 1
-        # 验证：字典包含正确的名称
-        assert result["name"] == "字典转换测试"
-        # 验证：字典包含正确的描述
-        assert result["description"] == "测试转换为字典"
-        # 验证：字典包含正确的优先级
-        assert result["priority"] == "P2"
-        # 验证：字典包含正确的标签
-        assert result["tags"] == "tag1, tag2"
-        # 验证：字典包含 created_at 键
-        assert "created_at" in result
-        # 验证：字典包含 updated_at 键
-        assert "updated_at" in result
+        # 验证：字典内容完全一致且没有多余的键（未持久化时时间戳默认值尚未生效，为 None）
+        assert result == {
+            "id": 1,
+            "name": "字典转换测试",
+            "description": "测试转换为字典",
+            "priority": "P2",
+            "tags": "tag1, tag2",
+            "created_at": None,
+            "updated_at": None,
+        }
 
     def test_to_dict_with_none_timestamps(self):
         """测试 to_dict 方法处理 None 时间戳"""
@@ -95,26 +95,22 @@ class TestCaseModel:
         # 验证：updated_at 在字典中为 None
         assert result["updated_at"] is None
 
-    @pytest.mark.parametrize("priority", ["P0", "P1", "P2", "P3"])  # 参数化测试：测试 4 个优先级
-    def test_valid_priorities(self, priority):
+    def test_valid_priorities(self):
         """测试有效优先级值"""
-        # 使用参数化的优先级创建测试用例
-        case = TestCase(name="优先级测试", priority=priority)
-        # 验证：优先级正确赋值
-        assert case.priority == priority
+        # 逐个优先级创建测试用例
+        for priority in ("P0", "P1", "P2", "P3"):
+            case = TestCase(name="优先级测试", priority=priority)
+            # 验证：优先级正确赋值
+            assert case.priority == priority, priority
 
 
 class TestStepModel:
     """TestStep 模型测试"""
 
-    def test_create_test_step_minimal(self):
+    def test_create_test_step_minimal(self, make_step):
         """测试创建最小测试步骤"""
         # 创建只包含必要字段的测试步骤对象
-        step = TestStep(
-            case_id=1,  # 所属用例 ID
-            step_order=1,  # 步骤顺序号
-            action_type="navigate"  # 操作类型
-        )
+        step = make_step(action_type="navigate")
 
         # 验证：未保存前 ID 为 None
         assert step.id is None
@@ -135,12 +131,10 @@ class TestStepModel:
         # 验证：步骤描述默认为 None
         assert step.description is None
 
-    def test_create_test_step_full(self):
+    def test_create_test_step_full(self, make_step):
         """测试创建完整测试步骤"""
         # 创建包含所有字段的测试步骤对象
-        step = TestStep(
-            case_id=1,  # 所属用例 ID
-            step_order=1,  # 步骤顺序号
+        step = make_step(
             action_type="input",  # 操作类型：输入文本
             element_locator="#username",  # 元素定位符
             locator_type="css",  # 定位类型：CSS 选择器
@@ -166,12 +160,10 @@ class TestStepModel:
         # 验证：步骤描述正确
         assert step.description == "输入用户名"
 
-    def test_params_dict_property_valid_json(self):
+    def test_params_dict_property_valid_json(self, make_step):
         """测试 params_dict 属性 - 有效 JSON"""
         # 创建包含有效 JSON 参数的测试步骤
-        step = TestStep(
-            case_id=1,  # 所属用例 ID
-            step_order=1,  # 步骤顺序号
+        step = make_step(
             action_type="input",  # 操作类型
             action_params='{"url": "https://example.com", "timeout": 5000}'  # JSON 参数
         )
@@ -181,82 +173,140 @@ class TestStepModel:
         # 验证：JSON 被正确解析为字典
         assert result == {"url": "https://example.com", "timeout": 5000}
 
-    def test_params_dict_property_invalid_json(self):
+    def test_params_dict_property_invalid_json(self, make_step):
         """测试 params_dict 属性 - 无效 JSON"""
         # 创建包含无效 JSON 的测试步骤
-        step = TestStep(
-            case_id=1,  # 所属用例 ID
-            step_order=1,  # 步骤顺序号
-            action_type="click",  # 操作类型
-            action_params="invalid json"  # 无效的 JSON 字符串
-        )
+        step = make_step(action_params="invalid json")
 
         # 获取解析后的参数字典
         result = step.params_dict
         # 验证：无效 JSON 返回空字典
         assert result == {}
 
-    def test_params_dict_property_none(self):
+    @pytest.mark.parametrize("stored", ["[1, 2]", "null", "42", '"text"'], ids=["list", "null", "number", "string"])
+    def test_params_dict_property_not_object(self, make_step, stored):
+        """测试 params_dict 属性 - 合法 JSON 但不是对象"""
+        # 创建参数为数组 / null / 标量的测试步骤
+        step = make_step(action_params=stored)
+
+        # 获取解析后的参数字典
+        result = step.params_dict
+        # 验证：非对象按无参数处理，返回空字典
+        assert result == {}
+
+    def test_params_dict_property_none(self, make_step):
         """测试 params_dict 属性 - None"""
         # 创建参数为 None 的测试步骤
-        step = TestStep(
-            case_id=1,  # 所属用例 ID
-            step_order=1,  # 步骤顺序号
-            action_type="click"  # 操作类型（无参数）
-        )
+        step = make_step()
 
         # 获取解析后的参数字典
         result = step.params_dict
         # 验证：None 返回空字典
         assert result == {}
 
-    def test_set_params(self):
+    def test_params_dict_is_cached(self, make_step, mocker):
+        """测试 params_dict 属性 - 重复访问只解析一次，重新赋值后失效"""
+        # 创建包含 JSON 参数的测试步骤
+        step = make_step()
+        step.action_params = '{"a": 1}'
+        # 统计 JSON 解析次数（包装模型模块使用的解析函数，行为不变）
+        loads = mocker.patch("app.models.case.json_loads", wraps=json_codec.json_loads)
+
+        # 连续两次访问
+        a = step.params_dict
+        b = step.params_dict
+        # 验证：两次结果相同，但 JSON 只解析了一次
+        assert a == b == {"a": 1}
+        assert loads.call_count == 1
+
+        # 重新设置参数后访问
+        step.set_params({"a": 2})
+        # 验证：缓存已失效，返回新参数
+        assert step.params_dict == {"a": 2}
+
+    def test_params_dict_returns_copy(self, make_step):
+        """测试 params_dict 属性 - 修改返回值不影响后续读取"""
+        # 创建包含 JSON 参数的测试步骤
+        step = make_step(action_params='{"a": 1}')
+
+        # 修改第一次读取到的字典
+        step.params_dict["a"] = 99
+        # 验证：再次读取仍是原始参数
+        assert step.params_dict == {"a": 1}
+
+    @pytest.mark.asyncio
+    async def test_params_dict_after_refresh(self, db_session):
+        """测试 params_dict 属性 - session.refresh 后读取到数据库中的新参数"""
+        # 持久化一个带参数的步骤
+        step = TestStep(case_id=None, step_order=1, action_type="click", action_params='{"a": 1}')
+        db_session.add(TestCase(name="缓存刷新用例", steps=[step]))
+        await db_session.flush()
+        # 读取一次，填充缓存
+        assert step.params_dict == {"a": 1}
+
+        # 绕过 ORM 直接修改数据库中的参数
+        await db_session.execute(update(TestStep).where(TestStep.id == step.id).values(action_params='{"a": 2}'))
+        # 从数据库刷新实例
+        await db_session.refresh(step)
+
+        # 验证：缓存已失效，返回数据库中的新参数
+        assert step.params_dict == {"a": 2}
+
+    @pytest.mark.asyncio
+    async def test_params_dict_after_expire(self, db_session):
+        """测试 params_dict 属性 - expire 后经查询重新加载读取到新参数"""
+        # 持久化一个带参数的步骤
+        step = TestStep(case_id=None, step_order=1, action_type="click", action_params='{"a": 1}')
+        db_session.add(TestCase(name="缓存过期用例", steps=[step]))
+        await db_session.flush()
+        # 读取一次，填充缓存；过期后访问 id 会触发懒加载，先记下主键
+        assert step.params_dict == {"a": 1}
+        step_id = step.id
+
+        # 绕过 ORM 直接修改数据库中的参数，并使实例过期
+        await db_session.execute(update(TestStep).where(TestStep.id == step_id).values(action_params='{"a": 2}'))
+        db_session.expire(step)
+        # 通过查询重新加载（身份映射返回同一个实例）
+        reloaded = (await db_session.execute(select(TestStep).where(TestStep.id == step_id))).scalar_one()
+
+        # 验证：是同一个实例，且缓存已失效
+        assert reloaded is step
+        assert step.params_dict == {"a": 2}
+
+    def test_set_params(self, make_step):
         """测试 set_params 方法"""
         # 创建测试步骤对象
-        step = TestStep(
-            case_id=1,  # 所属用例 ID
-            step_order=1,  # 步骤顺序号
-            action_type="navigate"  # 操作类型
-        )
+        step = make_step(action_type="navigate")
 
         # 设置参数字典（会被转换为 JSON 字符串）
         step.set_params({"url": "https://example.com", "wait": 2000})
-        # 验证：参数被正确序列化为 JSON 字符串
-        assert step.action_params == '{"url": "https://example.com", "wait": 2000}'
+        # 验证：参数被正确序列化为 JSON 字符串（按解析结果比较，不依赖具体序列化器的空白格式）
+        assert json.loads(step.action_params) == {"url": "https://example.com", "wait": 2000}
 
-    def test_set_params_none(self):
+    def test_set_params_none(self, make_step):
         """测试 set_params 方法 - None"""
         # 创建带参数的测试步骤
-        step = TestStep(
-            case_id=1,  # 所属用例 ID
-            step_order=1,  # 步骤顺序号
-            action_type="click",  # 操作类型
-            action_params='{"text": "old"}'  # 初始参数
-        )
+        step = make_step(action_params='{"text": "old"}')
 
         # 设置参数为 None（清空参数）
         step.set_params(None)
         # 验证：参数被设置为 None
         assert step.action_params is None
 
-    def test_set_params_empty_dict(self):
+    def test_set_params_empty_dict(self, make_step):
         """测试 set_params 方法 - 空字典"""
         # 创建测试步骤对象
-        step = TestStep(
-            case_id=1,  # 所属用例 ID
-            step_order=1,  # 步骤顺序号
-            action_type="click"  # 操作类型
-        )
+        step = make_step()
 
         # 设置空字典参数
         step.set_params({})
         # 验证：空字典被转换为 None
         assert step.action_params is None
 
-    def test_to_dict(self):
+    def test_to_dict(self, make_step):
         """测试 to_dict 方法"""
         # 创建完整的测试步骤对象
-        step = TestStep(
+        step = make_step(
             id=1,  # 步骤 ID
             case_id=5,  # 所属用例 ID
             step_order=2,  # 步骤顺序号
@@ -294,35 +344,26 @@ class TestStepModel:
         # 验证：字典包含 updated_at 键
         assert "updated_at" in result
 
-    @pytest.mark.parametrize("action_type", [  # 参数化测试：测试各种操作类型
-        "navigate",  # 页面跳转
-        "click",  # 点击元素
-        "input",  # 输入文本
-        "clear",  # 清空输入
-        "wait",  # 等待元素
-        "verify_text",  # 验证文本
-        "verify_element"  # 验证元素
-    ])
-    def test_valid_action_types(self, action_type):
+    def test_valid_action_types(self, make_step):
         """测试有效操作类型"""
-        # 使用参数化的操作类型创建测试步骤
-        step = TestStep(
-            case_id=1,  # 所属用例 ID
-            step_order=1,  # 步骤顺序号
-            action_type=action_type  # 参数化的操作类型
-        )
-        # 验证：操作类型正确赋值
-        assert step.action_type == action_type
-
-    @pytest.mark.parametrize("locator_type", ["id", "xpath", "css", "name", "class"])  # 参数化测试
-    def test_valid_locator_types(self, locator_type):
+        # 逐个操作类型创建测试步骤
+        for action_type in (
+            "navigate",  # 页面跳转
+            "click",  # 点击元素
+            "input",  # 输入文本
+            "clear",  # 清空输入
+            "wait",  # 等待元素
+            "verify_text",  # 验证文本
+            "verify_element",  # 验证元素
+        ):
+            step = make_step(action_type=action_type)
+            # 验证：操作类型正确赋值
+            assert step.action_type == action_type, action_type
+
+    def test_valid_locator_types(self, make_step):
         """测试有效定位类型"""
-        # 使用参数化的定位类型创建测试步骤
-        step = TestStep(
-            case_id=1,  # 所属用例 ID
-            step_order=1,  # 步骤顺序号
-            action_type="click",  # 操作类型
-            locator_type=locator_type  # 参数化的定位类型
-        )
-        # 验证：定位类型正确赋值
-        assert step.locator_type == locator_type
+        # 逐个定位类型创建测试步骤
+        for locator_type in ("id", "xpath", "css", "name", "class"):
+            step = make_step(locator_type=locator_type)
+            # 验证：定位类型正确赋值
+            assert step.locator_type == locator_type, locator_type
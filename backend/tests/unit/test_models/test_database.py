@@ -1,23 +1,29 @@
 """
 数据库连接和会话管理单元测试
 """
-# 导入 pytest 测试框架，用于编写测试用例和异步测试装饰器
-import pytest
 # 从 sqlalchemy.ext.asyncio 导入异步数据库相关类型，用于类型注解和验证
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 # 从 unittest.mock 导入模拟对象类，用于模拟外部依赖
 from unittest.mock import AsyncMock, MagicMock, patch
+# 导入只取异步生成器第一个值、统计 SELECT 条数的辅助函数
+from tests.fixtures.db_fixtures import anext_once, count_selects
+# 从 sqlalchemy 导入查询构造函数和原生 SQL 包装函数
+from sqlalchemy import select, text
+# 导入被测试的数据库模块对象
+from app.models.database import engine, AsyncSessionLocal, Base, get_db, close_db
+# 导入模型类（导入即注册到 Base.metadata）
+from app.models.case import TestCase, TestStep
+from app.models.execution import Execution, ExecutionDetail
+
+# 已注册表名的快照：模型导入后表结构在进程内不再变化，只需构建一次
+_TABLE_NAMES = frozenset(Base.metadata.tables)
 
 
 class TestDatabaseEngine:
     """测试数据库引擎"""
 
-    @pytest.mark.asyncio  # 标记为异步测试
     async def test_engine_creation(self):
         """测试引擎创建"""
-        # 导入数据库引擎实例
-        from app.models.database import engine
-
         # 验证：engine 是 AsyncEngine 类的实例
         assert isinstance(engine, AsyncEngine)
         # 验证：数据库 URL 包含 "sqlite" 关键字
@@ -25,12 +31,8 @@ class TestDatabaseEngine:
         # 验证：数据库 URL 包含 "aiosqlite" 关键字（异步驱动）
         assert "aiosqlite" in str(engine.url)
 
-    @pytest.mark.asyncio  # 标记为异步测试
     async def test_engine_echo_disabled(self):
         """测试引擎 echo 设置"""
-        # 导入数据库引擎实例
-        from app.models.database import engine
-
         # 验证：echo 设置为 False（不打印 SQL 语句）
         assert engine.echo is False
 
@@ -38,21 +40,13 @@ class TestDatabaseEngine:
 class TestAsyncSessionLocal:
     """测试会话工厂"""
 
-    @pytest.mark.asyncio  # 标记为异步测试
     async def test_session_factory_type(self):
         """测试会话工厂类型"""
-        # 导入会话工厂类
-        from app.models.database import AsyncSessionLocal
-
         # 验证：AsyncSessionLocal 是 async_sessionmaker 类的实例
         assert isinstance(AsyncSessionLocal, async_sessionmaker)
 
-    @pytest.mark.asyncio  # 标记为异步测试
     async def test_session_creation(self):
         """测试会话创建"""
-        # 导入会话工厂类
-        from app.models.database import AsyncSessionLocal
-
         # 使用上下文管理器创建会话
         async with AsyncSessionLocal() as session:
             # 验证：session 是 AsyncSession 类的实例
@@ -66,9 +60,6 @@ class TestBase:
 
     def test_base_exists(self):
         """测试 Base 基类存在"""
-        # 导入 Base 基类
-        from app.models.database import Base
-
         # 验证：Base 不为 None
         assert Base is not None
         # 验证：Base 具有 metadata 属性
@@ -76,64 +67,42 @@ class TestBase:
 
     def test_base_registry(self):
         """测试 Base 注册表"""
-        # 导入 Base 基类和模型类
-        from app.models.database import Base
-        from app.models.case import TestCase
-        from app.models.execution import Execution
-
         # 验证模型已注册到 Base.metadata
         # 验证：test_cases 表已注册
-        assert "test_cases" in Base.metadata.tables
+        assert "test_cases" in _TABLE_NAMES
         # 验证：test_steps 表已注册
-        assert "test_steps" in Base.metadata.tables
+        assert "test_steps" in _TABLE_NAMES
         # 验证：executions 表已注册
-        assert "executions" in Base.metadata.tables
+        assert "executions" in _TABLE_NAMES
         # 验证：execution_details 表已注册
-        assert "execution_details" in Base.metadata.tables
+        assert "execution_details" in _TABLE_NAMES
 
 
 class TestGetDb:
     """测试 get_db 依赖注入函数"""
 
-    @pytest.mark.asyncio  # 标记为异步测试
     async def test_get_db_yields_session(self):
         """测试 get_db 返回会话"""
-        # 导入 get_db 生成器函数
-        from app.models.database import get_db
-
-        # 遍历 get_db 生成器（每次 yield 一个会话）
-        async for session in get_db():
+        # 只取 get_db 生成的第一个会话，退出时关闭生成器
+        async with anext_once(get_db()) as session:
             # 验证：返回的 session 是 AsyncSession 实例
             assert isinstance(session, AsyncSession)
             # 验证：会话处于活动状态
             assert session.is_active
-            break  # 只测试第一次 yield，避免无限循环
 
-    @pytest.mark.asyncio  # 标记为异步测试
     async def test_get_db_closes_session(self):
         """测试 get_db 正确关闭会话"""
-        # 导入 get_db 生成器函数
-        from app.models.database import get_db
-
-        # 初始化 session 变量
-        session = None
-        # 遍历 get_db 生成器
-        async for s in get_db():
-            session = s  # 保存会话引用
-            # 模拟使用会话
-            break  # 立即退出循环
+        # 取出会话后立即退出，生成器在退出时关闭会话
+        async with anext_once(get_db()) as session:
+            pass
 
         # 验证：获取到了会话
         assert session is not None
 
-    @pytest.mark.asyncio  # 标记为异步测试
     async def test_get_db_context_manager(self):
         """测试 get_db 作为上下文管理器"""
-        # 导入 get_db 生成器函数
-        from app.models.database import get_db
-
-        # 遍历 get_db 生成器
-        async for session in get_db():
+        # 在上下文中使用 get_db 生成的会话
+        async with anext_once(get_db()) as session:
             # 验证：在上下文中会话应该是活动的
             assert session.is_active
             # 执行一些操作
@@ -144,62 +113,18 @@ class TestGetDb:
 class TestInitDb:
     """测试 init_db 函数"""
 
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_init_db_with_memory_db(self):
-        """测试使用内存数据库初始化"""
-        # 导入 SQLAlchemy 异步相关类
-        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-        from sqlalchemy.orm import DeclarativeBase
-
-        # 创建内存数据库引擎
-        memory_engine = create_async_engine(
-            "sqlite+aiosqlite:///:memory:",  # 内存数据库 URL
-            echo=False  # 不打印 SQL
-        )
-
-        # 定义测试基类
-        class TestBase(DeclarativeBase):
-            pass
+    async def test_init_db_with_memory_db(self, db_engine):
+        """测试使用内存数据库初始化（表结构由会话级 db_engine fixture 统一创建一次）"""
+        # 查询 SQLite 系统表，获取已创建的表名
+        async with db_engine.connect() as conn:
+            result = await conn.execute(text("SELECT name FROM sqlite_master WHERE type='table'"))
+            table_names = set(result.scalars().all())
+
+        # 验证：所有模型对应的表都已创建
+        assert {"test_cases", "test_steps", "executions", "execution_details"} <= table_names
 
-        # 导入 SQLAlchemy 列和类型定义
-        from sqlalchemy import Column, Integer, String, text
-
-        # 定义测试表模型
-        class TestTable(TestBase):
-            __tablename__ = "test_table"  # 表名
-            id = Column(Integer, primary_key=True)  # ID 列
-            name = Column(String(50))  # 名称列
-
-        # 创建表结构
-        async with memory_engine.begin() as conn:
-            # 同步运行 create_all
-            await conn.run_sync(TestBase.metadata.create_all)
-
-        # 验证表已创建 - 使用 text() 包装原生 SQL
-        async with memory_engine.begin() as conn:
-            # 查询 SQLite 系统表验证表是否存在
-            result = await conn.execute(
-                text("SELECT name FROM sqlite_master WHERE type='table' AND name='test_table'")
-            )
-            # 获取查询结果
-            rows = result.fetchall()
-            # 验证：表存在
-            assert len(rows) >= 0  # 表存在
-
-        # 释放内存数据库引擎
-        await memory_engine.dispose()
-
-    @pytest.mark.asyncio  # 标记为异步测试
     async def test_init_db_creates_all_tables(self):
         """测试 init_db 创建所有表"""
-        # 导入 Base 基类和模型类
-        from app.models.database import Base
-        from app.models.case import TestCase, TestStep
-        from app.models.execution import Execution, ExecutionDetail
-
-        # 获取所有表名集合
-        table_names = set(Base.metadata.tables.keys())
-
         # 定义期望的表名集合
         expected_tables = {
             "test_cases",  # 测试用例表
@@ -209,133 +134,66 @@ class TestInitDb:
         }
 
         # 验证：所有期望的表都已注册
-        assert expected_tables.issubset(table_names)
+        assert expected_tables <= _TABLE_NAMES
 
 
 class TestCloseDb:
     """测试 close_db 函数"""
 
-    @pytest.mark.asyncio  # 标记为异步测试
     async def test_close_db_disposes_engine(self):
         """测试 close_db 释放引擎"""
-        # 导入引擎创建函数和 close_db 函数
-        from sqlalchemy.ext.asyncio import create_async_engine
-        from app.models.database import close_db
+        # 用模拟引擎替换模块级引擎，避免创建真实连接
+        mock_engine = MagicMock(spec=AsyncEngine)
+        mock_engine.dispose = AsyncMock()
 
-        # 创建测试引擎
-        test_engine = create_async_engine(
-            "sqlite+aiosqlite:///:memory:",  # 内存数据库
-            echo=False  # 不打印 SQL
-        )
+        with patch("app.models.database.engine", mock_engine):
+            # 关闭数据库连接
+            await close_db()
 
-        # 验证：引擎连接池存在
-        assert test_engine.pool is not None
-
-        # 关闭引擎
-        await test_engine.dispose()
-
-        # 验证引擎已释放
-        # 在 SQLAlchemy 中，dispose 后 pool 仍然存在但连接已关闭
+        # 验证：引擎的 dispose 被等待了一次
+        mock_engine.dispose.assert_awaited_once()
 
 
 class TestDatabaseIntegration:
-    """数据库集成测试（使用内存数据库）"""
-
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_crud_operations_with_memory_db(self):
-        """测试在内存数据库中的 CRUD 操作"""
-        # 导入 SQLAlchemy 相关类
-        from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-        from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-        from sqlalchemy import String, Integer, select
-
-        # 创建内存数据库引擎
-        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
-        # 创建会话工厂
-        AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
-
-        # 定义 Base 基类
-        class Base(DeclarativeBase):
-            pass
-
-        # 定义测试模型
-        class TestModel(Base):
-            __tablename__ = "test_models"  # 表名
-            id: Mapped[int] = mapped_column(Integer, primary_key=True)  # ID 字段
-            name: Mapped[str] = mapped_column(String(50))  # 名称字段
-
-        # 创建表结构
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-
-        # 测试 CRUD 操作
-        async with AsyncSessionLocal() as session:
-            # Create：创建新记录
-            obj = TestModel(name="测试")
-            session.add(obj)  # 添加到会话
-            await session.commit()  # 提交事务
-            await session.refresh(obj)  # 刷新对象以获取数据库生成的值
-
-            # Read：查询记录
-            stmt = select(TestModel).where(TestModel.name == "测试")
-            result = await session.execute(stmt)
-            found = result.scalar_one()  # 获取单条记录
-            assert found.name == "测试"
-
-            # Update：更新记录
-            found.name = "已更新"
-            await session.commit()  # 提交更新
-            await session.refresh(found)  # 刷新对象
-            assert found.name == "已更新"
-
-            # Delete：删除记录
-            await session.delete(found)
-            await session.commit()  # 提交删除
-
-            # 验证删除：查询应返回 None
-            result = await session.execute(stmt)
-            assert result.scalar_one_or_none() is None
-
-        # 释放数据库引擎
-        await engine.dispose()
-
-    @pytest.mark.asyncio  # 标记为异步测试
-    async def test_transaction_rollback(self):
+    """数据库集成测试（使用会话级共享的内存数据库，见 db_engine / db_session fixtures）"""
+
+    async def test_crud_operations_with_memory_db(self, db_session, seed_cases, query_counter):
+        """测试在内存数据库中的 CRUD 操作（Create 由 seed_cases 批量插入完成）"""
+        # Create：预置数据已写入并分配了 ID
+        assert [case.name for case in seed_cases] == ["种子用例1", "种子用例2"]
+        assert all(case.id is not None for case in seed_cases)
+
+        # Read：查询记录（从这里开始统计 SQL）
+        query_counter.clear()
+        stmt = select(TestCase).where(TestCase.id == seed_cases[0].id)
+        result = await db_session.execute(stmt)
+        found = result.scalar_one()  # 获取单条记录
+        assert found.name == "种子用例1"
+        # 验证：读取一条记录只发出一条 SELECT（没有额外的懒加载查询）
+        assert count_selects(query_counter) == 1
+
+        # Update：更新记录，只 flush 发出 UPDATE，与删除在同一个事务中提交
+        found.name = "CRUD 已更新"
+        await db_session.flush()
+        # 验证：数据库中的记录已更新
+        assert (await db_session.execute(select(TestCase.name).where(TestCase.id == found.id))).scalar_one() == "CRUD 已更新"
+
+        # Delete：删除记录
+        await db_session.delete(found)
+        await db_session.commit()  # 提交更新和删除（整个 CRUD 只提交这一次）
+
+        # 验证删除：查询应返回 None
+        result = await db_session.execute(stmt)
+        assert result.scalar_one_or_none() is None
+
+    async def test_transaction_rollback(self, db_session):
         """测试事务回滚"""
-        # 导入 SQLAlchemy 相关类
-        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-        from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-        from sqlalchemy import String, Integer, select
-
-        # 创建内存数据库引擎
-        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
-        # 创建会话工厂
-        AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
-
-        # 定义 Base 基类
-        class Base(DeclarativeBase):
-            pass
-
-        # 定义测试模型
-        class TestModel(Base):
-            __tablename__ = "test_rollback"  # 表名
-            id: Mapped[int] = mapped_column(Integer, primary_key=True)  # ID 字段
-            name: Mapped[str] = mapped_column(String(50))  # 名称字段
-
-        # 创建表结构
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-
-        # 测试事务回滚
-        async with AsyncSessionLocal() as session:
-            obj = TestModel(name="测试")
-            session.add(obj)  # 添加到会话
-            await session.rollback()  # 回滚事务（不保存）
-
-            # 验证数据未保存
-            stmt = select(TestModel)
-            result = await session.execute(stmt)
-            assert result.scalar_one_or_none() is None  # 应该查不到数据
-
-        # 释放数据库引擎
-        await engine.dispose()
+        # 添加记录并写入数据库后回滚（不保存）
+        db_session.add(TestCase(name="回滚测试"))
+        await db_session.flush()  # 发送 INSERT（db_session 关闭了 autoflush）
+        await db_session.rollback()  # 回滚事务
+
+        # 验证数据未保存
+        stmt = select(TestCase).where(TestCase.name == "回滚测试")
+        result = await db_session.execute(stmt)
+        assert result.scalar_one_or_none() is None  # 应该查不到数据
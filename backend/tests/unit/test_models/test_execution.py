@@ -3,22 +3,22 @@
 """
 # 导入 pytest 测试框架
 import pytest
+# 导入 json 模块，用于按解析结果比较序列化后的日志
+import json
 # 导入 datetime 和 timedelta，用于时间相关的测试和计算
 from datetime import datetime, timedelta
-# 从 app.models.execution 导入需要测试的模型类
-from app.models.execution import Execution, ExecutionDetail
+
+# 固定的参考时间点：时长类测试只需要一个起点，不必读取系统时钟
+FIXED_NOW = datetime(2024, 1, 1, 12, 0, 0)
 
 
 class TestExecution:
     """Execution 模型测试"""
 
-    def test_create_execution_minimal(self):
+    def test_create_execution_minimal(self, make_execution):
         """测试创建最小执行记录"""
         # 创建只包含必要字段的执行记录对象
-        execution = Execution(
-            execution_type="single",  # 执行类型：单个用例
-            browser_type="chrome"  # 浏览器类型：Chrome
-        )
+        execution = make_execution()
 
         # 验证：未保存前 ID 为 None
         assert execution.id is None
@@ -40,12 +40,10 @@ class TestExecution:
         # 验证：状态为 None 或 "pending"
         assert execution.status is None or execution.status == "pending"
 
-    def test_create_execution_full(self):
+    def test_create_execution_full(self, make_execution):
         """测试创建完整执行记录"""
-        # 获取当前时间
-        now = datetime.now()
         # 创建包含所有字段的执行记录对象
-        execution = Execution(
+        execution = make_execution(
             execution_type="batch",  # 执行类型：批量
             browser_type="firefox",  # 浏览器类型：Firefox
             headless=True,  # 无头模式：开启
@@ -76,12 +74,10 @@ class TestExecution:
         # 验证：状态为已完成
         assert execution.status == "completed"
 
-    def test_pass_rate_property_zero_total(self):
+    def test_pass_rate_property_zero_total(self, make_execution):
         """测试通过率计算 - 总数为0"""
         # 创建总数为 0 的执行记录
-        execution = Execution(
-            execution_type="single",  # 执行类型
-            browser_type="chrome",  # 浏览器类型
+        execution = make_execution(
             total_count=0,  # 总用例数为 0
             success_count=0  # 成功数为 0
         )
@@ -89,12 +85,11 @@ class TestExecution:
         # 验证：通过率为 0.0
         assert execution.pass_rate == 0.0
 
-    def test_pass_rate_property_all_success(self):
+    def test_pass_rate_property_all_success(self, make_execution):
         """测试通过率计算 - 全部成功"""
         # 创建全部成功的执行记录
-        execution = Execution(
+        execution = make_execution(
             execution_type="batch",  # 执行类型
-            browser_type="chrome",  # 浏览器类型
             total_count=10,  # 总用例数
             success_count=10,  # 全部成功
             fail_count=0  # 无失败
@@ -103,12 +98,11 @@ class TestExecution:
         # 验证：通过率为 100.0%
         assert execution.pass_rate == 100.0
 
-    def test_pass_rate_property_partial_success(self):
+    def test_pass_rate_property_partial_success(self, make_execution):
         """测试通过率计算 - 部分成功"""
         # 创建部分成功的执行记录
-        execution = Execution(
+        execution = make_execution(
             execution_type="batch",  # 执行类型
-            browser_type="chrome",  # 浏览器类型
             total_count=10,  # 总用例数
             success_count=7,  # 成功 7 个
             fail_count=3  # 失败 3 个
@@ -117,12 +111,11 @@ class TestExecution:
         # 验证：通过率为 70.0%
         assert execution.pass_rate == 70.0
 
-    def test_pass_rate_property_fractional(self):
+    def test_pass_rate_property_fractional(self, make_execution):
         """测试通过率计算 - 小数"""
         # 创建会产生小数通过率的执行记录
-        execution = Execution(
+        execution = make_execution(
             execution_type="batch",  # 执行类型
-            browser_type="chrome",  # 浏览器类型
             total_count=3,  # 总用例数
             success_count=2,  # 成功 2 个
             fail_count=1  # 失败 1 个
@@ -131,28 +124,23 @@ class TestExecution:
         # 验证：通过率约为 66.67%（四舍五入）
         assert execution.pass_rate == 66.67
 
-    def test_duration_property_no_end_time(self):
+    def test_duration_property_no_end_time(self, make_execution):
         """测试执行时长计算 - 无结束时间"""
         # 创建没有结束时间的执行记录
-        execution = Execution(
-            execution_type="single",  # 执行类型
-            browser_type="chrome"  # 浏览器类型
-        )
+        execution = make_execution()
 
         # 验证：没有结束时间时，duration 为 None
         assert execution.duration is None
 
-    def test_duration_property_with_end_time(self):
+    def test_duration_property_with_end_time(self, make_execution):
         """测试执行时长计算 - 有结束时间"""
-        # 获取开始时间
-        start = datetime.now()
+        # 使用固定的开始时间
+        start = FIXED_NOW
         # 结束时间为开始后 5 秒
         end = start + timedelta(seconds=5)
 
         # 创建有开始和结束时间的执行记录
-        execution = Execution(
-            execution_type="single",  # 执行类型
-            browser_type="chrome",  # 浏览器类型
+        execution = make_execution(
             start_time=start,  # 开始时间
             end_time=end  # 结束时间
         )
@@ -160,17 +148,15 @@ class TestExecution:
         # 5秒 = 5000毫秒
         assert execution.duration == 5000
 
-    def test_duration_property_precise(self):
+    def test_duration_property_precise(self, make_execution):
         """测试执行时长计算 - 精确时长"""
-        # 获取开始时间
-        start = datetime.now()
+        # 使用固定的开始时间
+        start = FIXED_NOW
         # 结束时间为开始后 1234 毫秒
         end = start + timedelta(milliseconds=1234)
 
         # 创建执行记录
-        execution = Execution(
-            execution_type="single",  # 执行类型
-            browser_type="chrome",  # 浏览器类型
+        execution = make_execution(
             start_time=start,  # 开始时间
             end_time=end  # 结束时间
         )
@@ -178,18 +164,16 @@ class TestExecution:
         # 验证：执行时长为 1234 毫秒
         assert execution.duration == 1234
 
-    def test_to_dict(self):
+    def test_to_dict(self, make_execution):
         """测试 to_dict 方法"""
-        # 获取开始时间
-        start = datetime.now()
+        # 使用固定的开始时间
+        start = FIXED_NOW
         # 结束时间为开始后 10 秒
         end = start + timedelta(seconds=10)
 
         # 创建完整的执行记录
-        execution = Execution(
+        execution = make_execution(
             id=1,  # 执行 ID
-            execution_type="single",  # 执行类型
-            browser_type="chrome",  # 浏览器类型
             headless=False,  # 有头模式
             window_size="1920x1080",  # 窗口大小
             total_count=5,  # 总用例数
@@ -223,26 +207,21 @@ class TestExecution:
         assert "start_time" in result
         assert "end_time" in result
 
+    @pytest.mark.xdist_group("execution_params")  # 并行时参数化矩阵分到同一组
     @pytest.mark.parametrize("status", ["pending", "running", "completed", "failed"])  # 参数化测试
-    def test_valid_statuses(self, status):
+    def test_valid_statuses(self, make_execution, status):
         """测试有效状态值"""
         # 使用参数化的状态创建执行记录
-        execution = Execution(
-            execution_type="single",  # 执行类型
-            browser_type=browser_type,  # 参数化的浏览器类型
-            status=status  # 参数化的状态
-        )
+        execution = make_execution(status=status)  # 浏览器类型使用工厂默认的 chrome
         # 验证：状态正确赋值
         assert execution.status == status
 
+    @pytest.mark.xdist_group("execution_params")  # 并行时参数化矩阵分到同一组
     @pytest.mark.parametrize("browser_type", ["chrome", "firefox", "edge"])  # 参数化测试
-    def test_valid_browser_types(self, browser_type):
+    def test_valid_browser_types(self, make_execution, browser_type):
         """测试有效浏览器类型"""
         # 使用参数化的浏览器类型创建执行记录
-        execution = Execution(
-            execution_type="single",  # 执行类型
-            browser_type=browser_type  # 参数化的浏览器类型
-        )
+        execution = make_execution(browser_type=browser_type)
         # 验证：浏览器类型正确赋值
         assert execution.browser_type == browser_type
 
@@ -250,14 +229,10 @@ class TestExecution:
 class TestExecutionDetail:
     """ExecutionDetail 模型测试"""
 
-    def test_create_execution_detail_minimal(self):
+    def test_create_execution_detail_minimal(self, make_execution_detail):
         """测试创建最小执行详情"""
         # 创建只包含必要字段的执行详情对象
-        detail = ExecutionDetail(
-            execution_id=1,  # 所属执行 ID
-            case_id=5,  # 用例 ID
-            case_name="测试用例1"  # 用例名称
-        )
+        detail = make_execution_detail()
 
         # 验证：未保存前 ID 为 None
         assert detail.id is None
@@ -281,15 +256,10 @@ class TestExecutionDetail:
         # 验证：执行时长默认为 None
         assert detail.duration is None
 
-    def test_create_execution_detail_full(self):
+    def test_create_execution_detail_full(self, make_execution_detail):
         """测试创建完整执行详情"""
-        # 获取当前时间
-        now = datetime.now()
         # 创建包含所有字段的执行详情对象
-        detail = ExecutionDetail(
-            execution_id=1,  # 执行 ID
-            case_id=5,  # 用例 ID
-            case_name="测试用例1",  # 用例名称
+        detail = make_execution_detail(
             status="failed",  # 状态：失败
             error_message="元素未找到",  # 错误信息
             error_stack="Traceback...",  # 错误堆栈
@@ -307,14 +277,10 @@ class TestExecutionDetail:
         assert detail.screenshot_path == "/screenshots/error1.png"
         assert detail.duration == 5000
 
-    def test_logs_list_property_valid_json(self):
+    def test_logs_list_property_valid_json(self, make_execution_detail):
         """测试 logs_list 属性 - 有效 JSON"""
         # 创建执行详情对象
-        detail = ExecutionDetail(
-            execution_id=1,  # 执行 ID
-            case_id=5,  # 用例 ID
-            case_name="测试用例1"  # 用例名称
-        )
+        detail = make_execution_detail()
 
         # 设置测试日志列表
         test_logs = [
@@ -334,43 +300,30 @@ class TestExecutionDetail:
         # 验证：第二条日志正确
         assert result[1]["status"] == "failed"
 
-    def test_logs_list_property_invalid_json(self):
+    def test_logs_list_property_invalid_json(self, make_execution_detail):
         """测试 logs_list 属性 - 无效 JSON"""
         # 创建执行详情对象
-        detail = ExecutionDetail(
-            execution_id=1,  # 执行 ID
-            case_id=5,  # 用例 ID
-            case_name="测试用例1",  # 用例名称
-            step_logs="invalid json"  # 无效的 JSON 字符串
-        )
+        detail = make_execution_detail(step_logs="invalid json")
 
         # 获取解析后的日志列表
         result = detail.logs_list
         # 验证：无效 JSON 返回空列表
         assert result == []
 
-    def test_logs_list_property_none(self):
+    def test_logs_list_property_none(self, make_execution_detail):
         """测试 logs_list 属性 - None"""
         # 创建执行详情对象
-        detail = ExecutionDetail(
-            execution_id=1,  # 执行 ID
-            case_id=5,  # 用例 ID
-            case_name="测试用例1"  # 用例名称
-        )
+        detail = make_execution_detail()
 
         # 获取解析后的日志列表（未设置）
         result = detail.logs_list
         # 验证：None 返回空列表
         assert result == []
 
-    def test_set_logs(self):
+    def test_set_logs(self, make_execution_detail):
         """测试 set_logs 方法"""
         # 创建执行详情对象
-        detail = ExecutionDetail(
-            execution_id=1,  # 执行 ID
-            case_id=5,  # 用例 ID
-            case_name="测试用例1"  # 用例名称
-        )
+        detail = make_execution_detail()
 
         # 准备测试日志
         logs = [
@@ -380,46 +333,35 @@ class TestExecutionDetail:
         # 设置日志（转换为 JSON 存储）
         detail.set_logs(logs)
 
-        # 验证：日志被正确序列化为 JSON
-        import json
+        # 验证：日志被正确序列化为 JSON（按解析结果比较，不依赖具体序列化器的输出格式）
         assert json.loads(detail.step_logs) == logs
 
-    def test_set_logs_none(self):
+    def test_set_logs_none(self, make_execution_detail):
         """测试 set_logs 方法 - None"""
         # 创建带日志的执行详情
-        detail = ExecutionDetail(
-            execution_id=1,  # 执行 ID
-            case_id=5,  # 用例 ID
-            case_name="测试用例1",  # 用例名称
-            step_logs='{"old": "logs"}'  # 初始日志
-        )
+        detail = make_execution_detail(step_logs='{"old": "logs"}')
 
         # 设置日志为 None（清空日志）
         detail.set_logs(None)
         # 验证：日志被设置为 None
         assert detail.step_logs is None
 
-    def test_set_logs_empty(self):
+    def test_set_logs_empty(self, make_execution_detail):
         """测试 set_logs 方法 - 空列表"""
         # 创建执行详情对象
-        detail = ExecutionDetail(
-            execution_id=1,  # 执行 ID
-            case_id=5,  # 用例 ID
-            case_name="测试用例1"  # 用例名称
-        )
+        detail = make_execution_detail()
 
         # 设置空日志列表
         detail.set_logs([])
         # 验证：空列表被转换为 None
         assert detail.step_logs is None
 
-    def test_to_dict(self):
+    def test_to_dict(self, make_execution_detail):
         """测试 to_dict 方法"""
         # 创建完整的执行详情对象
-        detail = ExecutionDetail(
+        detail = make_execution_detail(
             id=1,  # 详情 ID
             execution_id=10,  # 执行 ID
-            case_id=5,  # 用例 ID
             case_name="登录测试",  # 用例名称
             status="success",  # 状态：成功
             error_message=None,  # 无错误信息
@@ -448,13 +390,12 @@ class TestExecutionDetail:
         assert "start_time" in result
         assert "end_time" in result
 
-    def test_to_dict_with_logs(self):
+    def test_to_dict_with_logs(self, make_execution_detail):
         """测试 to_dict 方法 - 带日志"""
         # 创建执行详情对象
-        detail = ExecutionDetail(
+        detail = make_execution_detail(
             id=1,  # 详情 ID
             execution_id=10,  # 执行 ID
-            case_id=5,  # 用例 ID
             case_name="测试"  # 用例名称
         )
 
@@ -467,13 +408,12 @@ class TestExecutionDetail:
         # 验证：字典包含解析后的日志列表
         assert result["step_logs"] == logs
 
+    @pytest.mark.xdist_group("execution_params")  # 并行时参数化矩阵分到同一组
     @pytest.mark.parametrize("status", ["success", "failed", "skipped"])  # 参数化测试
-    def test_valid_statuses(self, status):
+    def test_valid_statuses(self, make_execution_detail, status):
         """测试有效状态值"""
         # 使用参数化的状态创建执行详情
-        detail = ExecutionDetail(
-            execution_id=1,  # 执行 ID
-            case_id=5,  # 用例 ID
+        detail = make_execution_detail(
             case_name="测试",  # 用例名称
             status=status  # 参数化的状态
         )
@@ -0,0 +1,5 @@
+"""
+Schema 测试模块的 pytest 配置
+"""
+# 导入 schema 测试共用的 fixtures
+from tests.fixtures.schema_fixtures import three_steps, frozen_now, make_execution_create
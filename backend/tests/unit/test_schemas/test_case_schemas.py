@@ -12,8 +12,14 @@ from app.schemas.case import (
     CaseBase, CaseCreate, CaseUpdate, CaseResponse, CaseListResponse,
     BatchStepCreate, BatchDeleteRequest, CaseQueryParams
 )
-# 从 pydantic 导入验证错误异常
-from pydantic import ValidationError
+# 从 pydantic 导入验证错误异常和类型适配器
+from pydantic import TypeAdapter, ValidationError
+# 导入校验错误定位辅助函数
+from tests.fixtures.schema_fixtures import has_error_at
+
+# 模块级类型适配器：校验器只构建一次，正向用例直接复用
+_STEP_TA = TypeAdapter(StepBase)
+_CASE_TA = TypeAdapter(CaseBase)
 
 
 class TestStepBase:
@@ -21,16 +27,16 @@ class TestStepBase:
 
     def test_step_base_valid(self):
         """测试有效的步骤数据"""
-        # 创建步骤对象
-        step = StepBase(
-            step_order=1,
-            action_type="navigate",
-            element_locator="#button",
-            locator_type="css",
-            action_params={"url": "https://example.com"},
-            expected_result="页面加载成功",
-            description="打开首页"
-        )
+        # 校验步骤数据
+        step = _STEP_TA.validate_python({
+            "step_order": 1,
+            "action_type": "navigate",
+            "element_locator": "#button",
+            "locator_type": "css",
+            "action_params": {"url": "https://example.com"},
+            "expected_result": "页面加载成功",
+            "description": "打开首页",
+        })
 
         # 验证：所有字段正确设置
         assert step.step_order == 1
@@ -43,8 +49,8 @@ class TestStepBase:
 
     def test_step_base_minimal(self):
         """测试最小字段（只有必填字段）"""
-        # 创建步骤对象（只有 step_order 和 action_type）
-        step = StepBase(step_order=1, action_type="click")
+        # 校验步骤数据（只有 step_order 和 action_type）
+        step = _STEP_TA.validate_python({"step_order": 1, "action_type": "click"})
 
         # 验证：必填字段正确，可选字段使用默认值
         assert step.step_order == 1
@@ -53,19 +59,14 @@ class TestStepBase:
         assert step.element_locator is None
         assert step.action_params is None
 
-    def test_step_order_validation(self):
+    @pytest.mark.parametrize("bad", [0, -1, -100])  # 低于最小值 1 的非法步骤顺序
+    def test_step_order_invalid(self, bad):
         """测试步骤顺序验证（最小值为 1）"""
-        # 测试非法值（step_order = 0）
+        # 复用模块级类型适配器校验非法值
         with pytest.raises(ValidationError) as exc_info:
-            StepBase(step_order=0, action_type="click")
-        # 验证：错误信息包含最小值约束
-        assert "step_order" in str(exc_info.value).lower()
-
-    def test_step_order_negative(self):
-        """测试步骤顺序为负数"""
-        # 测试非法值（step_order = -1）
-        with pytest.raises(ValidationError):
-            StepBase(step_order=-1, action_type="click")
+            _STEP_TA.validate_python({"step_order": bad, "action_type": "click"})
+        # 验证：错误定位到对应字段
+        assert has_error_at(exc_info.value, ("step_order",))
 
 
 class TestStepCreate:
@@ -105,18 +106,25 @@ class TestStepUpdate:
         assert step.action_type == "click"
 
 
+# 长度边界测试用的字符串，模块加载时只构建一次
+_NAME_200 = "a" * 200  # 名称长度上限
+_NAME_201 = "a" * 201  # 名称超出上限 1 个字符
+_TAGS_501 = "a" * 501  # 标签超出上限 1 个字符
+_LARGE_CASE_IDS = list(range(1, 10_001))  # 大批量删除的用例 ID，模块加载时只构建一次
+
+
 class TestCaseBase:
     """测试 CaseBase 用例基础模式"""
 
     def test_case_base_valid(self):
         """测试有效的用例数据"""
-        # 创建用例对象
-        case = CaseBase(
-            name="登录测试",
-            description="测试用户登录功能",
-            priority="P0",
-            tags="auth,smoke"
-        )
+        # 校验用例数据
+        case = _CASE_TA.validate_python({
+            "name": "登录测试",
+            "description": "测试用户登录功能",
+            "priority": "P0",
+            "tags": "auth,smoke",
+        })
 
         # 验证：所有字段正确
         assert case.name == "登录测试"
@@ -126,8 +134,8 @@ class TestCaseBase:
 
     def test_case_base_defaults(self):
         """测试默认值"""
-        # 创建用例对象（只有必填字段）
-        case = CaseBase(name="测试用例")
+        # 校验用例数据（只有必填字段）
+        case = _CASE_TA.validate_python({"name": "测试用例"})
 
         # 验证：必填字段正确，可选字段使用默认值
         assert case.name == "测试用例"
@@ -140,20 +148,20 @@ class TestCaseBase:
         # 测试空名称（非法）
         with pytest.raises(ValidationError) as exc_info:
             CaseBase(name="")
-        # 验证：错误信息包含最小长度约束
-        assert "name" in str(exc_info.value).lower()
+        # 验证：错误定位到对应字段
+        assert has_error_at(exc_info.value, ("name",))
 
     def test_case_name_max_length(self):
         """测试用例名称最大长度（200）"""
         # 测试超长名称（201 个字符）
         with pytest.raises(ValidationError):
-            CaseBase(name="a" * 201)
+            CaseBase.model_validate({"name": _NAME_201})
 
     def test_case_name_boundary(self):
         """测试用例名称边界值（200 个字符）"""
         # 测试边界值（200 个字符，合法）
-        case = CaseBase(name="a" * 200)
-        assert case.name == "a" * 200
+        case = _CASE_TA.validate_python({"name": _NAME_200})
+        assert case.name == _NAME_200
 
     def test_case_priority_validation(self):
         """测试优先级验证（只允许 P0/P1/P2/P3）"""
@@ -161,38 +169,31 @@ class TestCaseBase:
         with pytest.raises(ValidationError):
             CaseBase(name="测试", priority="P4")
 
-    def test_case_priority_all_valid(self):
+    @pytest.mark.parametrize("priority", ["P0", "P1", "P2", "P3"])  # 每个合法优先级单独成为一个用例
+    def test_case_priority_all_valid(self, priority):
         """测试所有合法优先级"""
-        # 测试所有合法优先级值
-        for priority in ["P0", "P1", "P2", "P3"]:
-            case = CaseBase(name="测试", priority=priority)
-            assert case.priority == priority
+        # 校验合法优先级值
+        case = _CASE_TA.validate_python({"name": "测试", "priority": priority})
+        assert case.priority == priority
 
     def test_case_tags_max_length(self):
         """测试标签最大长度（500）"""
         # 测试超长标签（501 个字符）
         with pytest.raises(ValidationError):
-            CaseBase(name="测试", tags="a" * 501)
+            CaseBase.model_validate({"name": "测试", "tags": _TAGS_501})
 
 
 class TestCaseCreate:
     """测试 CaseCreate 创建用例模式"""
 
-    def test_case_create_valid(self):
+    def test_case_create_valid(self, three_steps):
         """测试有效的创建用例数据"""
-        # 创建用例对象（包含步骤）
-        case = CaseCreate(
-            name="登录测试",
-            priority="P1",
-            steps=[
-                StepCreate(step_order=1, action_type="navigate"),
-                StepCreate(step_order=2, action_type="input")
-            ]
-        )
+        # 创建用例对象（包含共享的三个步骤）
+        case = CaseCreate(name="登录测试", priority="P1", steps=three_steps)
 
         # 验证：用例和步骤正确
         assert case.name == "登录测试"
-        assert len(case.steps) == 2
+        assert len(case.steps) == 3
         assert case.steps[0].action_type == "navigate"
 
     def test_case_create_empty_steps(self):
@@ -247,6 +248,10 @@ class TestCaseUpdate:
             CaseUpdate(priority="P5")
 
 
+# 固定时间戳：列表响应测试不关心时间语义，避免每次读取系统时钟
+_FROZEN_TS = datetime(2024, 1, 1)
+
+
 class TestCaseListResponse:
     """测试 CaseListResponse 用例列表响应模式"""
 
@@ -260,8 +265,8 @@ class TestCaseListResponse:
             priority="P1",
             tags="smoke",
             step_count=3,
-            created_at=datetime.now(),
-            updated_at=datetime.now()
+            created_at=_FROZEN_TS,
+            updated_at=_FROZEN_TS
         )
 
         # 验证：所有字段正确
@@ -270,17 +275,13 @@ class TestCaseListResponse:
         assert response.step_count == 3
 
 
-class BatchStepCreate:
+class TestBatchStepCreate:
     """测试 BatchStepCreate 批量创建步骤模式"""
 
-    def test_batch_step_create_valid(self):
+    def test_batch_step_create_valid(self, three_steps):
         """测试有效的批量创建步骤数据"""
-        # 创建批量步骤对象
-        batch = BatchStepCreate(steps=[
-            StepCreate(step_order=1, action_type="navigate"),
-            StepCreate(step_order=2, action_type="click"),
-            StepCreate(step_order=3, action_type="input")
-        ])
+        # 创建批量步骤对象（复用共享的三个步骤）
+        batch = BatchStepCreate(steps=three_steps)
 
         # 验证：步骤列表长度为 3
         assert len(batch.steps) == 3
@@ -290,34 +291,43 @@ class BatchStepCreate:
         # 测试空步骤列表（非法）
         with pytest.raises(ValidationError) as exc_info:
             BatchStepCreate(steps=[])
-        # 验证：错误信息包含最小长度约束
-        assert "steps" in str(exc_info.value).lower()
+        # 验证：错误定位到对应字段
+        assert has_error_at(exc_info.value, ("steps",))
 
 
-class BatchDeleteRequest:
+class TestBatchDeleteRequest:
     """测试 BatchDeleteRequest 批量删除请求模式"""
 
-    def test_batch_delete_valid(self):
-        """测试有效的批量删除请求"""
-        # 创建批量删除请求对象
-        request = BatchDeleteRequest(case_ids=[1, 2, 3, 4, 5])
-
-        # 验证：用例 ID 列表正确
-        assert request.case_ids == [1, 2, 3, 4, 5]
-
-    def test_batch_delete_single(self):
-        """测试单个删除"""
-        # 创建批量删除请求对象（只有一个 ID）
-        request = BatchDeleteRequest(case_ids=[1])
+    @pytest.mark.parametrize("ids", [
+        [1],  # 单个删除
+        [1, 2, 3, 4, 5],  # 多个删除
+    ], ids=["single", "multiple"])
+    def test_batch_delete_case_ids_valid_length(self, ids):
+        """测试合法的用例 ID 列表长度（至少 1 个）"""
+        # 创建批量删除请求
+        request = BatchDeleteRequest(case_ids=ids)
+        # 验证：用例 ID 列表与输入一致
+        assert request.case_ids == ids
+
+    @pytest.mark.parametrize("ids,loc", [
+        ([], ("case_ids",)),  # 空列表：少于 1 个
+        (["abc"], ("case_ids", 0)),  # 元素不是整数
+    ], ids=["empty", "non_int_element"])
+    def test_batch_delete_case_ids_invalid(self, ids, loc):
+        """测试非法的用例 ID 列表（长度不足 / 元素类型错误）"""
+        # 校验失败
+        with pytest.raises(ValidationError) as exc_info:
+            BatchDeleteRequest(case_ids=ids)
+        # 验证：错误定位到列表本身或具体元素
+        assert has_error_at(exc_info.value, loc)
 
-        # 验证：列表包含一个 ID
-        assert len(request.case_ids) == 1
+    def test_batch_delete_large_batch(self):
+        """测试大批量删除（10000 个 ID）"""
+        # 创建批量删除请求对象（复用模块级 ID 列表）
+        request = BatchDeleteRequest(case_ids=_LARGE_CASE_IDS)
 
-    def test_batch_delete_empty(self):
-        """测试空 ID 列表（非法）"""
-        # 测试空列表（非法）
-        with pytest.raises(ValidationError):
-            BatchDeleteRequest(case_ids=[])
+        # 验证：ID 数量与顺序保持不变
+        assert request.case_ids == _LARGE_CASE_IDS
 
 
 class TestCaseQueryParams:
@@ -353,23 +363,29 @@ class TestCaseQueryParams:
         assert params.page == 2
         assert params.page_size == 50
 
-    def test_query_params_page_validation(self):
-        """测试页码验证（最小值为 1）"""
-        # 测试非法页码（0）
-        with pytest.raises(ValidationError):
-            CaseQueryParams(page=0)
-
-    def test_query_params_page_size_validation(self):
-        """测试每页数量验证（范围 1-100）"""
-        # 测试非法值（101，超过上限）
-        with pytest.raises(ValidationError):
-            CaseQueryParams(page_size=101)
-
-    def test_query_params_page_size_min(self):
-        """测试每页数量最小值"""
-        # 测试非法值（0）
+    @pytest.mark.parametrize("field,value", [
+        ("page", 0),  # 页码低于下限
+        ("page", -1),  # 页码为负数
+        ("page_size", 0),  # 每页数量低于下限
+        ("page_size", 101),  # 每页数量超过上限
+    ])
+    def test_query_params_paging_invalid(self, field, value):
+        """测试分页参数越界（page >= 1，page_size 范围 1-100）"""
+        # 测试非法分页参数
         with pytest.raises(ValidationError):
-            CaseQueryParams(page_size=0)
+            CaseQueryParams(**{field: value})
+
+    @pytest.mark.parametrize("field,value", [
+        ("page", 1),  # 页码下限
+        ("page_size", 1),  # 每页数量下限
+        ("page_size", 100),  # 每页数量上限
+    ])
+    def test_query_params_paging_boundary(self, field, value):
+        """测试分页参数边界值（合法）"""
+        # 创建查询参数对象（边界值）
+        params = CaseQueryParams(**{field: value})
+        # 验证：边界值被接受
+        assert getattr(params, field) == value
 
     def test_query_params_priority_validation(self):
         """测试优先级筛选验证"""
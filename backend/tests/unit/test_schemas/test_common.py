@@ -7,6 +7,16 @@ import pytest
 # 导入通用响应模式
 from app.schemas.common import ApiResponse, PaginatedResponse, ErrorResponse
 
+# 模块级测试数据：ApiResponse 的 data 字段为任意类型，直接透传不复制，测试只读取不修改
+_SIMPLE_DATA = {"name": "测试用例", "id": 1}
+_ITEMS_DATA = {"items": [1, 2, 3]}
+_SERIALIZE_DATA = {"id": 1, "name": "测试"}
+_COMPLEX_DATA = {
+    "user": {"id": 1, "name": "张三"},
+    "items": [1, 2, 3, 4],
+    "meta": {"total": 100, "page": 1}
+}
+
 
 class TestApiResponse:
     """测试 ApiResponse 通用响应模式"""
@@ -25,15 +35,13 @@ class TestApiResponse:
 
     def test_api_response_with_data(self):
         """测试带数据的响应"""
-        # 定义测试数据
-        test_data = {"name": "测试用例", "id": 1}
-        # 创建响应对象（传入数据）
-        response = ApiResponse(data=test_data)
+        # 创建响应对象（传入模块级共享数据）
+        response = ApiResponse(data=_SIMPLE_DATA)
 
         # 验证：状态码为默认值 200
         assert response.code == 200
         # 验证：数据与输入一致
-        assert response.data == test_data
+        assert response.data == _SIMPLE_DATA
         # 验证：data["name"] 为 "测试用例"
         assert response.data["name"] == "测试用例"
 
@@ -55,22 +63,18 @@ class TestApiResponse:
 
     def test_api_response_all_fields(self):
         """测试所有字段"""
-        # 定义完整数据
-        test_data = {"items": [1, 2, 3]}
         # 创建响应对象（传入所有字段）
-        response = ApiResponse(code=200, message="操作成功", data=test_data)
+        response = ApiResponse(code=200, message="操作成功", data=_ITEMS_DATA)
 
         # 验证：所有字段与输入一致
         assert response.code == 200
         assert response.message == "操作成功"
-        assert response.data == test_data
+        assert response.data == _ITEMS_DATA
 
     def test_api_response_serialization(self):
         """测试 JSON 序列化"""
-        # 定义测试数据
-        test_data = {"id": 1, "name": "测试"}
         # 创建响应对象
-        response = ApiResponse(data=test_data, message="成功")
+        response = ApiResponse(data=_SERIALIZE_DATA, message="成功")
 
         # 转换为字典
         result = response.model_dump()
@@ -78,7 +82,7 @@ class TestApiResponse:
         # 验证：序列化后的字典包含所有字段
         assert result["code"] == 200
         assert result["message"] == "成功"
-        assert result["data"] == test_data
+        assert result["data"] == _SERIALIZE_DATA
 
     def test_api_response_with_none_data(self):
         """测试 data 为 None"""
@@ -90,14 +94,8 @@ class TestApiResponse:
 
     def test_api_response_with_complex_data(self):
         """测试复杂数据结构"""
-        # 定义复杂数据（嵌套字典和列表）
-        test_data = {
-            "user": {"id": 1, "name": "张三"},
-            "items": [1, 2, 3, 4],
-            "meta": {"total": 100, "page": 1}
-        }
-        # 创建响应对象
-        response = ApiResponse(data=test_data)
+        # 创建响应对象（嵌套字典和列表）
+        response = ApiResponse(data=_COMPLEX_DATA)
 
         # 验证：复杂数据正确存储
         assert response.data["user"]["name"] == "张三"
@@ -149,67 +147,27 @@ class TestPaginatedResponse:
         # 验证：总页数为 1（3 条记录，每页 10 条，共 1 页）
         assert response.pages == 1
 
-    def test_paginated_response_pages_calculation(self):
+    @pytest.mark.parametrize("total,page_size,page,expected", [
+        (100, 20, 1, 5),  # 整除：100 / 20 = 5
+        (25, 10, 1, 3),  # 不满一页：25 / 10 = 2.5，向上取整为 3
+        (50, 20, 2, 3),  # 第二页：50 / 20 = 2.5，向上取整为 3
+        (0, 20, 1, 0),  # 空数据：总页数为 0
+    ])
+    def test_paginated_response_pages(self, total, page_size, page, expected):
         """测试总页数计算"""
-        # 创建分页响应对象（100 条记录，每页 20 条）
-        response = PaginatedResponse(
-            data=[],
-            total=100,
-            page=1,
-            page_size=20
-        )
-
-        # 验证：总页数为 5（100 / 20 = 5）
-        assert response.pages == 5
-
-    def test_paginated_response_partial_page(self):
-        """测试不满一页的情况"""
-        # 创建分页响应对象（25 条记录，每页 10 条）
-        response = PaginatedResponse(
-            data=[],
-            total=25,
-            page=1,
-            page_size=10
-        )
-
-        # 验证：总页数为 3（25 / 10 = 2.5，向上取整为 3）
-        assert response.pages == 3
-
-    def test_paginated_response_empty(self):
-        """测试空数据"""
-        # 创建空的分页响应对象
+        # 创建分页响应对象
         response = PaginatedResponse(
             data=[],
-            total=0,
-            page=1,
-            page_size=20
+            total=total,
+            page=page,
+            page_size=page_size
         )
 
-        # 验证：数据列表为空
-        assert response.data == []
-        # 验证：总数为 0
-        assert response.total == 0
-        # 验证：总页数为 0
-        assert response.pages == 0
-
-    def test_paginated_response_second_page(self):
-        """测试第二页"""
-        # 定义第二页的数据
-        test_data = [{"id": 21}, {"id": 22}]
-        # 创建分页响应对象（第 2 页）
-        response = PaginatedResponse(
-            data=test_data,
-            total=50,
-            page=2,
-            page_size=20
-        )
-
-        # 验证：当前页为 2
-        assert response.page == 2
-        # 验证：总页数为 3（50 / 20 = 2.5，向上取整为 3）
-        assert response.pages == 3
-        # 验证：数据长度为 2
-        assert len(response.data) == 2
+        # 验证：分页信息与输入一致
+        assert response.total == total
+        assert response.page == page
+        # 验证：总页数为 total / page_size 向上取整
+        assert response.pages == expected
 
     def test_paginated_response_serialization(self):
         """测试 JSON 序列化"""
@@ -288,14 +246,13 @@ class TestErrorResponse:
         assert response.error == "Case with id 999 does not exist"
         assert response.path == "/api/v1/cases/999"
 
-    def test_error_response_code_range(self):
+    @pytest.mark.parametrize("code", [400, 404, 500, 503])  # 每个合法状态码单独成为一个用例
+    def test_error_response_code_range(self, code):
         """测试状态码范围验证"""
-        # 测试各种合法状态码
-        for code in [400, 404, 500, 503]:
-            # 创建错误响应对象
-            response = ErrorResponse(code=code, message="Error")
-            # 验证：状态码正确
-            assert response.code == code
+        # 创建错误响应对象
+        response = ErrorResponse(code=code, message="Error")
+        # 验证：状态码正确
+        assert response.code == code
 
     def test_error_response_serialization(self):
         """测试 JSON 序列化"""
@@ -307,14 +264,16 @@ class TestErrorResponse:
             path="/api/v1/cases"
         )
 
-        # 转换为字典
-        result = response.model_dump()
+        # 转换为字典（所有字段均显式设置，exclude_unset 不丢字段且跳过默认值遍历）
+        result = response.model_dump(mode="python", exclude_unset=True)
 
-        # 验证：序列化后的字典包含所有字段
-        assert result["code"] == 422
-        assert result["message"] == "Validation error"
-        assert result["error"] == "Invalid priority value"
-        assert result["path"] == "/api/v1/cases"
+        # 验证：序列化后的字典与输入完全一致
+        assert result == {
+            "code": 422,
+            "message": "Validation error",
+            "error": "Invalid priority value",
+            "path": "/api/v1/cases"
+        }
 
     def test_error_response_optional_fields(self):
         """测试可选字段默认为 None"""
@@ -4,147 +4,159 @@
 """
 # 导入 pytest 测试框架
 import pytest
-# 从 datetime 导入 datetime 类
-from datetime import datetime
 # 导入执行相关的所有模式
 from app.schemas.execution import (
     ExecutionCreate, ExecutionResponse, ExecutionListResponse,
     ExecutionDetailResponse, ExecutionLogMessage, ExecutionQueryParams
 )
-# 从 pydantic 导入验证错误异常
-from pydantic import ValidationError
+# 从 pydantic 导入验证错误异常和类型适配器
+from pydantic import TypeAdapter, ValidationError
+# 导入校验错误定位辅助函数
+from tests.fixtures.schema_fixtures import has_error_at
+
+# 模块级类型适配器：校验器只构建一次，直接复用
+_EXEC_QUERY_TA = TypeAdapter(ExecutionQueryParams)
+# 模块级默认查询参数实例：空输入只校验一次
+_DEFAULT_QP = ExecutionQueryParams()
+
+# 用例 ID 常量：元组字面量在字节码中为常量，不必每次调用重新分配
+_CASE_IDS = (1, 2, 3)
+
+# 执行详情公共字段：各测试通过解包复制后只覆盖状态、时间及与场景相关的字段
+_DETAIL_BASE = {
+    "id": 1,
+    "execution_id": 1,
+    "case_id": 1,
+    "case_name": "登录测试",
+    "error_message": None,
+    "error_stack": None,
+    "screenshot_path": None,
+    "step_logs": None,
+    "end_time": None,
+    "duration": None,
+}
 
 
 class TestExecutionCreate:
     """测试 ExecutionCreate 创建执行任务模式"""
 
-    def test_execution_create_batch(self):
+    def test_execution_create_batch(self, make_execution_create):
         """测试批量执行类型"""
-        # 创建执行对象（批量模式）
-        execution = ExecutionCreate(
+        # 通过工厂创建执行对象（批量模式）
+        execution = make_execution_create(
             execution_type="batch",
             browser_type="chrome",
             headless=True,
             window_size="1920x1080",
-            case_ids=[1, 2, 3]
+            case_ids=_CASE_IDS,
         )
 
-        # 验证：所有字段正确
-        assert execution.execution_type == "batch"
-        assert execution.browser_type == "chrome"
-        assert execution.headless is True
-        assert execution.window_size == "1920x1080"
-        assert execution.case_ids == [1, 2, 3]
+        # 验证：所有字段正确（一次字典比较覆盖全部字段）
+        assert execution.model_dump() == {
+            "execution_type": "batch",
+            "browser_type": "chrome",
+            "headless": True,
+            "window_size": "1920x1080",
+            "case_ids": list(_CASE_IDS),  # 元组输入被规范化为列表
+        }
 
-    def test_execution_create_single(self):
+    def test_execution_create_single(self, make_execution_create):
         """测试单个执行类型"""
-        # 创建执行对象（单个模式）
-        execution = ExecutionCreate(
+        # 通过工厂创建执行对象（单个模式）
+        execution = make_execution_create(
             execution_type="single",
             browser_type="firefox",
-            headless=False
+            headless=False,
         )
 
-        # 验证：所有字段正确
-        assert execution.execution_type == "single"
-        assert execution.browser_type == "firefox"
-        assert execution.headless is False
+        # 验证：所有字段正确（未传字段为 None）
+        assert execution.model_dump() == {
+            "execution_type": "single",
+            "browser_type": "firefox",
+            "headless": False,
+            "window_size": None,
+            "case_ids": None,
+        }
 
-    def test_execution_create_defaults(self):
+    def test_execution_create_defaults(self, make_execution_create):
         """测试默认值"""
-        # 创建执行对象（只传必填字段）
-        execution = ExecutionCreate(execution_type="batch")
+        # 通过工厂创建执行对象（只传必填字段）
+        execution = make_execution_create()
 
         # 验证：默认值正确
-        assert execution.execution_type == "batch"
-        assert execution.browser_type == "chrome"  # 默认值
-        assert execution.headless is True  # 默认值
-        assert execution.window_size is None
-        assert execution.case_ids is None
-
-    def test_execution_type_validation(self):
+        assert execution.model_dump() == {
+            "execution_type": "batch",
+            "browser_type": "chrome",  # 默认值
+            "headless": True,  # 默认值
+            "window_size": None,
+            "case_ids": None,
+        }
+
+    @pytest.mark.parametrize("bad", ["invalid", "SINGLE", ""])  # 非法执行类型
+    def test_execution_type_validation(self, bad):
         """测试执行类型验证（只允许 single/batch）"""
         # 测试非法执行类型
         with pytest.raises(ValidationError) as exc_info:
-            ExecutionCreate(execution_type="invalid")
-        # 验证：错误信息包含 pattern 约束
-        assert "execution_type" in str(exc_info.value).lower()
+            ExecutionCreate(execution_type=bad)
+        # 验证：错误定位到对应字段
+        assert has_error_at(exc_info.value, ("execution_type",))
 
-    def test_browser_type_validation(self):
+    @pytest.mark.parametrize("bad", ["safari", "Chrome", ""])  # 非法浏览器类型
+    def test_browser_type_validation(self, bad):
         """测试浏览器类型验证（只允许 chrome/firefox/edge）"""
         # 测试非法浏览器类型
         with pytest.raises(ValidationError) as exc_info:
-            ExecutionCreate(
-                execution_type="batch",
-                browser_type="safari"
-            )
-        # 验证：错误信息包含 pattern 约束
-        assert "browser_type" in str(exc_info.value).lower()
+            ExecutionCreate(execution_type="batch", browser_type=bad)
+        # 验证：错误定位到对应字段
+        assert has_error_at(exc_info.value, ("browser_type",))
 
-    def test_browser_type_all_valid(self):
+    @pytest.mark.parametrize("browser", ["chrome", "firefox", "edge"])  # 每个合法浏览器单独成为一个用例
+    def test_browser_type_valid(self, make_execution_create, browser):
         """测试所有合法浏览器类型"""
-        # 测试所有合法浏览器类型
-        for browser in ["chrome", "firefox", "edge"]:
-            execution = ExecutionCreate(
-                execution_type="batch",
-                browser_type=browser
-            )
-            assert execution.browser_type == browser
+        # 通过工厂创建执行对象（合法浏览器类型）
+        execution = make_execution_create(browser_type=browser)
+        assert execution.browser_type == browser
 
-    def test_headless_type(self):
+    def test_headless_type(self, make_execution_create):
         """测试无头模式类型（布尔值）"""
         # 测试 True
-        execution1 = ExecutionCreate(
-            execution_type="batch",
-            headless=True
-        )
+        execution1 = make_execution_create(headless=True)
         assert execution1.headless is True
 
         # 测试 False
-        execution2 = ExecutionCreate(
-            execution_type="batch",
-            headless=False
-        )
+        execution2 = make_execution_create(headless=False)
         assert execution2.headless is False
 
-    def test_case_ids_optional(self):
+    def test_case_ids_optional(self, make_execution_create):
         """测试用例 ID 列表可选"""
-        # 创建执行对象（不传 case_ids）
-        execution = ExecutionCreate(
-            execution_type="batch",
-            case_ids=None
-        )
+        # 通过工厂创建执行对象（case_ids 显式传入 None）
+        execution = make_execution_create(case_ids=None)
 
         # 验证：case_ids 可以为 None
         assert execution.case_ids is None
 
-    def test_case_ids_empty_list(self):
+    def test_case_ids_empty_list(self, make_execution_create):
         """测试空用例 ID 列表"""
-        # 创建执行对象（case_ids 为空列表）
-        execution = ExecutionCreate(
-            execution_type="batch",
-            case_ids=[]
-        )
+        # 通过工厂创建执行对象（case_ids 为空元组，校验后规范化为空列表）
+        execution = make_execution_create(case_ids=())
 
         # 验证：case_ids 可以为空列表
         assert execution.case_ids == []
 
-    def test_window_size_optional(self):
+    def test_window_size_optional(self, make_execution_create):
         """测试窗口大小可选"""
-        # 创建执行对象（不传 window_size）
-        execution = ExecutionCreate(execution_type="batch")
+        # 通过工厂创建执行对象（不传 window_size）
+        execution = make_execution_create()
 
-        # 验证：window_size 可以为 None
-        assert execution.window_size is None
+        # 验证：window_size 未被设置（默认值 None 已由 test_execution_create_defaults 覆盖）
+        assert "window_size" not in execution.model_fields_set
 
 
 class TestExecutionResponse:
     """测试 ExecutionResponse 执行任务响应模式"""
 
-    def test_execution_response(self):
+    def test_execution_response(self, frozen_now):
         """测试执行任务响应"""
-        # 创建当前时间
-        now = datetime.now()
         # 创建响应对象
         response = ExecutionResponse(
             id=1,
@@ -152,8 +164,8 @@ class TestExecutionResponse:
             browser_type="chrome",
             headless=True,
             window_size="1920x1080",
-            start_time=now,
-            end_time=now,
+            start_time=frozen_now,
+            end_time=frozen_now,
             total_count=10,
             success_count=8,
             fail_count=2,
@@ -161,22 +173,37 @@ class TestExecutionResponse:
             status="completed",
             pass_rate=80.0,
             duration=5000,
-            created_at=now
+            created_at=frozen_now
         )
 
-        # 验证：所有字段正确
-        assert response.id == 1
-        assert response.execution_type == "batch"
-        assert response.total_count == 10
-        assert response.success_count == 8
-        assert response.fail_count == 2
-        assert response.pass_rate == 80.0
-        assert response.duration == 5000
-
-    def test_execution_response_running(self):
+        # 验证：所有字段及前端别名正确（一次字典比较覆盖全部字段）
+        assert response.model_dump() == {
+            "id": 1,
+            "execution_type": "batch",
+            "browser_type": "chrome",
+            "headless": True,
+            "window_size": "1920x1080",
+            "start_time": frozen_now,
+            "end_time": frozen_now,
+            "total_count": 10,
+            "success_count": 8,
+            "fail_count": 2,
+            "skip_count": 0,
+            "status": "completed",
+            "pass_rate": 80.0,
+            "duration": 5000,
+            "created_at": frozen_now,
+            # 计算字段：前端期望的别名
+            "browser": "chrome",
+            "started_at": frozen_now,
+            "completed_at": frozen_now,
+            "total_cases": 10,
+            "passed_cases": 8,
+            "failed_cases": 2,
+        }
+
+    def test_execution_response_running(self, frozen_now):
         """测试运行中的执行响应（无结束时间）"""
-        # 创建当前时间
-        now = datetime.now()
         # 创建响应对象（运行中）
         response = ExecutionResponse(
             id=1,
@@ -184,7 +211,7 @@ class TestExecutionResponse:
             browser_type="chrome",
             headless=True,
             window_size=None,
-            start_time=now,
+            start_time=frozen_now,
             end_time=None,  # 运行中，无结束时间
             total_count=1,
             success_count=0,
@@ -193,7 +220,7 @@ class TestExecutionResponse:
             status="running",
             pass_rate=0.0,
             duration=None,  # 运行中，无执行时长
-            created_at=now
+            created_at=frozen_now
         )
 
         # 验证：运行中状态特征
@@ -205,10 +232,8 @@ class TestExecutionResponse:
 class TestExecutionListResponse:
     """测试 ExecutionListResponse 执行任务列表响应模式"""
 
-    def test_execution_list_response(self):
+    def test_execution_list_response(self, frozen_now):
         """测试执行任务列表响应"""
-        # 创建当前时间
-        now = datetime.now()
         # 创建列表响应对象
         response = ExecutionListResponse(
             id=1,
@@ -219,8 +244,8 @@ class TestExecutionListResponse:
             success_count=9,
             fail_count=1,
             pass_rate=90.0,
-            start_time=now,
-            created_at=now
+            start_time=frozen_now,
+            created_at=frozen_now
         )
 
         # 验证：所有字段正确
@@ -232,84 +257,63 @@ class TestExecutionListResponse:
 class TestExecutionDetailResponse:
     """测试 ExecutionDetailResponse 执行详情响应模式"""
 
-    def test_execution_detail_response_success(self):
+    def test_execution_detail_response_success(self, frozen_now):
         """测试成功的执行详情"""
-        # 创建当前时间
-        now = datetime.now()
-        # 创建详情响应对象
-        detail = ExecutionDetailResponse(
-            id=1,
-            execution_id=1,
-            case_id=1,
-            case_name="登录测试",
-            status="success",
-            error_message=None,
-            error_stack=None,
-            screenshot_path=None,
-            step_logs=[
-                {"step_order": 1, "action": "navigate", "status": "success"},
-                {"step_order": 2, "action": "click", "status": "success"}
-            ],
-            start_time=now,
-            end_time=now,
-            duration=1500,
-            created_at=now
-        )
+        # 定义步骤日志
+        step_logs = [
+            {"step_order": 1, "action": "navigate", "status": "success"},
+            {"step_order": 2, "action": "click", "status": "success"}
+        ]
+        # 创建详情响应对象（在公共字段基础上覆盖）
+        detail = ExecutionDetailResponse(**{
+            **_DETAIL_BASE,
+            "status": "success",
+            "step_logs": step_logs,
+            "start_time": frozen_now,
+            "end_time": frozen_now,
+            "duration": 1500,
+            "created_at": frozen_now,
+        })
 
         # 验证：所有字段正确
         assert detail.id == 1
         assert detail.case_name == "登录测试"
         assert detail.status == "success"
         assert detail.error_message is None
-        assert len(detail.step_logs) == 2
+        # 校验后的列表是输入的副本，逐项内容保持不变
+        assert detail.step_logs == step_logs
         assert detail.duration == 1500
 
-    def test_execution_detail_response_failed(self):
+    def test_execution_detail_response_failed(self, frozen_now):
         """测试失败的执行详情"""
-        # 创建当前时间
-        now = datetime.now()
-        # 创建详情响应对象（失败）
-        detail = ExecutionDetailResponse(
-            id=1,
-            execution_id=1,
-            case_id=1,
-            case_name="登录测试",
-            status="failed",
-            error_message="元素未找到",
-            error_stack="ElementNotFoundError: ...",
-            screenshot_path="/screenshots/error_001.png",
-            step_logs=[],
-            start_time=now,
-            end_time=now,
-            duration=500,
-            created_at=now
-        )
+        # 创建详情响应对象（失败，在公共字段基础上覆盖）
+        detail = ExecutionDetailResponse(**{
+            **_DETAIL_BASE,
+            "status": "failed",
+            "error_message": "元素未找到",
+            "error_stack": "ElementNotFoundError: ...",
+            "screenshot_path": "/screenshots/error_001.png",
+            "step_logs": [],
+            "start_time": frozen_now,
+            "end_time": frozen_now,
+            "duration": 500,
+            "created_at": frozen_now,
+        })
 
         # 验证：失败状态特征
         assert detail.status == "failed"
         assert detail.error_message == "元素未找到"
         assert detail.screenshot_path == "/screenshots/error_001.png"
 
-    def test_execution_detail_optional_fields(self):
+    def test_execution_detail_optional_fields(self, frozen_now):
         """测试可选字段"""
-        # 创建当前时间
-        now = datetime.now()
-        # 创建详情响应对象（最小字段）
-        detail = ExecutionDetailResponse(
-            id=1,
-            execution_id=1,
-            case_id=1,
-            case_name="测试",
-            status="skipped",
-            error_message=None,
-            error_stack=None,
-            screenshot_path=None,
-            step_logs=None,
-            start_time=now,
-            end_time=None,
-            duration=None,
-            created_at=now
-        )
+        # 创建详情响应对象（最小字段：可选字段全部沿用公共默认的 None）
+        detail = ExecutionDetailResponse(**{
+            **_DETAIL_BASE,
+            "status": "skipped",
+            "start_time": frozen_now,
+            "created_at": frozen_now,
+        })
 
         # 验证：可选字段为 None
         assert detail.status == "skipped"
@@ -321,139 +325,75 @@ class TestExecutionDetailResponse:
 class TestExecutionLogMessage:
     """测试 ExecutionLogMessage 执行日志消息模式"""
 
-    def test_log_message_step_start(self):
-        """测试步骤开始消息"""
-        # 创建当前时间
-        now = datetime.now()
-        # 创建日志消息对象
+    @pytest.mark.parametrize("type_,extra,expected", [
+        # 步骤开始：关联用例和步骤
+        ("step_start", {"case_id": 1, "step_order": 1}, {"case_id": 1, "step_order": 1}),
+        # 步骤成功：携带元素与动作数据
+        ("step_success", {"case_id": 1, "step_order": 2, "data": {"element": "#button", "action": "click"}},
+         {"data": {"element": "#button", "action": "click"}}),
+        # 步骤失败：携带错误数据
+        ("step_failed", {"case_id": 1, "step_order": 3, "data": {"error": "TimeoutError", "timeout": 5000}},
+         {"data": {"error": "TimeoutError", "timeout": 5000}}),
+        # 普通日志：不需要 case_id 和 step_order
+        ("log", {}, {"case_id": None, "step_order": None}),
+        # 错误消息：携带堆栈数据
+        ("error", {"case_id": 1, "data": {"stack": "Traceback..."}}, {"data": {"stack": "Traceback..."}}),
+    ], ids=["step_start", "step_success", "step_failed", "log", "error"])
+    def test_log_message(self, frozen_now, type_, extra, expected):
+        """测试各类日志消息"""
+        # 创建日志消息对象（公共字段 + 各类型特有字段）
         log = ExecutionLogMessage(
-            type="step_start",
+            type=type_,
             execution_id=1,
-            case_id=1,
-            step_order=1,
-            message="开始执行步骤 1",
-            timestamp=now
-        )
-
-        # 验证：所有字段正确
-        assert log.type == "step_start"
-        assert log.execution_id == 1
-        assert log.case_id == 1
-        assert log.step_order == 1
-        assert log.message == "开始执行步骤 1"
-
-    def test_log_message_step_success(self):
-        """测试步骤成功消息"""
-        # 创建当前时间
-        now = datetime.now()
-        # 创建日志消息对象
-        log = ExecutionLogMessage(
-            type="step_success",
-            execution_id=1,
-            case_id=1,
-            step_order=2,
-            message="步骤执行成功",
-            timestamp=now,
-            data={"element": "#button", "action": "click"}
-        )
-
-        # 验证：类型和数据正确
-        assert log.type == "step_success"
-        assert log.data["element"] == "#button"
-
-    def test_log_message_step_failed(self):
-        """测试步骤失败消息"""
-        # 创建当前时间
-        now = datetime.now()
-        # 创建日志消息对象
-        log = ExecutionLogMessage(
-            type="step_failed",
-            execution_id=1,
-            case_id=1,
-            step_order=3,
-            message="步骤执行失败",
-            timestamp=now,
-            data={"error": "TimeoutError", "timeout": 5000}
-        )
-
-        # 验证：类型和错误数据正确
-        assert log.type == "step_failed"
-        assert log.data["error"] == "TimeoutError"
-
-    def test_log_message_log(self):
-        """测试普通日志消息"""
-        # 创建当前时间
-        now = datetime.now()
-        # 创建日志消息对象
-        log = ExecutionLogMessage(
-            type="log",
-            execution_id=1,
-            message="浏览器已启动",
-            timestamp=now
-        )
-
-        # 验证：普通日志不需要 case_id 和 step_order
-        assert log.type == "log"
-        assert log.case_id is None
-        assert log.step_order is None
-
-    def test_log_message_error(self):
-        """测试错误消息"""
-        # 创建当前时间
-        now = datetime.now()
-        # 创建日志消息对象
-        log = ExecutionLogMessage(
-            type="error",
-            execution_id=1,
-            case_id=1,
-            message="执行出错",
-            timestamp=now,
-            data={"stack": "Traceback..."}
+            message="测试消息",
+            timestamp=frozen_now,
+            **extra
         )
 
-        # 验证：错误类型和数据
-        assert log.type == "error"
-        assert log.data["stack"] == "Traceback..."
+        # 验证：类型正确，且该类型关心的字段与预期一致
+        assert log.type == type_
+        assert log.model_dump(include=set(expected)) == expected
 
-    def test_log_type_validation(self):
+    @pytest.mark.parametrize("bad", ["invalid_type", "LOG", ""])  # 非法日志类型
+    def test_log_type_validation(self, frozen_now, bad):
         """测试日志类型验证"""
         # 测试非法日志类型
         with pytest.raises(ValidationError) as exc_info:
             ExecutionLogMessage(
-                type="invalid_type",
+                type=bad,
                 execution_id=1,
                 message="test",
-                timestamp=datetime.now()
+                timestamp=frozen_now
             )
-        # 验证：错误信息包含 pattern 约束
-        assert "type" in str(exc_info.value).lower()
+        # 验证：错误定位到对应字段
+        assert has_error_at(exc_info.value, ("type",))
 
-    def test_log_type_all_valid(self):
+    @pytest.mark.parametrize(
+        "log_type", ["step_start", "step_success", "step_failed", "log", "error"]
+    )  # 每个合法日志类型单独成为一个用例
+    def test_log_type_valid(self, frozen_now, log_type):
         """测试所有合法日志类型"""
-        # 测试所有合法日志类型
-        for log_type in ["step_start", "step_success", "step_failed", "log", "error"]:
-            log = ExecutionLogMessage(
-                type=log_type,
-                execution_id=1,
-                message="test",
-                timestamp=datetime.now()
-            )
-            assert log.type == log_type
+        # 创建日志消息对象（合法日志类型）
+        log = ExecutionLogMessage(
+            type=log_type,
+            execution_id=1,
+            message="test",
+            timestamp=frozen_now
+        )
+        assert log.type == log_type
 
-    def test_log_data_optional(self):
+    def test_log_data_optional(self, frozen_now):
         """测试附加数据可选"""
-        # 创建当前时间
-        now = datetime.now()
         # 创建日志消息对象（不传 data）
         log = ExecutionLogMessage(
             type="log",
             execution_id=1,
             message="测试消息",
-            timestamp=now
+            timestamp=frozen_now
         )
 
-        # 验证：data 默认为 None
-        assert log.data is None
+        # 验证：data 未被设置
+        assert "data" not in log.model_fields_set
 
 
 class TestExecutionQueryParams:
@@ -461,8 +401,8 @@ class TestExecutionQueryParams:
 
     def test_query_params_default(self):
         """测试默认值"""
-        # 创建查询参数对象（使用默认值）
-        params = ExecutionQueryParams()
+        # 复用模块级默认实例
+        params = _DEFAULT_QP
 
         # 验证：所有默认值正确
         assert params.status is None
@@ -486,43 +426,28 @@ class TestExecutionQueryParams:
         assert params.page == 2
         assert params.page_size == 50
 
-    def test_query_params_status_validation(self):
-        """测试状态筛选验证"""
-        # 测试非法状态
+    @pytest.mark.parametrize("field,value", [
+        ("status", "invalid_status"),  # 非法状态
+        ("browser_type", "safari"),  # 非法浏览器类型
+        ("page", 0),  # 页码低于下限
+        ("page_size", 101),  # 每页数量超过上限
+    ])
+    def test_query_params_invalid(self, field, value):
+        """测试查询参数校验（状态、浏览器、分页越界）"""
+        # 复用模块级类型适配器校验非法参数
         with pytest.raises(ValidationError):
-            ExecutionQueryParams(status="invalid_status")
+            _EXEC_QUERY_TA.validate_python({field: value})
 
-    def test_query_params_status_all_valid(self):
+    @pytest.mark.parametrize("status", ["pending", "running", "completed", "failed"])  # 每个合法状态单独成为一个用例
+    def test_query_params_status_valid(self, status):
         """测试所有合法状态"""
-        # 测试所有合法状态值
-        for status in ["pending", "running", "completed", "failed"]:
-            params = ExecutionQueryParams(status=status)
-            assert params.status == status
+        # 创建查询参数对象（合法状态）
+        params = ExecutionQueryParams(status=status)
+        assert params.status == status
 
-    def test_query_params_browser_validation(self):
-        """测试浏览器筛选验证"""
-        # 测试非法浏览器类型
-        with pytest.raises(ValidationError):
-            ExecutionQueryParams(browser_type="safari")
-
-    def test_query_params_page_validation(self):
-        """测试页码验证"""
-        # 测试非法页码（0）
-        with pytest.raises(ValidationError):
-            ExecutionQueryParams(page=0)
-
-    def test_query_params_page_size_validation(self):
-        """测试每页数量验证"""
-        # 测试非法值（101，超过上限）
-        with pytest.raises(ValidationError):
-            ExecutionQueryParams(page_size=101)
-
-    def test_query_params_page_size_boundary(self):
+    @pytest.mark.parametrize("page_size", [1, 100])  # 每页数量的下限与上限
+    def test_query_params_page_size_boundary(self, page_size):
         """测试每页数量边界值"""
-        # 测试边界值（100，合法）
-        params = ExecutionQueryParams(page_size=100)
-        assert params.page_size == 100
-
-        # 测试边界值（1，合法）
-        params = ExecutionQueryParams(page_size=1)
-        assert params.page_size == 1
+        # 复用模块级类型适配器校验边界值（合法）
+        params = _EXEC_QUERY_TA.validate_python({"page_size": page_size})
+        assert params.page_size == page_size
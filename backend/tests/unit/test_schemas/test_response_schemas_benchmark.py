@@ -0,0 +1,43 @@
+"""
+通用响应模式校验开销基准测试
+需要 pytest-benchmark；未安装时整个模块跳过
+"""
+# 导入 pytest 测试框架
+import pytest
+
+# pytest-benchmark 为可选依赖，缺失时跳过本模块
+pytest.importorskip("pytest_benchmark")
+
+# 导入通用响应模式
+from app.schemas.common import ApiResponse, PaginatedResponse
+
+# 模块级输入数据：只构建一次，基准循环中只测量校验本身
+_API_PAYLOAD = {"code": 200, "message": "success", "data": {"id": 1, "name": "测试用例"}}
+_PAGE_PAYLOAD = {
+    "data": [{"id": i, "name": f"用例{i}"} for i in range(1, 21)],
+    "total": 100,
+    "page": 1,
+    "page_size": 20,
+    "pages": 5
+}
+
+
+@pytest.mark.benchmark(group="schemas")  # 归入 schemas 基准分组
+def test_api_response_validate_cost(benchmark):
+    """测量 ApiResponse 从字典校验的开销，用于发现 pydantic 升级带来的性能回退"""
+    # 重复校验同一份输入并记录耗时
+    response = benchmark(ApiResponse.model_validate, _API_PAYLOAD)
+
+    # 验证：校验结果正确
+    assert response.data == _API_PAYLOAD["data"]
+
+
+@pytest.mark.benchmark(group="schemas")  # 归入 schemas 基准分组
+def test_paginated_response_validate_cost(benchmark):
+    """测量 PaginatedResponse（一页 20 条）从字典校验的开销"""
+    # 重复校验同一份输入并记录耗时
+    response = benchmark(PaginatedResponse.model_validate, _PAGE_PAYLOAD)
+
+    # 验证：数据条数与分页信息正确
+    assert len(response.data) == 20
+    assert response.pages == 5
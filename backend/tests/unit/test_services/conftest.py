@@ -0,0 +1,62 @@
+"""
+服务测试模块的 pytest 配置
+"""
+# 导入 pytest 测试框架，用于定义 fixture
+import pytest
+# 导入事件监听，用于在测试期间挂载 ORM 执行钩子
+from sqlalchemy import event
+# 从 sqlalchemy.orm 导入会话类和 raiseload 加载选项
+from sqlalchemy.orm import Session, raiseload
+
+# 导入服务测试共用的 fixtures
+from tests.fixtures.db_fixtures import (
+    query_counter,
+    filter_cases,
+    filter_executions,
+    case_factory,
+    execution_factory,
+    make_execution,
+    make_execution_detail,
+)
+# 导入 Mock Playwright 引擎 fixtures
+from tests.fixtures.api_fixtures import mock_playwright_engine, patched_playwright_engine
+# 导入报告目录 fixtures
+from tests.fixtures.api_fixtures import temp_reports_dir, reports_dir
+# 导入报告模板获取函数，用于预热模板缓存
+from app.services.report_service import get_report_template
+
+
+def _raise_on_lazy_load(orm_execute_state):
+    """为服务发出的 SELECT 追加 raiseload("*")：未声明预加载的关系一旦触发懒加载查询即报错"""
+    # 只处理顶层 SELECT，跳过关系预加载和过期列的刷新查询
+    if (
+        orm_execute_state.is_select
+        and not orm_execute_state.is_relationship_load
+        and not orm_execute_state.is_column_load
+    ):
+        # sql_only=True：已在内存中的关系照常访问，只拦截需要发 SQL 的懒加载
+        orm_execute_state.statement = orm_execute_state.statement.options(
+            raiseload("*", sql_only=True)
+        )
+
+
+@pytest.fixture(scope="session", autouse=True)  # 整个测试会话只执行一次
+def _warm_report_template():
+    """预先创建 Jinja2 环境并编译报告模板，渲染测试只命中已编译模板的缓存"""
+    get_report_template()
+
+
+@pytest.fixture(autouse=True)  # 自动应用到本目录下的所有测试
+def _isolated_reports_dir(reports_dir):
+    """所有服务测试的报告都写入临时目录，不会写进真实的 backend/reports"""
+    return reports_dir
+
+
+@pytest.fixture(autouse=True)  # 自动应用到本目录下的所有测试
+def _raiseload_all():
+    """测试期间所有 ORM 会话的 SELECT 都禁止隐式懒加载，及早暴露 N+1 查询"""
+    # 挂载到 Session 类上，覆盖测试会话和服务内部创建的会话
+    event.listen(Session, "do_orm_execute", _raise_on_lazy_load)
+    yield
+    # 测试结束后移除钩子，不影响其他目录的测试
+    event.remove(Session, "do_orm_execute", _raise_on_lazy_load)
@@ -4,6 +4,8 @@
 """
 # 导入 pytest 测试框架和异步标记
 import pytest
+# 从 datetime 导入 datetime 类，用于构造确定的创建时间
+from datetime import datetime
 # 从 sqlalchemy 导入查询相关函数
 from sqlalchemy import select
 
@@ -13,12 +15,40 @@ from app.services.case_service import case_service
 from app.schemas.case import CaseCreate, CaseUpdate, StepCreate
 # 导入模型
 from app.models.case import TestCase, TestStep
+# 导入批量写入和 SELECT 计数辅助函数
+from tests.fixtures.db_fixtures import bulk_insert, count_selects
+
+# 模块级请求数据：服务只读取不修改，各测试共享同一份已校验的实例
+_NEW_CASE = CaseCreate(
+    name="新用例",
+    description="新用例描述",
+    priority="P1",
+    tags="smoke",
+    steps=[
+        StepCreate(step_order=1, action_type="navigate"),
+        StepCreate(step_order=2, action_type="click")
+    ]
+)
+_EMPTY_STEPS_CASE = CaseCreate(name="空步骤用例", steps=[])
+_PERSISTED_CASE = CaseCreate(
+    name="持久化测试",
+    steps=[StepCreate(step_order=1, action_type="navigate")]
+)
+_THREE_STEPS = [
+    StepCreate(step_order=1, action_type="navigate"),
+    StepCreate(step_order=2, action_type="click"),
+    StepCreate(step_order=3, action_type="input")
+]
+_REPLACEMENT_STEPS = [
+    StepCreate(step_order=1, action_type="new_action"),
+    StepCreate(step_order=2, action_type="another_action")
+]
+_ONE_STEP = [StepCreate(step_order=1, action_type="navigate")]
 
 
 class TestCaseServiceGetCases:
     """测试获取用例列表方法"""
 
-    @pytest.mark.asyncio
     async def test_get_cases_empty(self, db_session):
         """测试空列表"""
         # 调用服务方法获取空列表
@@ -29,19 +59,19 @@ class TestCaseServiceGetCases:
         # 验证：总数为 0
         assert total == 0
 
-    @pytest.mark.asyncio
     async def test_get_cases_with_data(self, db_session):
         """测试有数据的情况"""
-        # 创建测试数据：插入 3 个用例
-        for i in range(1, 4):
-            case = TestCase(
-                name=f"测试用例{i}",
-                description=f"描述{i}",
-                priority="P1",
-                tags=f"tag{i}"
-            )
-            db_session.add(case)
-        await db_session.commit()
+        # 创建测试数据：插入 3 个用例（显式指定不同的创建时间，排序不依赖时钟精度）
+        await bulk_insert(db_session, TestCase, [
+            {
+                "name": f"测试用例{i}",
+                "description": f"描述{i}",
+                "priority": "P1",
+                "tags": f"tag{i}",
+                "created_at": datetime(2024, 1, i),
+            }
+            for i in range(1, 4)
+        ])
 
         # 调用服务方法获取列表
         cases, total = await case_service.get_cases(db_session)
@@ -50,78 +80,28 @@ class TestCaseServiceGetCases:
         assert len(cases) == 3
         # 验证：总数为 3
         assert total == 3
-        # 验证：第一个用例名称正确
-        assert cases[0].name == "测试用例1"
-
-    @pytest.mark.asyncio
-    async def test_get_cases_with_name_filter(self, db_session):
-        """测试按名称筛选"""
-        # 创建测试数据
-        case1 = TestCase(name="登录测试", description="测试登录")
-        case2 = TestCase(name="注册测试", description="测试注册")
-        case3 = TestCase(name="退出测试", description="测试退出")
-        db_session.add_all([case1, case2, case3])
-        await db_session.commit()
-
-        # 按名称筛选（包含"测试"）
-        cases, total = await case_service.get_cases(db_session, name="测试")
-
-        # 验证：返回 3 个结果
-        assert len(cases) == 3
-        assert total == 3
-
-        # 按名称筛选（包含"登录"）
-        cases, total = await case_service.get_cases(db_session, name="登录")
-
-        # 验证：返回 1 个结果
-        assert len(cases) == 1
-        assert cases[0].name == "登录测试"
-
-    @pytest.mark.asyncio
-    async def test_get_cases_with_priority_filter(self, db_session):
-        """测试按优先级筛选"""
-        # 创建测试数据（不同优先级）
-        case1 = TestCase(name="用例1", priority="P0")
-        case2 = TestCase(name="用例2", priority="P1")
-        case3 = TestCase(name="用例3", priority="P0")
-        db_session.add_all([case1, case2, case3])
-        await db_session.commit()
-
-        # 按优先级筛选
-        cases, total = await case_service.get_cases(db_session, priority="P0")
-
-        # 验证：返回 2 个 P0 用例
-        assert len(cases) == 2
-        assert total == 2
-        # 验证：所有结果优先级为 P0
-        for case in cases:
-            assert case.priority == "P0"
+        # 验证：按创建时间倒序返回，最后创建的用例在最前
+        assert [case.name for case in cases] == ["测试用例3", "测试用例2", "测试用例1"]
+
+    @pytest.mark.parametrize("filters,expected_names", [
+        ({"name": "测试"}, {"登录测试", "注册测试", "退出测试"}),  # 名称模糊匹配全部
+        ({"name": "登录"}, {"登录测试"}),  # 名称模糊匹配一条
+        ({"priority": "P0"}, {"登录测试", "退出测试"}),  # 按优先级筛选
+        ({"tags": "smoke"}, {"登录测试", "退出测试"}),  # 按标签筛选
+    ])
+    async def test_get_cases_with_filter(self, db_session, filter_cases, filters, expected_names):
+        """测试按名称 / 优先级 / 标签筛选"""
+        # 按条件筛选（数据集由 filter_cases 一次批量写入）
+        cases, total = await case_service.get_cases(db_session, **filters)
+
+        # 验证：总数与命中的用例一致
+        assert total == len(expected_names)
+        assert {case.name for case in cases} == expected_names
 
-    @pytest.mark.asyncio
-    async def test_get_cases_with_tags_filter(self, db_session):
-        """测试按标签筛选"""
-        # 创建测试数据
-        case1 = TestCase(name="用例1", tags="smoke,regression")
-        case2 = TestCase(name="用例2", tags="api")
-        case3 = TestCase(name="用例3", tags="smoke,api")
-        db_session.add_all([case1, case2, case3])
-        await db_session.commit()
-
-        # 按标签筛选
-        cases, total = await case_service.get_cases(db_session, tags="smoke")
-
-        # 验证：返回 2 个包含 smoke 标签的用例
-        assert len(cases) == 2
-        assert total == 2
-
-    @pytest.mark.asyncio
     async def test_get_cases_pagination(self, db_session):
         """测试分页"""
-        # 创建 25 条测试数据
-        for i in range(1, 26):
-            case = TestCase(name=f"用例{i}")
-            db_session.add(case)
-        await db_session.commit()
+        # 创建 25 条测试数据（一条批量 INSERT）
+        await bulk_insert(db_session, TestCase, [{"name": f"用例{i}"} for i in range(1, 26)])
 
         # 获取第 1 页（每页 10 条）
         cases, total = await case_service.get_cases(db_session, page=1, page_size=10)
@@ -142,17 +122,13 @@ class TestCaseServiceGetCases:
         # 验证：第 3 页 5 条
         assert len(cases) == 5
 
-    @pytest.mark.asyncio
     async def test_get_cases_ordering(self, db_session):
         """测试排序（按创建时间倒序）"""
-        # 创建测试数据（不同时间）
-        case1 = TestCase(name="用例1")
-        db_session.add(case1)
-        await db_session.commit()
-
-        case2 = TestCase(name="用例2")
-        db_session.add(case2)
-        await db_session.commit()
+        # 创建测试数据（显式指定不同的创建时间，排序不依赖时钟精度）
+        await bulk_insert(db_session, TestCase, [
+            {"name": "用例1", "created_at": datetime(2024, 1, 1)},
+            {"name": "用例2", "created_at": datetime(2024, 1, 2)},
+        ])
 
         # 获取列表
         cases, total = await case_service.get_cases(db_session)
@@ -165,25 +141,20 @@ class TestCaseServiceGetCases:
 class TestCaseServiceGetCaseById:
     """测试根据 ID 获取用例方法"""
 
-    @pytest.mark.asyncio
-    async def test_get_case_by_id_exists(self, db_session):
+    async def test_get_case_by_id_exists(self, db_session, case_factory):
         """测试获取存在的用例"""
         # 创建测试数据
-        case = TestCase(name="测试用例", description="测试描述")
-        db_session.add(case)
-        await db_session.commit()
-        await db_session.refresh(case)
+        case_id = await case_factory(name="测试用例", description="测试描述")
 
         # 调用服务方法
-        result = await case_service.get_case_by_id(db_session, case.id)
+        result = await case_service.get_case_by_id(db_session, case_id)
 
         # 验证：返回的用例数据正确
         assert result is not None
-        assert result.id == case.id
+        assert result.id == case_id
         assert result.name == "测试用例"
         assert result.description == "测试描述"
 
-    @pytest.mark.asyncio
     async def test_get_case_by_id_not_exists(self, db_session):
         """测试获取不存在的用例"""
         # 调用服务方法（ID 不存在）
@@ -192,51 +163,37 @@ class TestCaseServiceGetCaseById:
         # 验证：返回 None
         assert result is None
 
-    @pytest.mark.asyncio
-    async def test_get_case_by_id_with_steps(self, db_session):
+    async def test_get_case_by_id_with_steps(self, db_session, query_counter, case_factory):
         """测试获取用例及其步骤"""
         # 创建测试数据（用例 + 步骤）
-        case = TestCase(name="带步骤的用例")
-        db_session.add(case)
-        await db_session.commit()
-        await db_session.refresh(case)
+        case_id = await case_factory(name="带步骤的用例")
 
         # 添加步骤
-        step1 = TestStep(case_id=case.id, step_order=1, action_type="navigate")
-        step2 = TestStep(case_id=case.id, step_order=2, action_type="click")
-        db_session.add_all([step1, step2])
-        await db_session.commit()
+        await bulk_insert(db_session, TestStep, [
+            {"case_id": case_id, "step_order": 1, "action_type": "navigate"},
+            {"case_id": case_id, "step_order": 2, "action_type": "click"},
+        ])
 
-        # 调用服务方法
-        result = await case_service.get_case_by_id(db_session, case.id)
+        # 调用服务方法（从这里开始统计 SQL）
+        query_counter.clear()
+        result = await case_service.get_case_by_id(db_session, case_id)
 
         # 验证：用例包含步骤
         assert result is not None
         assert len(result.steps) == 2
         assert result.steps[0].action_type == "navigate"
         assert result.steps[1].action_type == "click"
+        # 验证：用例 + selectinload 步骤共两条 SELECT，访问步骤没有触发额外查询
+        assert count_selects(query_counter) == 2
 
 
 class TestCaseServiceCreateCase:
     """测试创建用例方法"""
 
-    @pytest.mark.asyncio
     async def test_create_case_success(self, db_session):
         """测试成功创建用例"""
-        # 创建用例数据
-        case_data = CaseCreate(
-            name="新用例",
-            description="新用例描述",
-            priority="P1",
-            tags="smoke",
-            steps=[
-                StepCreate(step_order=1, action_type="navigate"),
-                StepCreate(step_order=2, action_type="click")
-            ]
-        )
-
-        # 调用服务方法
-        result = await case_service.create_case(db_session, case_data)
+        # 调用服务方法（复用模块级用例数据）
+        result = await case_service.create_case(db_session, _NEW_CASE)
 
         # 验证：用例创建成功
         assert result is not None
@@ -248,38 +205,22 @@ class TestCaseServiceCreateCase:
         assert len(result.steps) == 2
         assert result.steps[0].action_type == "navigate"
 
-    @pytest.mark.asyncio
     async def test_create_case_with_empty_steps(self, db_session):
         """测试创建空步骤用例"""
-        # 创建用例数据（空步骤）
-        case_data = CaseCreate(
-            name="空步骤用例",
-            steps=[]
-        )
-
-        # 调用服务方法
-        result = await case_service.create_case(db_session, case_data)
+        # 调用服务方法（空步骤用例数据）
+        result = await case_service.create_case(db_session, _EMPTY_STEPS_CASE)
 
         # 验证：用例创建成功，无步骤
         assert result is not None
         assert len(result.steps) == 0
 
-    @pytest.mark.asyncio
     async def test_create_case_persisted(self, db_session):
         """测试用例持久化到数据库"""
-        # 创建用例数据
-        case_data = CaseCreate(
-            name="持久化测试",
-            steps=[StepCreate(step_order=1, action_type="navigate")]
-        )
-
-        # 调用服务方法
-        result = await case_service.create_case(db_session, case_data)
+        # 调用服务方法（复用模块级用例数据）
+        result = await case_service.create_case(db_session, _PERSISTED_CASE)
 
-        # 直接查询数据库验证
-        query = select(TestCase).where(TestCase.id == result.id)
-        db_result = await db_session.execute(query)
-        db_case = db_result.scalar_one_or_none()
+        # 按主键直接查询数据库验证（populate_existing 强制发出 SELECT，而非仅命中标识映射）
+        db_case = await db_session.get(TestCase, result.id, populate_existing=True)
 
         # 验证：数据库中存在该用例
         assert db_case is not None
@@ -289,14 +230,10 @@ class TestCaseServiceCreateCase:
 class TestCaseServiceUpdateCase:
     """测试更新用例方法"""
 
-    @pytest.mark.asyncio
-    async def test_update_case_success(self, db_session):
+    async def test_update_case_success(self, db_session, case_factory):
         """测试成功更新用例"""
         # 创建初始用例
-        case = TestCase(name="原名称", priority="P1")
-        db_session.add(case)
-        await db_session.commit()
-        await db_session.refresh(case)
+        case_id = await case_factory(name="原名称", priority="P1")
 
         # 更新数据
         update_data = CaseUpdate(
@@ -306,7 +243,7 @@ class TestCaseServiceUpdateCase:
         )
 
         # 调用服务方法
-        result = await case_service.update_case(db_session, case.id, update_data)
+        result = await case_service.update_case(db_session, case_id, update_data)
 
         # 验证：更新成功
         assert result is not None
@@ -314,27 +251,22 @@ class TestCaseServiceUpdateCase:
         assert result.priority == "P0"
         assert result.description == "新描述"
 
-    @pytest.mark.asyncio
-    async def test_update_case_partial(self, db_session):
+    async def test_update_case_partial(self, db_session, case_factory):
         """测试部分更新"""
         # 创建初始用例
-        case = TestCase(name="原名称", description="原描述", priority="P1")
-        db_session.add(case)
-        await db_session.commit()
-        await db_session.refresh(case)
+        case_id = await case_factory(name="原名称", description="原描述", priority="P1")
 
         # 只更新名称
         update_data = CaseUpdate(name="只更新名称")
 
         # 调用服务方法
-        result = await case_service.update_case(db_session, case.id, update_data)
+        result = await case_service.update_case(db_session, case_id, update_data)
 
         # 验证：只更新了名称，其他字段保持不变
         assert result.name == "只更新名称"
         assert result.description == "原描述"
         assert result.priority == "P1"
 
-    @pytest.mark.asyncio
     async def test_update_case_not_exists(self, db_session):
         """测试更新不存在的用例"""
         # 更新数据
@@ -346,20 +278,16 @@ class TestCaseServiceUpdateCase:
         # 验证：返回 None
         assert result is None
 
-    @pytest.mark.asyncio
-    async def test_update_case_no_changes(self, db_session):
+    async def test_update_case_no_changes(self, db_session, case_factory):
         """测试不更新任何字段"""
         # 创建初始用例
-        case = TestCase(name="用例名")
-        db_session.add(case)
-        await db_session.commit()
-        await db_session.refresh(case)
+        case_id = await case_factory(name="用例名")
 
         # 空更新数据
         update_data = CaseUpdate()
 
         # 调用服务方法
-        result = await case_service.update_case(db_session, case.id, update_data)
+        result = await case_service.update_case(db_session, case_id, update_data)
 
         # 验证：数据保持不变
         assert result.name == "用例名"
@@ -368,14 +296,10 @@ class TestCaseServiceUpdateCase:
 class TestCaseServiceDeleteCase:
     """测试删除用例方法"""
 
-    @pytest.mark.asyncio
-    async def test_delete_case_success(self, db_session):
+    async def test_delete_case_success(self, db_session, case_factory):
         """测试成功删除用例"""
         # 创建测试用例
-        case = TestCase(name="待删除用例")
-        db_session.add(case)
-        await db_session.commit()
-        case_id = case.id
+        case_id = await case_factory(name="待删除用例")
 
         # 调用服务方法
         success = await case_service.delete_case(db_session, case_id)
@@ -383,12 +307,9 @@ class TestCaseServiceDeleteCase:
         # 验证：删除成功
         assert success is True
 
-        # 验证：数据库中不存在
-        query = select(TestCase).where(TestCase.id == case_id)
-        result = await db_session.execute(query)
-        assert result.scalar_one_or_none() is None
+        # 验证：数据库中不存在（已删除对象不在标识映射中，按主键查询数据库）
+        assert await db_session.get(TestCase, case_id) is None
 
-    @pytest.mark.asyncio
     async def test_delete_case_not_exists(self, db_session):
         """测试删除不存在的用例"""
         # 调用服务方法（ID 不存在）
@@ -397,21 +318,22 @@ class TestCaseServiceDeleteCase:
         # 验证：返回 False
         assert success is False
 
-    @pytest.mark.asyncio
     async def test_delete_case_with_steps(self, db_session):
         """测试删除带步骤的用例（级联删除）"""
-        # 创建测试用例和步骤
-        case = TestCase(name="带步骤的用例")
-        db_session.add(case)
-        await db_session.commit()
-        await db_session.refresh(case)
+        # 创建测试用例和步骤（同一事务内写入，退出时只提交一次）
+        async with db_session.begin():
+            case = TestCase(name="带步骤的用例")
+            db_session.add(case)
+            # flush 生成用例 ID，供步骤外键使用
+            await db_session.flush()
 
-        step1 = TestStep(case_id=case.id, step_order=1, action_type="navigate")
-        step2 = TestStep(case_id=case.id, step_order=2, action_type="click")
-        db_session.add_all([step1, step2])
-        await db_session.commit()
+            step1 = TestStep(case_id=case.id, step_order=1, action_type="navigate")
+            step2 = TestStep(case_id=case.id, step_order=2, action_type="click")
+            db_session.add_all([step1, step2])
 
         case_id = case.id
+        # 异步会话不能懒加载关系，先显式加载步骤再统计
+        await db_session.refresh(case, ["steps"])
         step_count_before = len(case.steps)
 
         # 验证：删除前有 2 个步骤
@@ -433,7 +355,6 @@ class TestCaseServiceDeleteCase:
 class TestCaseServiceBatchDeleteCases:
     """测试批量删除用例方法"""
 
-    @pytest.mark.asyncio
     async def test_batch_delete_cases_success(self, db_session):
         """测试成功批量删除"""
         # 创建测试用例
@@ -456,7 +377,6 @@ class TestCaseServiceBatchDeleteCases:
         result = await db_session.execute(query)
         assert len(result.scalars().all()) == 0
 
-    @pytest.mark.asyncio
     async def test_batch_delete_cases_partial(self, db_session):
         """测试部分删除（部分 ID 不存在）"""
         # 创建测试用例
@@ -474,7 +394,6 @@ class TestCaseServiceBatchDeleteCases:
         # 验证：只删除了存在的 2 个
         assert count == 2
 
-    @pytest.mark.asyncio
     async def test_batch_delete_cases_empty(self, db_session):
         """测试空列表删除"""
         # 调用服务方法（空列表）
@@ -483,7 +402,6 @@ class TestCaseServiceBatchDeleteCases:
         # 验证：删除数量为 0
         assert count == 0
 
-    @pytest.mark.asyncio
     async def test_batch_delete_cases_all_not_exist(self, db_session):
         """测试所有 ID 都不存在"""
         # 调用服务方法（所有 ID 都不存在）
@@ -496,24 +414,13 @@ class TestCaseServiceBatchDeleteCases:
 class TestCaseServiceSaveSteps:
     """测试保存步骤方法"""
 
-    @pytest.mark.asyncio
-    async def test_save_steps_success(self, db_session):
+    async def test_save_steps_success(self, db_session, case_factory):
         """测试成功保存步骤"""
         # 创建测试用例
-        case = TestCase(name="测试用例")
-        db_session.add(case)
-        await db_session.commit()
-        await db_session.refresh(case)
-
-        # 新步骤数据
-        steps_data = [
-            StepCreate(step_order=1, action_type="navigate"),
-            StepCreate(step_order=2, action_type="click"),
-            StepCreate(step_order=3, action_type="input")
-        ]
+        case_id = await case_factory(name="测试用例")
 
-        # 调用服务方法
-        result = await case_service.save_steps(db_session, case.id, steps_data)
+        # 调用服务方法（三个新步骤）
+        result = await case_service.save_steps(db_session, case_id, _THREE_STEPS)
 
         # 验证：步骤保存成功
         assert result is not None
@@ -522,58 +429,44 @@ class TestCaseServiceSaveSteps:
         assert result.steps[1].action_type == "click"
         assert result.steps[2].action_type == "input"
 
-    @pytest.mark.asyncio
     async def test_save_steps_replace_existing(self, db_session):
         """测试替换现有步骤"""
-        # 创建测试用例和步骤
-        case = TestCase(name="测试用例")
-        db_session.add(case)
-        await db_session.commit()
-        await db_session.refresh(case)
-
-        # 添加初始步骤
-        step1 = TestStep(case_id=case.id, step_order=1, action_type="old_action")
-        db_session.add(step1)
-        await db_session.commit()
+        # 创建测试用例和初始步骤（同一事务内写入，退出时只提交一次）
+        async with db_session.begin():
+            case = TestCase(name="测试用例")
+            db_session.add(case)
+            # flush 生成用例 ID，供步骤外键使用
+            await db_session.flush()
 
-        # 新步骤数据（替换旧的）
-        steps_data = [
-            StepCreate(step_order=1, action_type="new_action"),
-            StepCreate(step_order=2, action_type="another_action")
-        ]
+            step1 = TestStep(case_id=case.id, step_order=1, action_type="old_action")
+            db_session.add(step1)
 
-        # 调用服务方法
-        result = await case_service.save_steps(db_session, case.id, steps_data)
+        # 调用服务方法（新步骤替换旧的）
+        result = await case_service.save_steps(db_session, case.id, _REPLACEMENT_STEPS)
 
         # 验证：旧步骤被替换
         assert len(result.steps) == 2
         assert result.steps[0].action_type == "new_action"
 
-    @pytest.mark.asyncio
     async def test_save_steps_case_not_exists(self, db_session):
         """测试用例不存在"""
-        # 步骤数据
-        steps_data = [StepCreate(step_order=1, action_type="navigate")]
-
         # 调用服务方法（用例 ID 不存在）
-        result = await case_service.save_steps(db_session, 999, steps_data)
+        result = await case_service.save_steps(db_session, 999, _ONE_STEP)
 
         # 验证：返回 None
         assert result is None
 
-    @pytest.mark.asyncio
     async def test_save_steps_empty_list(self, db_session):
         """测试保存空步骤列表（清空步骤）"""
-        # 创建测试用例和步骤
-        case = TestCase(name="测试用例")
-        db_session.add(case)
-        await db_session.commit()
-        await db_session.refresh(case)
+        # 创建测试用例和初始步骤（同一事务内写入，退出时只提交一次）
+        async with db_session.begin():
+            case = TestCase(name="测试用例")
+            db_session.add(case)
+            # flush 生成用例 ID，供步骤外键使用
+            await db_session.flush()
 
-        # 添加初始步骤
-        step1 = TestStep(case_id=case.id, step_order=1, action_type="navigate")
-        db_session.add(step1)
-        await db_session.commit()
+            step1 = TestStep(case_id=case.id, step_order=1, action_type="navigate")
+            db_session.add(step1)
 
         # 保存空步骤列表
         steps_data = []
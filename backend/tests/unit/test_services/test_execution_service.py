@@ -5,7 +5,7 @@
 # 导入 pytest 测试框架和异步标记
 import pytest
 # 从 unittest.mock 导入 AsyncMock
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock
 # 从 sqlalchemy 导入查询相关函数
 from sqlalchemy import select
 
@@ -16,12 +16,25 @@ from app.schemas.execution import ExecutionCreate
 # 导入模型
 from app.models.execution import Execution, ExecutionDetail
 from app.models.case import TestCase
+# 导入批量写入和 SELECT 计数辅助函数
+from tests.fixtures.db_fixtures import bulk_insert, count_selects
+
+
+# 模块级请求数据：服务只读取不修改，各测试共享同一份已校验的实例
+_BATCH_ALL_CASES = ExecutionCreate(execution_type="batch", browser_type="firefox", case_ids=None)
+_DEFAULT_BATCH = ExecutionCreate(execution_type="batch")
+
+
+@pytest.fixture(autouse=True)  # 自动应用到本模块的所有测试
+def _isolated_running_engines(monkeypatch):
+    """为每个测试换上空的运行引擎字典，测试结束后 monkeypatch 自动恢复原字典"""
+    # 替换单例服务上的运行字典，测试之间互不影响
+    monkeypatch.setattr(execution_service, "_running_executions", {})
 
 
 class TestExecutionServiceGetExecutions:
     """测试获取执行列表方法"""
 
-    @pytest.mark.asyncio
     async def test_get_executions_empty(self, db_session):
         """测试空列表"""
         # 调用服务方法获取空列表
@@ -32,19 +45,19 @@ class TestExecutionServiceGetExecutions:
         # 验证：总数为 0
         assert total == 0
 
-    @pytest.mark.asyncio
     async def test_get_executions_with_data(self, db_session):
         """测试有数据的情况"""
         # 创建测试数据：插入 3 条执行记录
-        for i in range(1, 4):
-            execution = Execution(
+        db_session.add_all([
+            Execution(
                 execution_type="batch",
                 browser_type="chrome",
                 headless=True,
                 total_count=10,
                 status="completed"
             )
-            db_session.add(execution)
+            for _ in range(3)
+        ])
         await db_session.commit()
 
         # 调用服务方法获取列表
@@ -55,54 +68,29 @@ class TestExecutionServiceGetExecutions:
         # 验证：总数为 3
         assert total == 3
 
-    @pytest.mark.asyncio
-    async def test_get_executions_with_status_filter(self, db_session):
-        """测试按状态筛选"""
-        # 创建测试数据（不同状态）
-        exec1 = Execution(execution_type="batch", browser_type="chrome", status="pending")
-        exec2 = Execution(execution_type="batch", browser_type="chrome", status="running")
-        exec3 = Execution(execution_type="batch", browser_type="chrome", status="pending")
-        db_session.add_all([exec1, exec2, exec3])
-        await db_session.commit()
-
-        # 按状态筛选
-        executions, total = await execution_service.get_executions(db_session, status="pending")
+    @pytest.mark.parametrize("field,value", [
+        ("status", "pending"),  # 按状态筛选
+        ("browser_type", "chrome"),  # 按浏览器类型筛选
+    ])
+    async def test_get_executions_with_filter(self, db_session, filter_executions, field, value):
+        """测试按状态 / 浏览器类型筛选"""
+        # 按条件筛选（数据集由 filter_executions 一次批量写入）
+        executions, total = await execution_service.get_executions(db_session, **{field: value})
 
-        # 验证：返回 2 条 pending 状态的记录
+        # 验证：返回 2 条匹配的记录
         assert len(executions) == 2
         assert total == 2
-        for e in executions:
-            assert e.status == "pending"
-
-    @pytest.mark.asyncio
-    async def test_get_executions_with_browser_filter(self, db_session):
-        """测试按浏览器类型筛选"""
-        # 创建测试数据（不同浏览器）
-        exec1 = Execution(execution_type="batch", browser_type="chrome", status="pending")
-        exec2 = Execution(execution_type="batch", browser_type="firefox", status="pending")
-        exec3 = Execution(execution_type="batch", browser_type="chrome", status="pending")
-        db_session.add_all([exec1, exec2, exec3])
-        await db_session.commit()
+        # 验证：所有结果都满足筛选条件
+        assert all(getattr(e, field) == value for e in executions)
 
-        # 按浏览器类型筛选
-        executions, total = await execution_service.get_executions(db_session, browser_type="chrome")
-
-        # 验证：返回 2 条 chrome 类型的记录
-        assert len(executions) == 2
-        assert total == 2
-
-    @pytest.mark.asyncio
     async def test_get_executions_pagination(self, db_session):
         """测试分页"""
-        # 创建 25 条测试数据
-        for i in range(25):
-            execution = Execution(
-                execution_type="batch",
-                browser_type="chrome",
-                status="pending"
-            )
-            db_session.add(execution)
-        await db_session.commit()
+        # 创建 25 条测试数据（一条批量 INSERT）
+        await bulk_insert(
+            db_session,
+            Execution,
+            [{"execution_type": "batch", "browser_type": "chrome", "status": "pending"} for _ in range(25)]
+        )
 
         # 获取第 1 页（每页 10 条）
         executions, total = await execution_service.get_executions(db_session, page=1, page_size=10)
@@ -115,28 +103,19 @@ class TestExecutionServiceGetExecutions:
 class TestExecutionServiceGetExecutionById:
     """测试根据 ID 获取执行记录方法"""
 
-    @pytest.mark.asyncio
-    async def test_get_execution_by_id_exists(self, db_session):
+    async def test_get_execution_by_id_exists(self, db_session, execution_factory):
         """测试获取存在的执行记录"""
         # 创建测试数据
-        execution = Execution(
-            execution_type="batch",
-            browser_type="chrome",
-            status="pending"
-        )
-        db_session.add(execution)
-        await db_session.commit()
-        await db_session.refresh(execution)
+        execution_id = await execution_factory(status="pending")
 
         # 调用服务方法
-        result = await execution_service.get_execution_by_id(db_session, execution.id)
+        result = await execution_service.get_execution_by_id(db_session, execution_id)
 
         # 验证：返回的执行记录正确
         assert result is not None
-        assert result.id == execution.id
+        assert result.id == execution_id
         assert result.status == "pending"
 
-    @pytest.mark.asyncio
     async def test_get_execution_by_id_not_exists(self, db_session):
         """测试获取不存在的执行记录"""
         # 调用服务方法（ID 不存在）
@@ -145,47 +124,31 @@ class TestExecutionServiceGetExecutionById:
         # 验证：返回 None
         assert result is None
 
-    @pytest.mark.asyncio
-    async def test_get_execution_by_id_with_details(self, db_session):
+    async def test_get_execution_by_id_with_details(self, db_session, query_counter, execution_factory):
         """测试获取执行记录及其详情"""
         # 创建测试数据（执行记录 + 详情）
-        execution = Execution(
-            execution_type="batch",
-            browser_type="chrome",
-            status="completed"
-        )
-        db_session.add(execution)
-        await db_session.commit()
-        await db_session.refresh(execution)
+        execution_id = await execution_factory(status="completed")
 
         # 添加详情
-        detail1 = ExecutionDetail(
-            execution_id=execution.id,
-            case_id=1,
-            case_name="用例1",
-            status="success"
-        )
-        detail2 = ExecutionDetail(
-            execution_id=execution.id,
-            case_id=2,
-            case_name="用例2",
-            status="failed"
-        )
-        db_session.add_all([detail1, detail2])
-        await db_session.commit()
+        await bulk_insert(db_session, ExecutionDetail, [
+            {"execution_id": execution_id, "case_id": 1, "case_name": "用例1", "status": "success"},
+            {"execution_id": execution_id, "case_id": 2, "case_name": "用例2", "status": "failed"},
+        ])
 
-        # 调用服务方法
-        result = await execution_service.get_execution_by_id(db_session, execution.id)
+        # 调用服务方法（从这里开始统计 SQL）
+        query_counter.clear()
+        result = await execution_service.get_execution_by_id(db_session, execution_id)
 
         # 验证：执行记录包含详情
         assert result is not None
         assert len(result.details) == 2
+        # 验证：执行记录 + selectinload 详情共两条 SELECT，访问详情没有触发额外查询
+        assert count_selects(query_counter) == 2
 
 
 class TestExecutionServiceCreateExecution:
     """测试创建执行任务方法"""
 
-    @pytest.mark.asyncio
     async def test_create_execution_batch_with_cases(self, db_session):
         """测试创建批量执行任务（指定用例）"""
         # 创建测试用例
@@ -213,41 +176,27 @@ class TestExecutionServiceCreateExecution:
         assert result.total_count == 3
         assert result.status == "pending"
 
-    @pytest.mark.asyncio
     async def test_create_execution_batch_all_cases(self, db_session):
         """测试创建批量执行任务（所有用例）"""
-        # 创建测试用例
-        for i in range(1, 6):
-            case = TestCase(name=f"用例{i}")
-            db_session.add(case)
-        await db_session.commit()
+        # 创建测试用例（一条批量 INSERT）
+        await bulk_insert(db_session, TestCase, [{"name": f"用例{i}"} for i in range(1, 6)])
 
-        # 创建执行数据（不指定用例，获取所有）
-        execution_data = ExecutionCreate(
-            execution_type="batch",
-            browser_type="firefox",
-            case_ids=None
-        )
-
-        # 调用服务方法
-        result = await execution_service.create_execution(db_session, execution_data)
+        # 调用服务方法（不指定用例，获取所有）
+        result = await execution_service.create_execution(db_session, _BATCH_ALL_CASES)
 
         # 验证：获取所有用例
         assert result.total_count == 5
 
-    @pytest.mark.asyncio
-    async def test_create_execution_single(self, db_session):
+    async def test_create_execution_single(self, db_session, case_factory):
         """测试创建单个执行任务"""
         # 创建测试用例
-        case = TestCase(name="单个用例")
-        db_session.add(case)
-        await db_session.commit()
+        case_id = await case_factory(name="单个用例")
 
         # 创建执行数据
         execution_data = ExecutionCreate(
             execution_type="single",
             browser_type="chrome",
-            case_ids=[case.id]
+            case_ids=[case_id]
         )
 
         # 调用服务方法
@@ -257,16 +206,10 @@ class TestExecutionServiceCreateExecution:
         assert result.execution_type == "single"
         assert result.total_count == 1
 
-    @pytest.mark.asyncio
     async def test_create_execution_default_values(self, db_session):
         """测试默认值"""
-        # 创建执行数据（只传必填字段）
-        execution_data = ExecutionCreate(
-            execution_type="batch"
-        )
-
-        # 调用服务方法
-        result = await execution_service.create_execution(db_session, execution_data)
+        # 调用服务方法（只传必填字段）
+        result = await execution_service.create_execution(db_session, _DEFAULT_BATCH)
 
         # 验证：默认值正确
         assert result.browser_type == "chrome"
@@ -277,59 +220,42 @@ class TestExecutionServiceCreateExecution:
 class TestExecutionServiceStartExecution:
     """测试启动执行任务方法"""
 
-    @pytest.mark.asyncio
-    async def test_start_execution_success(self, db_session):
+    async def test_start_execution_success(self, db_session, patched_playwright_engine):
         """测试成功启动执行任务"""
-        # 创建测试用例
-        case = TestCase(name="测试用例")
-        db_session.add(case)
-        await db_session.commit()
+        # 创建用例、执行记录和执行详情（同一事务内写入，退出时只提交一次）
+        async with db_session.begin():
+            # 创建测试用例
+            case = TestCase(name="测试用例")
+            # 创建执行记录
+            execution = Execution(
+                execution_type="single",
+                browser_type="chrome",
+                headless=True,
+                total_count=1,
+                status="pending"
+            )
+            db_session.add_all([case, execution])
+            # flush 生成用例和执行记录 ID，供执行详情外键使用
+            await db_session.flush()
+
+            # 创建执行详情
+            detail = ExecutionDetail(
+                execution_id=execution.id,
+                case_id=case.id,
+                case_name=case.name,
+                status="pending"
+            )
+            db_session.add(detail)
+            # 记录要执行的用例 ID（start_execution 据此查询用例，为空时直接返回 None）
+            execution.set_case_ids([case.id])
 
-        # 创建执行记录
-        execution = Execution(
-            execution_type="single",
-            browser_type="chrome",
-            headless=True,
-            total_count=1,
-            status="pending"
-        )
-        db_session.add(execution)
-        await db_session.commit()
-        await db_session.refresh(execution)
-
-        # 创建执行详情
-        detail = ExecutionDetail(
-            execution_id=execution.id,
-            case_id=case.id,
-            case_name=case.name,
-            status="pending"
-        )
-        db_session.add(detail)
-        await db_session.commit()
+        # 调用服务方法（PlaywrightEngine 已由 patched_playwright_engine 替换）
+        result = await execution_service.start_execution(db_session, execution.id)
+
+        # 验证：执行状态更新为运行中
+        assert result is not None
+        assert result.status == "running"
 
-        # Mock PlaywrightEngine
-        with patch('app.services.execution_service.PlaywrightEngine') as MockEngine:
-            # 配置 Mock
-            mock_engine = AsyncMock()
-            mock_engine.start_browser = AsyncMock()
-            mock_engine.close_browser = AsyncMock()
-            mock_engine.execute_case = AsyncMock(return_value={
-                "success": True,
-                "total_steps": 0,
-                "success_steps": 0,
-                "failed_steps": 0,
-                "step_results": []
-            })
-            MockEngine.return_value = mock_engine
-
-            # 调用服务方法
-            result = await execution_service.start_execution(db_session, execution.id)
-
-            # 验证：执行状态更新为运行中
-            assert result is not None
-            assert result.status == "running"
-
-    @pytest.mark.asyncio
     async def test_start_execution_not_exists(self, db_session):
         """测试启动不存在的执行任务"""
         # 调用服务方法（ID 不存在）
@@ -342,34 +268,25 @@ class TestExecutionServiceStartExecution:
 class TestExecutionServiceStopExecution:
     """测试停止执行任务方法"""
 
-    @pytest.mark.asyncio
-    async def test_stop_execution_success(self, db_session):
+    async def test_stop_execution_success(self, db_session, execution_factory):
         """测试成功停止执行任务"""
         # 创建执行记录
-        execution = Execution(
-            execution_type="batch",
-            browser_type="chrome",
-            status="running"
-        )
-        db_session.add(execution)
-        await db_session.commit()
-        await db_session.refresh(execution)
+        execution_id = await execution_factory(status="running")
 
         # Mock 引擎（模拟正在运行）
         mock_engine = AsyncMock()
-        execution_service._running_executions[execution.id] = mock_engine
+        execution_service._running_executions[execution_id] = mock_engine
 
         # 调用服务方法
-        success = await execution_service.stop_execution(db_session, execution.id)
+        success = await execution_service.stop_execution(db_session, execution_id)
 
         # 验证：停止成功
         assert success is True
 
-        # 验证：状态更新为失败
-        await db_session.refresh(execution)
+        # 验证：状态更新为失败（populate_existing 强制从数据库重新读取）
+        execution = await db_session.get(Execution, execution_id, populate_existing=True)
         assert execution.status == "failed"
 
-    @pytest.mark.asyncio
     async def test_stop_execution_not_exists(self, db_session):
         """测试停止不存在的执行任务"""
         # 调用服务方法（ID 不存在）
@@ -378,21 +295,13 @@ class TestExecutionServiceStopExecution:
         # 验证：返回 False
         assert success is False
 
-    @pytest.mark.asyncio
-    async def test_stop_execution_no_engine(self, db_session):
+    async def test_stop_execution_no_engine(self, db_session, execution_factory):
         """测试停止没有引擎的执行任务"""
         # 创建执行记录
-        execution = Execution(
-            execution_type="batch",
-            browser_type="chrome",
-            status="running"
-        )
-        db_session.add(execution)
-        await db_session.commit()
-        await db_session.refresh(execution)
+        execution_id = await execution_factory(status="running")
 
         # 调用服务方法（没有运行中的引擎）
-        success = await execution_service.stop_execution(db_session, execution.id)
+        success = await execution_service.stop_execution(db_session, execution_id)
 
         # 验证：仍然成功（状态已更新）
         assert success is True
@@ -427,10 +336,7 @@ class TestExecutionServiceGetRunningEngine:
 
     def test_get_running_engine_empty_dict(self):
         """测试运行字典为空"""
-        # 清空运行字典
-        execution_service._running_executions.clear()
-
-        # 调用服务方法
+        # 调用服务方法（运行字典已由 autouse fixture 置空）
         result = execution_service.get_running_engine(1)
 
         # 验证：返回 None
@@ -4,80 +4,160 @@
 """
 # 导入 pytest 测试框架和异步标记
 import pytest
-# 导入操作系统相关模块，用于文件操作
-import os
 # 导入 Path 路径处理类
 from pathlib import Path
 # 从 datetime 导入 datetime 类
 from datetime import datetime
+# 导入 Jinja2 环境，用于构造渲染失败的模板
+from jinja2 import Environment
 
 # 导入报告服务
 from app.services.report_service import report_service
-# 导入数据模式
-from app.models.execution import Execution, ExecutionDetail
-# 导入配置
-from app.config import REPORTS_DIR
+# 导入执行详情模型
+from app.models.execution import ExecutionDetail
+# 导入报告数据模式
+from app.schemas.report import ReportData, ExecutionSummary, CaseResultSummary
+# 导入批量写入和 SELECT 计数辅助函数
+from tests.fixtures.db_fixtures import bulk_insert, count_selects
+
+
+# 测试数据的基准时间
+_T0 = datetime(2025, 12, 27, 10, 0, 0)
+
+# 执行记录的公共字段，各测试只覆盖与之不同的字段
+_BASE_EXECUTION_KW = {
+    "execution_type": "single",
+    "browser_type": "chromium",
+    "headless": True,
+    "window_size": "1920x1080",
+    "start_time": _T0,
+    "created_at": _T0,
+}
+
+
+# 渲染测试共用的报告数据：渲染只读取不修改，模块内构建一次
+# 全部通过的报告
+_PASSED_REPORT = ReportData(
+    execution=ExecutionSummary(
+        execution_id=1,
+        status="completed",
+        browser="chromium",
+        headless=True,
+        total_cases=1,
+        passed_cases=1,
+        failed_cases=0,
+        pass_rate=100.0,
+        started_at="2025-12-27T10:00:00",
+        completed_at="2025-12-27T10:01:00",
+        duration=60000
+    ),
+    cases=[
+        CaseResultSummary(
+            case_id=1,
+            case_name="测试用例",
+            status="success",
+            step_count=1,
+            passed_steps=1,
+            failed_steps=0
+        )
+    ]
+)
+
+# 包含失败用例的报告
+_FAILED_REPORT = ReportData(
+    execution=ExecutionSummary(
+        execution_id=1,
+        status="completed",
+        browser="chromium",
+        headless=True,
+        total_cases=2,
+        passed_cases=1,
+        failed_cases=1,
+        pass_rate=50.0,
+        started_at="2025-12-27T10:00:00",
+        completed_at="2025-12-27T10:02:00",
+        duration=120000
+    ),
+    cases=[
+        CaseResultSummary(
+            case_id=1,
+            case_name="成功用例",
+            status="success",
+            step_count=1,
+            passed_steps=1,
+            failed_steps=0
+        ),
+        CaseResultSummary(
+            case_id=2,
+            case_name="失败用例",
+            status="failed",
+            step_count=1,
+            passed_steps=0,
+            failed_steps=1,
+            error_message="元素未找到"
+        )
+    ]
+)
+
+
+# 包含中文、emoji 和 HTML 特殊字符的报告
+_UNICODE_REPORT = _PASSED_REPORT.model_copy(update={
+    "cases": [_PASSED_REPORT.cases[0].model_copy(update={"case_name": "测试报告 🎉 <特殊> &符号"})]
+})
 
 
 class TestReportServiceGetExecutionData:
     """测试获取执行数据方法（通过公共方法间接测试）"""
 
-    @pytest.mark.asyncio
-    async def test_get_execution_data_success(self, db_session):
+    async def test_get_execution_data_success(self, db_session, execution_factory, query_counter):
         """测试成功获取执行数据"""
         # 创建测试执行记录
-        execution = Execution(
-            execution_type="single",
-            browser_type="chromium",
-            headless=True,
-            window_size="1920x1080",
+        execution_id = await execution_factory(
+            **_BASE_EXECUTION_KW,
             status="completed",
             total_count=2,
             success_count=1,
             fail_count=1,
-            start_time=datetime(2025, 12, 27, 10, 0, 0),
-            end_time=datetime(2025, 12, 27, 10, 1, 0),
-            created_at=datetime(2025, 12, 27, 10, 0, 0)
+            end_time=datetime(2025, 12, 27, 10, 1, 0)
         )
-        db_session.add(execution)
-        await db_session.commit()
-        await db_session.refresh(execution)
 
-        # 创建执行详情
-        detail1 = ExecutionDetail(
-            execution_id=execution.id,
-            case_id=1,
-            case_name="测试用例1",
-            status="success",
-            start_time=datetime(2025, 12, 27, 10, 0, 0),
-            end_time=datetime(2025, 12, 27, 10, 0, 30),
-            duration=30000,
-            created_at=datetime(2025, 12, 27, 10, 0, 0)
-        )
-        detail2 = ExecutionDetail(
-            execution_id=execution.id,
-            case_id=2,
-            case_name="测试用例2",
-            status="failed",
-            error_message="元素未找到",
-            start_time=datetime(2025, 12, 27, 10, 0, 30),
-            end_time=datetime(2025, 12, 27, 10, 1, 0),
-            duration=30000,
-            created_at=datetime(2025, 12, 27, 10, 0, 30)
-        )
-        db_session.add_all([detail1, detail2])
-        await db_session.commit()
-
-        # 调用服务方法
-        result = await report_service._get_execution_data(db_session, execution.id)
+        # 创建执行详情（一条批量 INSERT 写入）
+        await bulk_insert(db_session, ExecutionDetail, [
+            {
+                "execution_id": execution_id,
+                "case_id": 1,
+                "case_name": "测试用例1",
+                "status": "success",
+                "start_time": _T0,
+                "end_time": datetime(2025, 12, 27, 10, 0, 30),
+                "duration": 30000,
+                "created_at": _T0,
+            },
+            {
+                "execution_id": execution_id,
+                "case_id": 2,
+                "case_name": "测试用例2",
+                "status": "failed",
+                "error_message": "元素未找到",
+                "start_time": datetime(2025, 12, 27, 10, 0, 30),
+                "end_time": datetime(2025, 12, 27, 10, 1, 0),
+                "duration": 30000,
+                "created_at": datetime(2025, 12, 27, 10, 0, 30),
+            },
+        ])
+
+        # 调用服务方法（从这里开始统计 SQL）
+        query_counter.clear()
+        result = await report_service._get_execution_data(db_session, execution_id)
 
         # 验证：返回执行数据和详情列表
         assert result is not None
         execution_result, details = result
-        assert execution_result.id == execution.id
+        assert execution_result.id == execution_id
         assert len(details) == 2
+        # 验证：执行记录和详情由一条 SELECT 取回
+        assert count_selects(query_counter) == 1
 
-    @pytest.mark.asyncio
     async def test_get_execution_data_not_exists(self, db_session):
         """测试获取不存在的执行数据"""
         # 调用服务方法（ID 不存在）
@@ -86,64 +166,49 @@ class TestReportServiceGetExecutionData:
         # 验证：返回 None
         assert result is None
 
-    @pytest.mark.asyncio
-    async def test_get_execution_data_with_no_details(self, db_session):
+    async def test_get_execution_data_with_no_details(self, db_session, execution_factory):
         """测试获取没有详情的执行数据"""
         # 创建测试执行记录（无详情）
-        execution = Execution(
-            execution_type="single",
-            browser_type="chromium",
-            window_size="1920x1080",
-            status="pending",
-            created_at=datetime(2025, 12, 27, 10, 0, 0)
-        )
-        db_session.add(execution)
-        await db_session.commit()
-        await db_session.refresh(execution)
+        execution_id = await execution_factory(**_BASE_EXECUTION_KW, status="pending")
 
         # 调用服务方法
-        result = await report_service._get_execution_data(db_session, execution.id)
+        result = await report_service._get_execution_data(db_session, execution_id)
 
         # 验证：返回执行数据，详情列表为空
         assert result is not None
         execution_result, details = result
-        assert execution_result.id == execution.id
+        assert execution_result.id == execution_id
         assert len(details) == 0
 
 
 class TestReportServicePrepareReportData:
     """测试准备报告数据方法"""
 
-    def test_prepare_report_data_success(self):
+    def test_prepare_report_data_success(self, make_execution, make_execution_detail):
         """测试成功准备报告数据"""
         # 创建测试执行记录
-        execution = Execution(
+        execution = make_execution(
+            **_BASE_EXECUTION_KW,
             id=1,
-            execution_type="single",
             status="completed",
-            browser_type="chromium",
-            headless=True,
-            window_size="1920x1080",
             total_count=2,
             success_count=1,
             fail_count=1,
-            start_time=datetime(2025, 12, 27, 10, 0, 0),
-            end_time=datetime(2025, 12, 27, 10, 5, 0),
-            created_at=datetime(2025, 12, 27, 10, 0, 0)
+            end_time=datetime(2025, 12, 27, 10, 5, 0)
         )
 
         # 创建测试详情列表
         details = [
-            ExecutionDetail(
+            make_execution_detail(
                 case_id=1,
                 case_name="测试用例1",
                 status="success",
-                start_time=datetime(2025, 12, 27, 10, 0, 0),
+                start_time=_T0,
                 end_time=datetime(2025, 12, 27, 10, 2, 0),
                 duration=120000,
-                created_at=datetime(2025, 12, 27, 10, 0, 0)
+                created_at=_T0
             ),
-            ExecutionDetail(
+            make_execution_detail(
                 case_id=2,
                 case_name="测试用例2",
                 status="failed",
@@ -185,335 +250,147 @@ class TestReportServicePrepareReportData:
         assert result.cases[1].error_message == "元素超时"
         assert result.cases[1].screenshot_path == "/api/screenshots/error_1.png"
 
-    def test_prepare_report_data_all_success(self):
-        """测试全部成功的报告数据"""
-        # 创建测试执行记录（全部成功）
-        execution = Execution(
+    @pytest.mark.parametrize("statuses,expected_rate", [
+        (["success", "success", "success"], 100.0),  # 全部通过
+        (["failed", "failed"], 0.0),  # 全部失败
+        (["success", "failed"], 50.0),  # 部分失败
+    ], ids=["all_success", "all_failed", "mixed"])
+    def test_prepare_report_data_pass_rate(self, make_execution, make_execution_detail, statuses, expected_rate):
+        """测试不同用例结果组合下的通过率和步骤统计"""
+        # 按用例状态构造执行记录和详情列表（失败用例带错误信息）
+        execution = make_execution(
+            **_BASE_EXECUTION_KW,
             id=1,
-            execution_type="batch",
             status="completed",
-            browser_type="firefox",
-            headless=False,
-            window_size="1920x1080",
-            total_count=3,
-            success_count=3,
-            fail_count=0,
-            start_time=datetime(2025, 12, 27, 10, 0, 0),
-            created_at=datetime(2025, 12, 27, 10, 0, 0)
+            total_count=len(statuses),
+            success_count=statuses.count("success"),
+            fail_count=statuses.count("failed")
         )
-
-        # 创建测试详情列表
         details = [
-            ExecutionDetail(
-                case_id=i,
-                case_name=f"用例{i}",
-                status="success",
-                start_time=datetime(2025, 12, 27, 10, 0, 0),
-                end_time=datetime(2025, 12, 27, 10, 1, 0),
-                duration=60000,
-                created_at=datetime(2025, 12, 27, 10, 0, 0)
+            make_execution_detail(
+                case_id=case_id,
+                case_name=f"用例{case_id}",
+                status=status,
+                error_message="错误" if status == "failed" else None,
+                start_time=_T0,
+                created_at=_T0
             )
-            for i in range(1, 4)
+            for case_id, status in enumerate(statuses, 1)
         ]
 
         # 调用服务方法
         result = report_service._prepare_report_data((execution, details))
 
-        # 验证：全部通过
-        assert result.execution.pass_rate == 100.0
-        assert all(case.status == "success" for case in result.cases)
-        assert all(case.passed_steps == 1 for case in result.cases)
-
-    def test_prepare_report_data_all_failed(self):
-        """测试全部失败的报告数据"""
-        # 创建测试执行记录（全部失败）
-        execution = Execution(
-            id=1,
-            execution_type="batch",
-            status="completed",
-            browser_type="webkit",
-            headless=True,
-            window_size="1920x1080",
-            total_count=2,
-            success_count=0,
-            fail_count=2,
-            start_time=datetime(2025, 12, 27, 10, 0, 0),
-            created_at=datetime(2025, 12, 27, 10, 0, 0)
-        )
-
-        # 创建测试详情列表
-        details = [
-            ExecutionDetail(
-                case_id=1,
-                case_name="失败用例1",
-                status="failed",
-                error_message="错误1",
-                start_time=datetime(2025, 12, 27, 10, 0, 0),
-                end_time=datetime(2025, 12, 27, 10, 1, 0),
-                duration=60000,
-                created_at=datetime(2025, 12, 27, 10, 0, 0)
-            ),
-            ExecutionDetail(
-                case_id=2,
-                case_name="失败用例2",
-                status="failed",
-                error_message="错误2",
-                start_time=datetime(2025, 12, 27, 10, 1, 0),
-                end_time=datetime(2025, 12, 27, 10, 2, 0),
-                duration=60000,
-                created_at=datetime(2025, 12, 27, 10, 1, 0)
-            )
-        ]
+        # 验证：通过率正确
+        assert result.execution.pass_rate == expected_rate
+        # 验证：每个用例的状态和步骤统计与详情一致
+        assert [case.status for case in result.cases] == statuses
+        assert [case.passed_steps for case in result.cases] == [int(st == "success") for st in statuses]
+        assert [case.failed_steps for case in result.cases] == [int(st == "failed") for st in statuses]
 
-        # 调用服务方法
-        result = report_service._prepare_report_data((execution, details))
 
-        # 验证：全部失败
-        assert result.execution.pass_rate == 0.0
-        assert all(case.status == "failed" for case in result.cases)
-        assert all(case.failed_steps == 1 for case in result.cases)
-
-
-class TestReportServiceRenderHtml:
-    """测试渲染 HTML 方法"""
-
-    @pytest.mark.asyncio
-    async def test_render_html_success(self):
-        """测试成功渲染 HTML"""
-        # 创建报告数据（使用简单的模拟数据）
-        from app.schemas.report import ReportData, ExecutionSummary, CaseResultSummary
-
-        report_data = ReportData(
-            execution=ExecutionSummary(
-                execution_id=1,
-                status="completed",
-                browser="chromium",
-                headless=True,
-                total_cases=1,
-                passed_cases=1,
-                failed_cases=0,
-                pass_rate=100.0,
-                started_at="2025-12-27T10:00:00",
-                completed_at="2025-12-27T10:01:00",
-                duration=60000
-            ),
-            cases=[
-                CaseResultSummary(
-                    case_id=1,
-                    case_name="测试用例",
-                    status="success",
-                    step_count=1,
-                    passed_steps=1,
-                    failed_steps=0
-                )
-            ]
-        )
+class TestReportServiceSaveReport:
+    """测试渲染并保存报告方法"""
+
+    @pytest.mark.parametrize("report_data,expected_texts", [
+        # 全部通过：用例名、通过率，浏览器名经模板 title 过滤器首字母大写
+        (_PASSED_REPORT, ("测试用例", "100.0%", "Chromium")),
+        # 包含失败用例：失败用例名和错误信息
+        (_FAILED_REPORT, ("失败用例", "元素未找到")),
+        # 中文、emoji 原样写入，特殊字符被转义
+        (_UNICODE_REPORT, ("测试报告 🎉 &lt;特殊&gt; &amp;符号",)),
+    ], ids=["success", "failed_cases", "unicode_content"])
+    async def test_render_and_save(self, reports_dir, report_data, expected_texts):
+        """测试渲染并保存报告：写入报告目录，内容与文件名正确"""
+        # 调用服务方法（报告目录已由 autouse 的 reports_dir 指向临时目录）
+        report_path = Path(await report_service._render_and_save(1, report_data))
+
+        # 验证：文件保存在报告目录中，且没有残留临时文件
+        assert report_path.parent == reports_dir
+        assert [p.name for p in reports_dir.iterdir()] == [report_path.name]
+        # 验证：文件内容是渲染后的 HTML
+        content = report_path.read_text(encoding="utf-8")
+        assert "<html" in content.lower()
+        for text in expected_texts:
+            assert text in content
+        # 验证：文件名格式正确
+        assert report_path.name.startswith("report_1_")
+        assert report_path.name.endswith(".html")
+
+    async def test_render_and_save_creates_directory(self, reports_dir):
+        """测试报告目录不存在时自动创建"""
+        # 删除（空的）临时报告目录
+        reports_dir.rmdir()
 
         # 调用服务方法
-        html_content = await report_service._render_html(report_data)
-
-        # 验证：HTML 内容包含关键信息
-        assert html_content is not None
-        assert len(html_content) > 0
-        assert "测试用例" in html_content
-        assert "100.0%" in html_content or "100%" in html_content
-        assert "Chromium" in html_content  # 模板使用 title 过滤器
-
-    @pytest.mark.asyncio
-    async def test_render_html_with_failed_cases(self):
-        """测试渲染包含失败用例的 HTML"""
-        from app.schemas.report import ReportData, ExecutionSummary, CaseResultSummary
-
-        report_data = ReportData(
-            execution=ExecutionSummary(
-                execution_id=1,
-                status="completed",
-                browser="chromium",
-                headless=True,
-                total_cases=2,
-                passed_cases=1,
-                failed_cases=1,
-                pass_rate=50.0,
-                started_at="2025-12-27T10:00:00",
-                completed_at="2025-12-27T10:02:00",
-                duration=120000
-            ),
-            cases=[
-                CaseResultSummary(
-                    case_id=1,
-                    case_name="成功用例",
-                    status="success",
-                    step_count=1,
-                    passed_steps=1,
-                    failed_steps=0
-                ),
-                CaseResultSummary(
-                    case_id=2,
-                    case_name="失败用例",
-                    status="failed",
-                    step_count=1,
-                    passed_steps=0,
-                    failed_steps=1,
-                    error_message="元素未找到"
-                )
-            ]
-        )
+        report_path = Path(await report_service._render_and_save(1, _PASSED_REPORT))
 
-        # 调用服务方法
-        html_content = await report_service._render_html(report_data)
+        # 验证：目录被重新创建，报告写入其中
+        assert report_path.parent == reports_dir
+        assert report_path.is_file()
 
-        # 验证：HTML 包含失败信息
-        assert "失败用例" in html_content
-        assert "元素未找到" in html_content
+    async def test_render_and_save_failure_leaves_no_file(self, reports_dir, monkeypatch):
+        """测试渲染中途失败时不留下截断的报告或临时文件"""
+        # 替换为输出一段内容后抛出异常的模板
+        failing_template = Environment().from_string("<html>{{ report.execution.execution_id }}{{ 1 // 0 }}")
+        monkeypatch.setattr("app.services.report_service.get_report_template", lambda: failing_template)
 
+        # 调用服务方法：渲染异常向上抛出
+        with pytest.raises(ZeroDivisionError):
+            await report_service._render_and_save(1, _PASSED_REPORT)
 
-class TestReportServiceSaveReport:
-    """测试保存报告方法"""
-
-    @pytest.mark.asyncio
-    async def test_save_report_success(self, tmp_path):
-        """测试成功保存报告"""
-        # 临时修改 REPORTS_DIR 以使用 tmp_path
-        import app.config
-        original_dir = app.config.REPORTS_DIR
-        app.config.REPORTS_DIR = tmp_path
-
-        try:
-            # HTML 内容
-            html_content = "<html><body>测试报告</body></html>"
-
-            # 调用服务方法
-            report_path = await report_service._save_report(1, html_content)
-
-            # 验证：文件已创建
-            assert report_path is not None
-            assert Path(report_path).exists()
-
-            # 验证：文件内容正确
-            with open(report_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                assert content == html_content
-
-            # 验证：文件名格式正确
-            filename = Path(report_path).name
-            assert filename.startswith("report_1_")
-            assert filename.endswith(".html")
-
-        finally:
-            # 恢复原始配置
-            app.config.REPORTS_DIR = original_dir
-
-    @pytest.mark.asyncio
-    async def test_save_report_creates_directory(self, tmp_path):
-        """测试保存报告时自动创建目录"""
-        import app.config
-        original_dir = app.config.REPORTS_DIR
-        # 使用一个不存在的子目录
-        app.config.REPORTS_DIR = tmp_path / "nonexistent" / "reports"
-
-        try:
-            html_content = "<html><body>测试</body></html>"
-
-            # 调用服务方法
-            report_path = await report_service._save_report(1, html_content)
-
-            # 验证：目录已创建，文件已保存
-            assert Path(report_path).exists()
-            assert Path(report_path).parent.exists()
-
-        finally:
-            app.config.REPORTS_DIR = original_dir
-
-    @pytest.mark.asyncio
-    async def test_save_report_unicode_content(self, tmp_path):
-        """测试保存包含 Unicode 字符的报告"""
-        import app.config
-        original_dir = app.config.REPORTS_DIR
-        app.config.REPORTS_DIR = tmp_path
-
-        try:
-            # 包含中文和特殊字符的 HTML
-            html_content = "<html><body>测试报告 🎉 <特殊> &符号</body></html>"
-
-            # 调用服务方法
-            report_path = await report_service._save_report(1, html_content)
-
-            # 验证：Unicode 字符正确保存
-            with open(report_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                assert content == html_content
-                assert "🎉" in content
-                assert "<特殊>" in content
-
-        finally:
-            app.config.REPORTS_DIR = original_dir
+        # 验证：报告目录中没有任何文件
+        assert list(reports_dir.iterdir()) == []
 
 
 class TestReportServiceGenerateReport:
     """测试生成报告完整流程"""
 
-    @pytest.mark.asyncio
-    async def test_generate_report_success(self, db_session, tmp_path):
+    async def test_generate_report_success(self, db_session, execution_factory, reports_dir):
         """测试完整生成报告流程"""
-        import app.config
-        original_dir = app.config.REPORTS_DIR
-        app.config.REPORTS_DIR = tmp_path
-
-        try:
-            # 创建测试执行记录
-            execution = Execution(
-                execution_type="single",
-                browser_type="chromium",
-                headless=True,
-                window_size="1920x1080",
-                status="completed",
-                total_count=1,
-                success_count=1,
-                fail_count=0,
-                start_time=datetime(2025, 12, 27, 10, 0, 0),
-                end_time=datetime(2025, 12, 27, 10, 1, 0),
-                created_at=datetime(2025, 12, 27, 10, 0, 0)
-            )
-            db_session.add(execution)
-            await db_session.commit()
-            await db_session.refresh(execution)
-
-            # 创建执行详情
-            detail = ExecutionDetail(
-                execution_id=execution.id,
-                case_id=1,
-                case_name="测试用例",
-                status="success",
-                start_time=datetime(2025, 12, 27, 10, 0, 0),
-                end_time=datetime(2025, 12, 27, 10, 1, 0),
-                duration=60000,
-                created_at=datetime(2025, 12, 27, 10, 0, 0)
-            )
-            db_session.add(detail)
-            await db_session.commit()
+        # 创建测试执行记录
+        execution_id = await execution_factory(
+            **_BASE_EXECUTION_KW,
+            status="completed",
+            total_count=1,
+            success_count=1,
+            fail_count=0,
+            end_time=datetime(2025, 12, 27, 10, 1, 0)
+        )
 
-            # 调用服务方法
-            result = await report_service.generate_report(db_session, execution.id)
+        # 创建执行详情
+        await bulk_insert(db_session, ExecutionDetail, [
+            {
+                "execution_id": execution_id,
+                "case_id": 1,
+                "case_name": "测试用例",
+                "status": "success",
+                "start_time": _T0,
+                "end_time": datetime(2025, 12, 27, 10, 1, 0),
+                "duration": 60000,
+                "created_at": _T0,
+            },
+        ])
 
-            # 验证：返回报告信息
-            assert result is not None
-            assert "report_id" in result
-            assert "html_path" in result
-            assert "download_url" in result
+        # 调用服务方法
+        result = await report_service.generate_report(db_session, execution_id)
 
-            # 验证：报告文件已创建
-            assert Path(result["html_path"]).exists()
+        # 验证：返回报告信息
+        assert result is not None
+        assert "report_id" in result
+        assert "html_path" in result
+        assert "download_url" in result
 
-            # 验证：文件内容是有效的 HTML
-            with open(result["html_path"], 'r', encoding='utf-8') as f:
-                content = f.read()
-                assert "<html" in content.lower()
-                assert "测试用例" in content
+        # 验证：报告文件已创建在临时报告目录中
+        assert Path(result["html_path"]).exists()
+        assert Path(result["html_path"]).parent == reports_dir
 
-        finally:
-            app.config.REPORTS_DIR = original_dir
+        # 验证：文件内容是有效的 HTML
+        with open(result["html_path"], 'r', encoding='utf-8') as f:
+            content = f.read()
+            assert "<html" in content.lower()
+            assert "测试用例" in content
 
-    @pytest.mark.asyncio
     async def test_generate_report_not_exists(self, db_session):
         """测试生成不存在的执行报告"""
         # 调用服务方法（执行 ID 不存在）
@@ -522,69 +399,53 @@ class TestReportServiceGenerateReport:
         # 验证：返回 None
         assert result is None
 
-    @pytest.mark.asyncio
-    async def test_generate_report_with_failed_cases(self, db_session, tmp_path):
+    async def test_generate_report_with_failed_cases(self, db_session, execution_factory, reports_dir):
         """测试生成包含失败用例的报告"""
-        import app.config
-        original_dir = app.config.REPORTS_DIR
-        app.config.REPORTS_DIR = tmp_path
-
-        try:
-            # 创建测试执行记录（包含失败）
-            execution = Execution(
-                execution_type="batch",
-                browser_type="firefox",
-                headless=False,
-                window_size="1920x1080",
-                status="completed",
-                total_count=2,
-                success_count=1,
-                fail_count=1,
-                start_time=datetime(2025, 12, 27, 10, 0, 0),
-                created_at=datetime(2025, 12, 27, 10, 0, 0)
-            )
-            db_session.add(execution)
-            await db_session.commit()
-            await db_session.refresh(execution)
-
-            # 创建执行详情（包含失败）
-            detail1 = ExecutionDetail(
-                execution_id=execution.id,
-                case_id=1,
-                case_name="成功用例",
-                status="success",
-                start_time=datetime(2025, 12, 27, 10, 0, 0),
-                end_time=datetime(2025, 12, 27, 10, 0, 30),
-                duration=30000,
-                created_at=datetime(2025, 12, 27, 10, 0, 0)
-            )
-            detail2 = ExecutionDetail(
-                execution_id=execution.id,
-                case_id=2,
-                case_name="失败用例",
-                status="failed",
-                error_message="超时错误",
-                screenshot_path="/api/screenshots/error.png",
-                start_time=datetime(2025, 12, 27, 10, 0, 30),
-                end_time=datetime(2025, 12, 27, 10, 1, 0),
-                duration=30000,
-                created_at=datetime(2025, 12, 27, 10, 0, 30)
-            )
-            db_session.add_all([detail1, detail2])
-            await db_session.commit()
+        # 创建测试执行记录（包含失败）
+        execution_id = await execution_factory(
+            **(_BASE_EXECUTION_KW | {"execution_type": "batch", "browser_type": "firefox", "headless": False}),
+            status="completed",
+            total_count=2,
+            success_count=1,
+            fail_count=1
+        )
 
-            # 调用服务方法
-            result = await report_service.generate_report(db_session, execution.id)
+        # 创建执行详情（包含失败）
+        await bulk_insert(db_session, ExecutionDetail, [
+            {
+                "execution_id": execution_id,
+                "case_id": 1,
+                "case_name": "成功用例",
+                "status": "success",
+                "start_time": _T0,
+                "end_time": datetime(2025, 12, 27, 10, 0, 30),
+                "duration": 30000,
+                "created_at": _T0,
+            },
+            {
+                "execution_id": execution_id,
+                "case_id": 2,
+                "case_name": "失败用例",
+                "status": "failed",
+                "error_message": "超时错误",
+                "screenshot_path": "/api/screenshots/error.png",
+                "start_time": datetime(2025, 12, 27, 10, 0, 30),
+                "end_time": datetime(2025, 12, 27, 10, 1, 0),
+                "duration": 30000,
+                "created_at": datetime(2025, 12, 27, 10, 0, 30),
+            },
+        ])
 
-            # 验证：报告生成成功
-            assert result is not None
-            assert Path(result["html_path"]).exists()
+        # 调用服务方法
+        result = await report_service.generate_report(db_session, execution_id)
 
-            # 验证：HTML 包含失败信息
-            with open(result["html_path"], 'r', encoding='utf-8') as f:
-                content = f.read()
-                assert "失败用例" in content
-                assert "超时错误" in content
+        # 验证：报告生成成功，文件写入临时报告目录
+        assert result is not None
+        assert Path(result["html_path"]).exists()
+        assert Path(result["html_path"]).parent == reports_dir
 
-        finally:
-            app.config.REPORTS_DIR = original_dir
+        # 验证：HTML 包含失败信息
+        with open(result["html_path"], 'r', encoding='utf-8') as f:
+            content = f.read()
+            assert "失败用例" in content
+            assert "超时错误" in content
@@ -0,0 +1,2 @@
+# 工具模块单元测试：测试 app.utils 包中的工具函数
+"""工具模块单元测试"""
@@ -0,0 +1,141 @@
+"""
+JSON 编解码工具单元测试
+"""
+# 导入标准库 json 模块，用于构造旧格式的存量数据
+import json
+# 导入 importlib，用于在移除 orjson 后重新加载编解码模块
+import importlib
+# 导入 sys，用于临时屏蔽 orjson 模块
+import sys
+# 导入 pytest 测试框架
+import pytest
+# 从 sqlalchemy 导入 Core 插入和查询构造器，绕过模型直接写入存量行
+from sqlalchemy import insert, select
+# 导入被测模块
+from app.utils import json_codec
+# 导入使用编解码工具的模型
+from app.models.case import TestCase, TestStep
+from app.models.execution import Execution
+
+# 含中文和嵌套结构的参数，覆盖非 ASCII 与分隔符两种格式差异
+_PARAMS = {"text": "用户名", "options": [1, 2]}
+
+
+@pytest.fixture
+def stdlib_codec(monkeypatch):
+    """屏蔽 orjson 后重新加载编解码模块，得到标准库回退实现"""
+    # sys.modules 中置为 None 时 import 会抛出 ImportError
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    # 重新执行模块代码，走 except ImportError 分支
+    yield importlib.reload(json_codec)
+    # 先恢复 sys.modules，再重新加载，使后续测试拿到原来的实现
+    monkeypatch.undo()
+    importlib.reload(json_codec)
+
+
+class TestOrjsonBranch:
+    """测试 orjson 实现"""
+
+    @pytest.fixture(autouse=True)
+    def _require_orjson(self):
+        """未安装 orjson 时跳过本类测试"""
+        pytest.importorskip("orjson")
+
+    def test_dumps_returns_str(self):
+        """测试序列化结果为 str（orjson 原生返回 bytes）"""
+        assert isinstance(json_codec.json_dumps(_PARAMS), str)
+
+    def test_dumps_format(self):
+        """测试存储格式：紧凑分隔符，非 ASCII 字符不转义"""
+        assert json_codec.json_dumps(_PARAMS) == '{"text":"用户名","options":[1,2]}'
+
+    def test_round_trip(self):
+        """测试序列化后再解析得到原对象"""
+        assert json_codec.json_loads(json_codec.json_dumps(_PARAMS)) == _PARAMS
+
+    def test_loads_invalid_raises_decode_error(self):
+        """测试无效 JSON 抛出导出的 JSONDecodeError（同时是标准库 JSONDecodeError 的子类）"""
+        with pytest.raises(json_codec.JSONDecodeError):
+            json_codec.json_loads("invalid json")
+        assert issubclass(json_codec.JSONDecodeError, json.JSONDecodeError)
+
+
+class TestStdlibBranch:
+    """测试未安装 orjson 时的标准库回退实现"""
+
+    def test_fallback_uses_stdlib(self, stdlib_codec):
+        """测试回退到标准库函数"""
+        assert stdlib_codec.json_dumps is json.dumps
+        assert stdlib_codec.json_loads is json.loads
+
+    def test_dumps_format(self, stdlib_codec):
+        """测试存储格式：标准库默认分隔符，非 ASCII 字符转义"""
+        assert stdlib_codec.json_dumps(_PARAMS) == '{"text": "\\u7528\\u6237\\u540d", "options": [1, 2]}'
+
+    def test_round_trip(self, stdlib_codec):
+        """测试序列化后再解析得到原对象"""
+        assert stdlib_codec.json_loads(stdlib_codec.json_dumps(_PARAMS)) == _PARAMS
+
+    def test_loads_invalid_raises_decode_error(self, stdlib_codec):
+        """测试无效 JSON 抛出导出的 JSONDecodeError（即标准库异常）"""
+        assert stdlib_codec.JSONDecodeError is json.JSONDecodeError
+        with pytest.raises(stdlib_codec.JSONDecodeError):
+            stdlib_codec.json_loads("invalid json")
+
+
+class TestStoredFormatCompatibility:
+    """测试两种存储格式互相兼容（已有数据行由 json.dumps 写入）"""
+
+    @pytest.mark.parametrize("stored", [
+        json.dumps(_PARAMS),  # 旧格式：标准库默认输出
+        json.dumps(_PARAMS, ensure_ascii=False, separators=(",", ":")),  # 新格式：与 orjson 输出一致
+    ], ids=["stdlib", "compact"])
+    def test_loads_both_formats(self, stored):
+        """测试当前实现能解析两种格式"""
+        assert json_codec.json_loads(stored) == _PARAMS
+
+    @pytest.mark.asyncio
+    async def test_existing_step_row_round_trip(self, db_session):
+        """测试旧格式的步骤参数行：读取正确，重新保存后仍读到相同参数"""
+        # 绕过模型直接写入旧格式的存量行
+        case_id = (await db_session.execute(
+            insert(TestCase).values(name="存量用例").returning(TestCase.id)
+        )).scalar_one()
+        await db_session.execute(insert(TestStep).values(
+            case_id=case_id, step_order=1, action_type="input", action_params=json.dumps(_PARAMS)
+        ))
+        step = (await db_session.execute(select(TestStep).where(TestStep.case_id == case_id))).scalar_one()
+
+        # 验证：旧格式被正确解析
+        assert step.params_dict == _PARAMS
+
+        # 使用当前实现重新保存并写回数据库
+        step.set_params(step.params_dict)
+        await db_session.flush()
+        await db_session.refresh(step)
+
+        # 验证：重新保存后参数不变
+        assert step.params_dict == _PARAMS
+
+    @pytest.mark.asyncio
+    async def test_existing_execution_row_round_trip(self, db_session):
+        """测试旧格式的用例 ID 列表行：读取正确，重新保存后仍读到相同列表"""
+        # 绕过模型直接写入旧格式的存量行
+        execution_id = (await db_session.execute(
+            insert(Execution).values(
+                execution_type="batch", browser_type="chrome", status="pending",
+                case_ids_json=json.dumps([1, 2, 3])
+            ).returning(Execution.id)
+        )).scalar_one()
+        execution = await db_session.get(Execution, execution_id)
+
+        # 验证：旧格式被正确解析
+        assert execution.case_ids_list == [1, 2, 3]
+
+        # 使用当前实现重新保存并写回数据库
+        execution.set_case_ids(execution.case_ids_list)
+        await db_session.flush()
+        await db_session.refresh(execution)
+
+        # 验证：重新保存后列表不变
+        assert execution.case_ids_list == [1, 2, 3]